@@ -5,19 +5,41 @@ This file serves as the primary interface for launching the application.
 Dependencies:
 - PyQt6
 - src.ui.main_window: Contains the MainWindow class
+
+PyQt6 and the UI modules are imported only when the UI is launched, so the
+CLI and batch modes start without loading Qt.
 """
 
 import sys
-from PyQt6.QtWidgets import QApplication
-from src.ui.main_window import MainWindow
+import time
+
+_START_TIME = time.perf_counter()
 
-def run_ui():
+def run_ui(profile_startup=False):
     """
     Run the PyQt6 user interface for the Meta Prompt Playground.
+    
+    Args:
+        profile_startup (bool): Print how long each start-up phase took
     """
+    from src.helpers.startup_profiler import StartupProfiler
+    profiler = StartupProfiler(_START_TIME)
+    
+    from PyQt6.QtWidgets import QApplication
+    profiler.mark("import PyQt6")
+    
     # PyQt6 handles high DPI scaling automatically
-    app = QApplication(sys.argv)
+    app = QApplication([arg for arg in sys.argv if arg != "--profile-startup"])
+    profiler.mark("create QApplication")
+    
+    from src.ui.main_window import MainWindow
+    profiler.mark("import UI modules")
+    
     main_window = MainWindow()
+    profiler.mark("build main window")
+    
+    if profile_startup:
+        profiler.watch_first_paint(main_window, on_painted=profiler.report)
     main_window.show()
     sys.exit(app.exec())
 
@@ -27,7 +49,7 @@ def run_cli():
     
     This is the legacy CLI mode, kept for backwards compatibility.
     """
-    from src.service.caption_creator import generate_prompt
+    from src.service.caption_creator import generate_prompt_stream
     
     if len(sys.argv) > 2:  # First arg is script name, second is --cli, third is the prompt
         # If argument is provided, use it as the task or prompt
@@ -38,22 +60,93 @@ def run_cli():
         task_or_prompt = sys.stdin.read().strip()
     
     if task_or_prompt:
-        result = generate_prompt(task_or_prompt)
-        print(result)
+        # Print the response as it streams in
+        for chunk in generate_prompt_stream(task_or_prompt):
+            print(chunk, end="", flush=True)
+        print()
     else:
         print("No input provided. Exiting.")
 
+def run_batch_cli():
+    """
+    Run a JSONL or CSV file of test inputs through one or more meta prompts.
+    
+    Results are appended to a JSONL file in completion order.
+    """
+    import argparse
+    from src.service.batch_runner import (
+        load_test_inputs, load_meta_prompts, run_batch, DEFAULT_CONCURRENCY
+    )
+    from src.prompts.default_meta_prompt import META_PROMPT
+    from src.helpers.model_selector import DEFAULT_MODEL, REASONING_EFFORTS, list_models
+    from src.service.backends import default_backend, list_backends
+    
+    parser = argparse.ArgumentParser(
+        prog="main.py --batch",
+        description="Run test inputs through meta prompts in parallel."
+    )
+    parser.add_argument("--batch", required=True, metavar="INPUTS",
+                        help="JSONL or CSV file of test inputs")
+    parser.add_argument("--meta-prompt", action="append", default=[], metavar="FILE",
+                        help="Meta prompt text file or saved prompt set (.json); repeatable. "
+                             "Defaults to the built-in meta prompt")
+    parser.add_argument("--output", default="batch_results.jsonl",
+                        help="JSONL file to append results to (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Maximum requests in flight (default: %(default)s)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, choices=list_models(),
+                        help="Model to generate with (default: %(default)s)")
+    parser.add_argument("--reasoning-effort", choices=REASONING_EFFORTS,
+                        help="Reasoning effort for reasoning models (default: the model's own)")
+    parser.add_argument("--backend", default=default_backend(), choices=list_backends(),
+                        help="Backend to send requests to (default: %(default)s)")
+    parser.add_argument("--trace", metavar="DIR",
+                        help="Write a JSONL trace of every request to this directory")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the API instead of reusing cached responses")
+    args = parser.parse_args()
+    
+    if args.trace:
+        from src.service.trace_log import enable_tracing
+        enable_tracing(args.trace)
+    
+    test_inputs = load_test_inputs(args.batch)
+    meta_prompts = load_meta_prompts(args.meta_prompt) if args.meta_prompt else {"default": META_PROMPT}
+    total = len(test_inputs) * len(meta_prompts)
+    print(f"Running {len(test_inputs)} inputs x {len(meta_prompts)} meta prompts "
+          f"({total} requests, {args.model}, concurrency {args.concurrency})", file=sys.stderr)
+    
+    done = 0
+    def report(result):
+        nonlocal done
+        done += 1
+        status = "error: " + result["error"] if "error" in result else f"{result['elapsed']:.1f}s"
+        print(f"[{done}/{total}] {result['meta_prompt']} / {result['input_id']}: {status}", file=sys.stderr)
+    
+    summary = run_batch(test_inputs, meta_prompts, args.output, concurrency=args.concurrency,
+                        use_cache=not args.no_cache, on_result=report,
+                        model=args.model, reasoning_effort=args.reasoning_effort, backend=args.backend)
+    print(f"Done: {summary['requests']} requests, {summary['failed']} failed, "
+          f"{summary['elapsed']:.1f}s. Results in {args.output}", file=sys.stderr)
+
 def main():
     """
     Main function that determines whether to run the UI or CLI version.
     
     If "--cli" is provided as the first argument, run in CLI mode.
-    Otherwise, launch the UI.
+    If "--batch" is provided as the first argument, run in batch mode.
+    If "--benchmark" is provided as the first argument, run the benchmarks.
+    Otherwise, launch the UI; "--profile-startup" reports start-up timings.
     """
     if len(sys.argv) > 1 and sys.argv[1] == "--cli":
         run_cli()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        run_batch_cli()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        from src.service.benchmark import main as run_benchmarks
+        run_benchmarks(sys.argv[2:])
     else:
-        run_ui()
+        run_ui(profile_startup="--profile-startup" in sys.argv)
 
 if __name__ == "__main__":
     main()
@@ -4,6 +4,6 @@ Helpers Module
 This module contains utility functions and classes used throughout the application.
 """
 
-from .reasoning_parser import extract_reasoning, has_reasoning
+from .reasoning_parser import extract_reasoning, has_reasoning, StreamingReasoningParser
 
-__all__ = ['extract_reasoning', 'has_reasoning']
+__all__ = ['extract_reasoning', 'has_reasoning', 'StreamingReasoningParser']
@@ -0,0 +1,140 @@
+"""
+Change Notifier Module
+
+This module provides the DebouncedTextNotifier class, which turns an editor's
+per-keystroke changes into cheap, coalesced notifications. Every edit only bumps
+a revision counter; the full text is copied out of the document once the user
+has paused typing, or when a caller asks for it explicitly.
+
+Revisions are counted by ContentRevision, from the document's contentsChange
+signal: textChanged and contentsChanged also fire when a syntax highlighter
+reformats a block, which doesn't change the text.
+
+Dependencies:
+- PyQt6
+"""
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+# Quiet period after the last edit before the text is delivered, in milliseconds
+DEFAULT_DEBOUNCE_MS = 300
+
+
+class ContentRevision(QObject):
+    """
+    Counts the edits of a document's text, ignoring format-only changes.
+
+    An edit block (e.g. setPlainText, or typing over a selection) counts once.
+
+    Signals:
+        changed: Emitted with the new revision after every edit
+    """
+
+    changed = pyqtSignal(int)
+
+    def __init__(self, document):
+        """
+        Start counting the edits of a document.
+
+        Args:
+            document (QTextDocument): The document to watch; it becomes the parent
+        """
+        super().__init__(document)
+        self.revision = 0
+        self._edited = False
+        document.contentsChange.connect(self._on_contents_change)
+        document.contentsChanged.connect(self._on_contents_changed)
+
+    def _on_contents_change(self, position, removed, added):
+        """Note an edit; highlighter passes report no removed or added characters"""
+        if removed or added:
+            self._edited = True
+
+    def _on_contents_changed(self):
+        """Count the edits noted since the last change of the document"""
+        if self._edited:
+            self._edited = False
+            self.revision += 1
+            self.changed.emit(self.revision)
+
+
+def content_revision(document):
+    """
+    Get the edit counter of a document, creating it on first use.
+
+    Args:
+        document (QTextDocument): The document
+
+    Returns:
+        ContentRevision: The document's counter, shared by all its users
+    """
+    counter = document.findChild(ContentRevision)
+    return counter if counter is not None else ContentRevision(document)
+
+
+class DebouncedTextNotifier(QObject):
+    """
+    Coalesces text changes of a QPlainTextEdit/QTextEdit.
+
+    Signals:
+        revision_changed: Emitted with the new revision on every edit (no text copy)
+        text_settled: Emitted with the text and its revision after a quiet period
+    """
+
+    revision_changed = pyqtSignal(int)
+    text_settled = pyqtSignal(str, int)
+
+    def __init__(self, editor, delay_ms=DEFAULT_DEBOUNCE_MS, parent=None):
+        """
+        Initialize the notifier and start watching the editor.
+
+        Args:
+            editor (QPlainTextEdit | QTextEdit): The editor to watch
+            delay_ms (int): Quiet period before text_settled is emitted
+            parent (QObject): Parent object
+        """
+        super().__init__(parent or editor)
+        self._editor = editor
+        self._counter = content_revision(editor.document())
+        self._settled_revision = self._counter.revision
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+        self._counter.changed.connect(self._on_text_changed)
+
+    @property
+    def revision(self):
+        """int: Counter incremented on every change of the text"""
+        return self._counter.revision
+
+    def is_pending(self):
+        """
+        Check whether there are changes that haven't been delivered yet.
+
+        Returns:
+            bool: True if text_settled is due for the current revision
+        """
+        return self._settled_revision != self.revision
+
+    def text(self):
+        """
+        Get the current text, on demand.
+
+        Returns:
+            str: The editor's text
+        """
+        return self._editor.toPlainText()
+
+    def flush(self):
+        """Deliver pending changes immediately instead of waiting for the quiet period"""
+        self._timer.stop()
+        if not self.is_pending():
+            return
+        self._settled_revision = self.revision
+        self.text_settled.emit(self.text(), self.revision)
+
+    def _on_text_changed(self, revision):
+        """Pass on an edit and (re)start the quiet period"""
+        self.revision_changed.emit(revision)
+        self._timer.start()
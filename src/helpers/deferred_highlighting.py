@@ -0,0 +1,98 @@
+"""
+Deferred Highlighting Module
+
+This module provides the DeferredHighlighter class, which loads large documents into
+an editor without highlighting every block up front. The visible part of the document
+is highlighted immediately and the rest is highlighted in small chunks while the event
+loop is idle, so loading a very large text doesn't freeze the UI.
+
+Dependencies:
+- PyQt6
+- src.helpers.syntax_highlighter: Contains the PromptSyntaxHighlighter class
+"""
+
+import time
+
+from PyQt6.QtCore import QObject, QTimer, QPoint
+
+# Documents with at least this many lines are highlighted lazily
+DEFERRED_HIGHLIGHT_LINES = 2000
+
+# Time spent highlighting per idle tick, in seconds
+_CHUNK_BUDGET = 0.008
+
+
+class DeferredHighlighter(QObject):
+    """
+    Sets text on an editor, deferring syntax highlighting for large documents.
+    """
+
+    def __init__(self, editor, highlighter, threshold=DEFERRED_HIGHLIGHT_LINES, parent=None):
+        """
+        Initialize the deferred highlighter.
+
+        Args:
+            editor (QPlainTextEdit): The editor whose text is set
+            highlighter (PromptSyntaxHighlighter): The highlighter attached to the editor's document
+            threshold (int): Line count from which highlighting is deferred
+            parent (QObject): Parent object
+        """
+        super().__init__(parent or editor)
+        self.editor = editor
+        self.highlighter = highlighter
+        self.threshold = threshold
+        self._next_block = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)  # Runs whenever the event loop is idle
+        self._timer.timeout.connect(self._highlight_chunk)
+
+    def set_text(self, text):
+        """
+        Replace the editor's text, highlighting synchronously only if it is small.
+
+        Args:
+            text (str): The text to set
+        """
+        self._timer.stop()
+        if text.count("\n") + 1 < self.threshold:
+            self.editor.setPlainText(text)
+            return
+
+        self.highlighter.suspended = True
+        try:
+            self.editor.setPlainText(text)
+        finally:
+            self.highlighter.suspended = False
+
+        self._highlight_visible()
+        self._next_block = 0
+        self._timer.start()
+
+    def is_pending(self):
+        """
+        Check whether part of the document is still waiting to be highlighted.
+
+        Returns:
+            bool: True while the background pass is running
+        """
+        return self._timer.isActive()
+
+    def _highlight_visible(self):
+        """Highlight the blocks currently shown in the editor's viewport"""
+        viewport = self.editor.viewport()
+        block = self.editor.firstVisibleBlock()
+        last = self.editor.cursorForPosition(QPoint(viewport.width(), viewport.height())).block()
+        while block.isValid() and block.blockNumber() <= last.blockNumber():
+            self.highlighter.rehighlightBlock(block)
+            block = block.next()
+
+    def _highlight_chunk(self):
+        """Highlight the next blocks of the document within the time budget"""
+        document = self.editor.document()
+        deadline = time.perf_counter() + _CHUNK_BUDGET
+        while self._next_block < document.blockCount():
+            self.highlighter.rehighlightBlock(document.findBlockByNumber(self._next_block))
+            self._next_block += 1
+            if time.perf_counter() >= deadline:
+                return
+        self._timer.stop()
@@ -0,0 +1,199 @@
+"""
+Lazy JSON Module
+
+This module loads JSON files without decoding their long strings up front.
+The file is memory-mapped when it is large (and read in one go when small),
+its structure is scanned, and every string of at least LAZY_TEXT_BYTES bytes
+becomes a LazyText: a copy of its encoded bytes that is decoded only when its
+value is asked for. Loading a saved prompt set with megabytes of outputs and
+reasoning then only costs a scan and a copy, and text that is never shown is
+never decoded.
+
+The mapping is closed before load_lazy returns, so a LazyText never reads the
+file again: rewriting or truncating the file afterwards (or saving over it on
+Windows, where an open mapping locks the file) is safe.
+
+Dependencies:
+- None (json, mmap and re from the standard library)
+"""
+
+import json
+import mmap
+import os
+import re
+
+# Files from this size on are memory-mapped instead of read
+MMAP_MIN_BYTES = 1024 * 1024
+
+# Strings from this encoded size on are decoded lazily
+LAZY_TEXT_BYTES = 1024
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_NUMBER = re.compile(rb"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+_LITERALS = ((b"true", True), (b"false", False), (b"null", None))
+
+
+class LazyText:
+    """
+    A JSON string from a loaded file, decoded on demand.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        """
+        Initialize the lazy text.
+
+        Args:
+            data (bytes): The encoded string, including its quotes
+        """
+        self._data = data
+
+    def __len__(self):
+        """Get the encoded size of the string in bytes"""
+        return len(self._data)
+
+    def value(self):
+        """
+        Decode the string.
+
+        Returns:
+            str: The string
+        """
+        return json.loads(self._data)
+
+
+def resolve(value):
+    """
+    Get the value of a possibly lazy string.
+
+    Args:
+        value: A LazyText or any other value
+
+    Returns:
+        The decoded string for a LazyText, otherwise the value itself
+    """
+    return value.value() if isinstance(value, LazyText) else value
+
+
+class _Scanner:
+    """Recursive-descent scanner building values from a JSON buffer"""
+
+    def __init__(self, buffer):
+        """Initialize the scanner over the file contents"""
+        self.buffer = buffer
+
+    def error(self, message, pos):
+        """Raise a ValueError for invalid JSON"""
+        raise ValueError(f"Invalid JSON: {message} at byte {pos}")
+
+    def skip(self, pos):
+        """Get the position after any whitespace"""
+        return _WHITESPACE.match(self.buffer, pos).end()
+
+    def string(self, pos, lazy):
+        """Scan a string; returns (value, end), the value lazy if long and allowed"""
+        # Jump from quote to quote at C speed; a quote is escaped if preceded by an odd number of backslashes
+        end = pos + 1
+        while True:
+            end = self.buffer.find(b'"', end)
+            if end < 0:
+                self.error("unterminated string", pos)
+            backslash = end - 1
+            while self.buffer[backslash] == 0x5C:
+                backslash -= 1
+            end += 1
+            if (end - 2 - backslash) % 2 == 0:
+                break
+        if lazy and end - pos >= LAZY_TEXT_BYTES:
+            # A copy, so the text outlives the file's mapping
+            return LazyText(self.buffer[pos:end]), end
+        return json.loads(self.buffer[pos:end]), end
+
+    def value(self, pos):
+        """Scan any value; returns (value, end)"""
+        pos = self.skip(pos)
+        char = self.buffer[pos:pos + 1]
+        if char == b'"':
+            return self.string(pos, lazy=True)
+        if char == b"{":
+            return self.object(pos + 1)
+        if char == b"[":
+            return self.array(pos + 1)
+        for literal, value in _LITERALS:
+            if self.buffer[pos:pos + len(literal)] == literal:
+                return value, pos + len(literal)
+        match = _NUMBER.match(self.buffer, pos)
+        if match is None or match.end() == pos:
+            self.error("expected a value", pos)
+        return json.loads(match.group()), match.end()
+
+    def object(self, pos):
+        """Scan an object after its opening brace; returns (dict, end)"""
+        result = {}
+        pos = self.skip(pos)
+        if self.buffer[pos:pos + 1] == b"}":
+            return result, pos + 1
+        while True:
+            pos = self.skip(pos)
+            if self.buffer[pos:pos + 1] != b'"':
+                self.error("expected a key", pos)
+            key, pos = self.string(pos, lazy=False)
+            pos = self.skip(pos)
+            if self.buffer[pos:pos + 1] != b":":
+                self.error("expected ':'", pos)
+            result[key], pos = self.value(pos + 1)
+            pos = self.skip(pos)
+            char = self.buffer[pos:pos + 1]
+            if char == b"}":
+                return result, pos + 1
+            if char != b",":
+                self.error("expected ',' or '}'", pos)
+            pos += 1
+
+    def array(self, pos):
+        """Scan an array after its opening bracket; returns (list, end)"""
+        result = []
+        pos = self.skip(pos)
+        if self.buffer[pos:pos + 1] == b"]":
+            return result, pos + 1
+        while True:
+            item, pos = self.value(pos)
+            result.append(item)
+            pos = self.skip(pos)
+            char = self.buffer[pos:pos + 1]
+            if char == b"]":
+                return result, pos + 1
+            if char != b",":
+                self.error("expected ',' or ']'", pos)
+            pos += 1
+
+
+def load_lazy(path):
+    """
+    Load a JSON file, keeping long strings as LazyText.
+
+    Args:
+        path (str): Path of the UTF-8 JSON file
+
+    Returns:
+        The loaded value; dicts and lists hold LazyText in place of long strings
+
+    Raises:
+        ValueError: If the file isn't valid JSON
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = f.read()
+    try:
+        scanner = _Scanner(buffer)
+        start = 3 if buffer[:3] == b"\xef\xbb\xbf" else 0
+        value, pos = scanner.value(start)
+        if scanner.skip(pos) != len(buffer):
+            scanner.error("extra data", pos)
+        return value
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
@@ -1,2 +1,179 @@
-# helper to select the OpenAI model used (defaults to gpt-4o)
-# The options are: gpt-4o, 03-mini, or o1.
\ No newline at end of file
+"""
+Model Selector Module
+
+This module contains the registry of OpenAI models that can be used for generation
+(defaults to gpt-4o), with the request profile of each model: its parameters, context
+window and output limits, reasoning effort settings, and cost/latency metadata.
+
+Dependencies:
+- None
+"""
+
+DEFAULT_MODEL = "gpt-4o"
+
+REASONING_EFFORTS = ("low", "medium", "high")
+
+# Costs are in USD per million tokens; latency is a rough relative tier;
+# supports_n: whether one request can return several samples (the n parameter)
+MODELS = {
+    "gpt-4o": {
+        "label": "GPT-4o",
+        "context_window": 128000,
+        "max_output_tokens": 16384,
+        "reasoning": False,
+        "system_role": "system",
+        "supports_streaming": True,
+        "supports_n": True,
+        "params": {},
+        "input_cost": 2.50,
+        "output_cost": 10.00,
+        "latency": "fast",
+    },
+    "gpt-4o-mini": {
+        "label": "GPT-4o mini",
+        "context_window": 128000,
+        "max_output_tokens": 16384,
+        "reasoning": False,
+        "system_role": "system",
+        "supports_streaming": True,
+        "supports_n": True,
+        "params": {},
+        "input_cost": 0.15,
+        "output_cost": 0.60,
+        "latency": "fastest",
+    },
+    "o3-mini": {
+        "label": "o3-mini",
+        "context_window": 200000,
+        "max_output_tokens": 100000,
+        "reasoning": True,
+        "default_reasoning_effort": "medium",
+        "system_role": "developer",
+        "supports_streaming": True,
+        "supports_n": False,
+        "params": {},
+        "input_cost": 1.10,
+        "output_cost": 4.40,
+        "latency": "medium",
+    },
+    "o1": {
+        "label": "o1",
+        "context_window": 200000,
+        "max_output_tokens": 100000,
+        "reasoning": True,
+        "default_reasoning_effort": "medium",
+        "system_role": "developer",
+        "supports_streaming": True,
+        "supports_n": False,
+        "params": {},
+        "input_cost": 15.00,
+        "output_cost": 60.00,
+        "latency": "slow",
+    },
+}
+
+
+def list_models():
+    """
+    List the registered models.
+
+    Returns:
+        list: Model names, in registry order
+    """
+    return list(MODELS)
+
+
+def get_model(name):
+    """
+    Get the profile of a model.
+
+    Args:
+        name (str): The model name
+
+    Returns:
+        dict: The model profile
+
+    Raises:
+        ValueError: If the model isn't registered
+    """
+    try:
+        return MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown model: {name}") from None
+
+
+def describe_model(name):
+    """
+    Get a one-line summary of a model's limits, cost and latency.
+
+    Args:
+        name (str): The model name
+
+    Returns:
+        str: Human-readable summary
+    """
+    model = get_model(name)
+    return (
+        f"{model['label']}: {model['context_window'] // 1000}k context, "
+        f"${model['input_cost']:.2f}/${model['output_cost']:.2f} per 1M tokens in/out, "
+        f"{model['latency']} latency"
+    )
+
+
+def build_request_params(name, reasoning_effort=None, max_output_tokens=None):
+    """
+    Build the request parameters for a model.
+
+    Args:
+        name (str): The model name
+        reasoning_effort (str, optional): "low", "medium" or "high"; reasoning models only
+        max_output_tokens (int, optional): Cap on generated tokens, up to the model's limit
+
+    Returns:
+        dict: Parameters for the chat completion request, including "model"
+    """
+    model = get_model(name)
+    params = {"model": name, **model["params"]}
+    if model["reasoning"]:
+        params["reasoning_effort"] = reasoning_effort or model["default_reasoning_effort"]
+    if max_output_tokens:
+        limit = min(max_output_tokens, model["max_output_tokens"])
+        # Reasoning models count hidden reasoning tokens under max_completion_tokens
+        params["max_completion_tokens" if model["reasoning"] else "max_tokens"] = limit
+    return params
+
+
+def adapt_messages(name, messages):
+    """
+    Adapt chat messages to the roles a model accepts.
+
+    Args:
+        name (str): The model name
+        messages (list): Messages using the "system" role for instructions
+
+    Returns:
+        list: The messages, with the system role renamed where the model requires it
+    """
+    role = get_model(name)["system_role"]
+    if role == "system":
+        return messages
+    return [
+        {**message, "role": role} if message["role"] == "system" else message
+        for message in messages
+    ]
+
+
+def estimate_cost(name, prompt_tokens, completion_tokens):
+    """
+    Estimate the cost of a request.
+
+    Args:
+        name (str): The model name
+        prompt_tokens (int): Tokens sent
+        completion_tokens (int): Tokens generated, including reasoning tokens
+
+    Returns:
+        float: Estimated cost in USD
+    """
+    model = get_model(name)
+    return (prompt_tokens * model["input_cost"] + completion_tokens * model["output_cost"]) / 1_000_000
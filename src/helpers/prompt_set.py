@@ -0,0 +1,93 @@
+"""
+Prompt Set Module
+
+This module converts between the saved prompt set file format and the list of
+variants shown in the comparison view. A prompt set holds any number of
+variants, each with its meta prompt, output, reasoning and model:
+
+    {
+        "variants": [
+            {"name": "A", "prompt": "...", "output": "...", "reasoning": "...",
+             "model": "gpt-4o", "reasoning_effort": null},
+            ...
+        ],
+        "test_input": "..."
+    }
+
+Files written before variants existed hold exactly two, as prompt_a/prompt_b,
+output_a/output_b and reasoning_a/reasoning_b; they are still read.
+
+Dependencies:
+- None
+"""
+
+import string
+
+# Fields of a variant besides its name, in the order they are saved
+VARIANT_FIELDS = ("prompt", "output", "reasoning", "model", "reasoning_effort")
+
+# Fields of the pre-variants format: field -> key prefix
+_LEGACY_KEYS = {"prompt": "prompt_", "output": "output_", "reasoning": "reasoning_"}
+
+
+def variant_name(index):
+    """
+    Get the display name of the variant at a position.
+
+    Args:
+        index (int): Zero-based position of the variant
+
+    Returns:
+        str: "A", "B", ... "Z", then "V27", "V28", ...
+    """
+    if index < len(string.ascii_uppercase):
+        return string.ascii_uppercase[index]
+    return f"V{index + 1}"
+
+
+def read_variants(data):
+    """
+    Get the variants of a prompt set, in either file format.
+
+    Args:
+        data (dict): The prompt set as loaded from JSON
+
+    Returns:
+        list: One dict per variant with a "name" and any of VARIANT_FIELDS present in the data
+    """
+    if "variants" in data:
+        variants = []
+        for index, entry in enumerate(data["variants"]):
+            variant = {"name": entry.get("name") or variant_name(index)}
+            variant.update({field: entry[field] for field in VARIANT_FIELDS if field in entry})
+            variants.append(variant)
+        return variants
+
+    variants = []
+    for suffix in ("a", "b"):
+        variant = {field: data[prefix + suffix] for field, prefix in _LEGACY_KEYS.items()
+                   if prefix + suffix in data}
+        if variant:
+            variant["name"] = suffix.upper()
+            variants.append(variant)
+    return variants
+
+
+def make_prompt_set(variants, test_input):
+    """
+    Build a prompt set in the saved file format.
+
+    Args:
+        variants (list): One dict per variant with a "name" and VARIANT_FIELDS
+        test_input (str): The shared test input
+
+    Returns:
+        dict: The prompt set
+    """
+    return {
+        "variants": [
+            {"name": variant["name"], **{field: variant.get(field) for field in VARIANT_FIELDS}}
+            for variant in variants
+        ],
+        "test_input": test_input,
+    }
@@ -2,7 +2,8 @@
 Reasoning Parser Module
 
 This module provides functionality to parse out the <reasoning>...</reasoning> 
-section from the output of the meta prompt.
+section from the output of the meta prompt, either from the complete text or
+incrementally while the output is still streaming in.
 
 Dependencies:
 - re: For regular expression matching
@@ -59,4 +60,150 @@ def has_reasoning(text):
         return False
     
     pattern = r'<reasoning>.*?</reasoning>'
-    return bool(re.search(pattern, text, re.DOTALL))
\ No newline at end of file
+    return bool(re.search(pattern, text, re.DOTALL))
+
+
+# Channels that StreamingReasoningParser routes text to
+REASONING = "reasoning"
+OUTPUT = "output"
+
+_OPEN_TAG = "<reasoning>"
+_CLOSE_TAG = "</reasoning>"
+
+
+class _Channel:
+    """Strips leading and trailing whitespace from a channel's text as it streams"""
+    
+    def __init__(self):
+        self.started = False
+        self.pending_whitespace = ""
+        self.emitted = 0  # Characters returned by emit so far
+    
+    def emit(self, text):
+        """
+        Return the part of the text that can be shown now.
+        
+        Whitespace is held back until more non-whitespace text follows, so the
+        concatenated result equals the stripped text, as in extract_reasoning.
+        """
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self.started = True
+        body = text.rstrip()
+        if not body:
+            self.pending_whitespace += text
+            return ""
+        out = self.pending_whitespace + body
+        self.pending_whitespace = text[len(body):]
+        self.emitted += len(out)
+        return out
+
+
+class StreamingReasoningParser:
+    """
+    Incrementally splits streamed text into reasoning and output channels.
+    
+    Text is routed in a single pass as soon as the <reasoning> and </reasoning>
+    boundaries are seen, including tags that are split across chunks. Once
+    closed, the channels hold what extract_reasoning returns for the whole text:
+    only the first reasoning section is extracted and both channels are stripped
+    of surrounding whitespace. Without a complete reasoning section (no tags, or
+    a <reasoning> that is never closed) the whole unstripped text is output, so
+    close() then replaces what was streamed so far.
+    """
+    
+    def __init__(self):
+        """Initialize the parser in the state before any reasoning section"""
+        self._buffer = ""
+        self._tag = _OPEN_TAG  # Tag being looked for, or None once reasoning is closed
+        self._channel = OUTPUT
+        self._channels = {REASONING: _Channel(), OUTPUT: _Channel()}
+        self._raw = []  # Chunks fed until the reasoning section is closed
+        self.found_reasoning = False
+    
+    def feed(self, chunk):
+        """
+        Consume a chunk of streamed text.
+        
+        Args:
+            chunk (str): The next piece of text
+            
+        Returns:
+            list: (channel, text) pairs to append, in order
+        """
+        events = []
+        if self._raw is not None:
+            self._raw.append(chunk)
+        text = self._buffer + chunk
+        self._buffer = ""
+        
+        while self._tag is not None:
+            index = text.find(self._tag)
+            if index == -1:
+                break
+            self._route(events, text[:index])
+            text = text[index + len(self._tag):]
+            if self._tag == _OPEN_TAG:
+                self.found_reasoning = True
+                self._channel = REASONING
+                self._tag = _CLOSE_TAG
+            else:
+                self._channel = OUTPUT
+                self._tag = None
+                # The section is complete, so the stream's text can't be needed again
+                self._raw = None
+        
+        if self._tag is not None:
+            # Hold back a trailing partial tag until the next chunk completes it
+            for length in range(min(len(self._tag) - 1, len(text)), 0, -1):
+                if text.endswith(self._tag[:length]):
+                    self._buffer = text[-length:]
+                    text = text[:-length]
+                    break
+        
+        self._route(events, text)
+        return events
+    
+    def close(self):
+        """
+        Finish parsing and release any held-back text.
+        
+        Returns:
+            list: (channel, text) pairs to apply, in order; a pair whose text is
+                None means the text streamed to that channel so far is discarded
+        """
+        events = []
+        if self._raw is None:
+            self._route(events, self._buffer)
+            self._buffer = ""
+            return events
+        
+        # No complete reasoning section: like extract_reasoning, output the whole text as is
+        text = "".join(self._raw)
+        self._raw = None
+        self._buffer = ""
+        output = self._channels[OUTPUT]
+        if self.found_reasoning and self._channels[REASONING].emitted:
+            events.append((REASONING, None))
+        if self.found_reasoning or text[:1].isspace():
+            # What was streamed isn't a prefix of the text; start the output over
+            if output.emitted:
+                events.append((OUTPUT, None))
+            rest = text
+        else:
+            # Only trailing whitespace and held-back text are missing
+            rest = text[output.emitted:]
+        if rest:
+            events.append((OUTPUT, rest))
+        return events
+    
+    def _route(self, events, text):
+        """Append text for the current channel to the events list"""
+        if not text:
+            return
+        text = self._channels[self._channel].emit(text)
+        if text:
+            events.append((self._channel, text))
+
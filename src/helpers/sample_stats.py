@@ -0,0 +1,134 @@
+"""
+Sample Stats Module
+
+This module aggregates several samples generated from the same meta prompt and
+test input, so variants can be compared on distributions rather than on a
+single output: output length, latency percentiles across requests, how often
+the reasoning section is present, and how often the output follows the structure the default
+meta prompt asks for.
+
+Dependencies:
+- src.helpers.stats: Contains the percentile helpers
+- src.helpers.reasoning_parser: Contains the reasoning parsing functions
+"""
+
+import re
+
+from .stats import summarize
+from .reasoning_parser import has_reasoning, extract_reasoning
+
+_HEADING = re.compile(r"^#+\s")
+
+
+def _first_line(text):
+    """Get the first non-empty line of a text"""
+    return next((line.strip() for line in text.splitlines() if line.strip()), "")
+
+
+# Structural checks of a generated system prompt: name -> (description, check of the
+# full output text). They follow the output structure requested by the default meta prompt.
+STRUCTURE_CHECKS = {
+    "reasoning_first": (
+        "Starts with the <reasoning> section",
+        lambda text: text.lstrip().startswith("<reasoning>"),
+    ),
+    "instruction_first": (
+        "Prompt opens with an instruction, not a heading",
+        lambda text: not _HEADING.match(_first_line(extract_reasoning(text)[1])),
+    ),
+    "output_format": (
+        "Has an \"# Output Format\" section",
+        lambda text: re.search(r"^#+\s*Output Format\b", extract_reasoning(text)[1], re.MULTILINE) is not None,
+    ),
+    "no_code_fences": (
+        "No ``` code blocks",
+        lambda text: "```" not in extract_reasoning(text)[1],
+    ),
+    "no_separators": (
+        "No \"---\" before or after the prompt",
+        lambda text: not extract_reasoning(text)[1].strip().startswith("---")
+        and not extract_reasoning(text)[1].strip().endswith("---"),
+    ),
+}
+
+
+def check_structure(text):
+    """
+    Run the structural checks on a generated output.
+
+    Args:
+        text (str): The full generated output, including any reasoning section
+
+    Returns:
+        dict: Maps each name in STRUCTURE_CHECKS to whether the output passes it
+    """
+    return {name: bool(check(text)) for name, (_, check) in STRUCTURE_CHECKS.items()}
+
+
+def summarize_samples(samples):
+    """
+    Aggregate the samples of one variant.
+
+    Args:
+        samples (list): (text, RequestMetrics) pairs; text is None for failed samples
+
+    Samples returned by one request (the n parameter) share its metrics, so the
+    latency percentiles are taken across requests, not samples. When every sample
+    came from a single request there is no distribution: the latency percentiles
+    are None and request_latency holds the latency of that request.
+
+    Returns:
+        dict: samples, failed and requests counts, length (characters of the prompt
+            without reasoning) and latency (seconds, across successful requests)
+            summaries, request_latency, reasoning_rate, conformance_rate (share
+            passing every check), check_rates per check, and the total estimated
+            cost. Rates are fractions of the successful samples.
+    """
+    texts = [text for text, _ in samples if text is not None]
+    results = [check_structure(text) for text in texts]
+
+    # Count each request once, however many samples it returned
+    requests = {id(metrics): metrics for _, metrics in samples}
+    succeeded = {id(metrics): metrics for text, metrics in samples if text is not None}
+    latencies = [metrics.total_latency for metrics in succeeded.values() if metrics.total_latency is not None]
+    single = len(requests) == 1 and len(latencies) == 1
+
+    def rate(count):
+        return count / len(texts) if texts else None
+
+    return {
+        "samples": len(samples),
+        "failed": len(samples) - len(texts),
+        "requests": len(requests),
+        "length": summarize((len(extract_reasoning(text)[1]) for text in texts), (10, 50, 90)),
+        "latency": summarize([] if single else latencies, (50, 90, 99)),
+        "request_latency": latencies[0] if single else None,
+        "reasoning_rate": rate(sum(has_reasoning(text) for text in texts)),
+        "conformance_rate": rate(sum(all(result.values()) for result in results)),
+        "check_rates": {name: rate(sum(result[name] for result in results)) for name in STRUCTURE_CHECKS},
+        "cost": sum(metrics.estimated_cost for metrics in requests.values()),
+    }
+
+
+def describe_sample_stats(stats):
+    """
+    Get a compact one-line summary of sample stats, e.g. for the status bar.
+
+    Args:
+        stats (dict): Stats from summarize_samples
+
+    Returns:
+        str: The summary
+    """
+    ok = stats["samples"] - stats["failed"]
+    if not ok:
+        return f"all {stats['samples']} samples failed"
+    length = stats["length"]
+    latency = stats["latency"]
+    if stats["request_latency"] is not None:
+        latency_text = f"latency {stats['request_latency']:.1f}s (one request)"
+    else:
+        latency_text = f"latency p90 {latency['p90']:.1f}s" if latency["p90"] is not None else "latency p90 -"
+    return (f"{ok}/{stats['samples']} samples, length p50 {length['p50']:.0f} chars, "
+            f"{latency_text}, reasoning {stats['reasoning_rate']:.0%}, "
+            f"conformance {stats['conformance_rate']:.0%}")
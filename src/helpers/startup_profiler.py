@@ -0,0 +1,78 @@
+"""
+Startup Profiler Module
+
+This module provides the StartupProfiler class, which records how long each phase
+of application start-up takes (imports, window construction, first paint) and prints
+a short report. It is enabled with the --profile-startup command line flag.
+
+Dependencies:
+- PyQt6 (only for watching the first paint)
+"""
+
+import sys
+import time
+
+
+class StartupProfiler:
+    """Records named start-up milestones relative to process start"""
+
+    def __init__(self, start=None):
+        """
+        Initialize the profiler.
+
+        Args:
+            start (float, optional): perf_counter() value to measure from; defaults to now
+        """
+        self._start = time.perf_counter() if start is None else start
+        self._last = self._start
+        self._marks = []
+
+    def mark(self, name):
+        """
+        Record that a start-up phase has finished.
+
+        Args:
+            name (str): Name of the phase
+        """
+        now = time.perf_counter()
+        self._marks.append((name, now - self._last, now - self._start))
+        self._last = now
+
+    def watch_first_paint(self, widget, on_painted=None):
+        """
+        Mark "first paint" when the widget is painted for the first time.
+
+        Args:
+            widget (QWidget): The widget to watch, usually the main window
+            on_painted (callable, optional): Called after the first paint is recorded
+        """
+        from PyQt6.QtCore import QObject, QEvent
+
+        profiler = self
+
+        class _FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint:
+                    obj.removeEventFilter(self)
+                    profiler.mark("first paint")
+                    if on_painted is not None:
+                        on_painted()
+                return False
+
+        self._paint_filter = _FirstPaintFilter()
+        widget.installEventFilter(self._paint_filter)
+
+    def report(self, stream=None):
+        """
+        Print the recorded phases with their own and cumulative durations.
+
+        Args:
+            stream (file, optional): Where to print; defaults to stderr
+        """
+        stream = stream or sys.stderr
+        print("Startup profile:", file=stream)
+        for name, delta, total in self._marks:
+            print(f"  {name:<24} {delta * 1000:8.1f} ms  (total {total * 1000:8.1f} ms)", file=stream)
+        deferred = [module for module in ("openai", "httpx") if module not in sys.modules]
+        if deferred:
+            print(f"  not yet imported: {', '.join(deferred)}", file=stream)
@@ -0,0 +1,54 @@
+"""
+Stats Module
+
+This module provides small descriptive statistics helpers (percentiles and
+summaries of timing samples) used by the benchmarks and the metrics views.
+
+Dependencies:
+- None
+"""
+
+import math
+
+
+def percentile(values, pct):
+    """
+    Get a percentile of a set of values, interpolating between the closest ranks.
+
+    Args:
+        values (Iterable[float]): The values
+        pct (float): The percentile, between 0 and 100
+
+    Returns:
+        float | None: The percentile, or None if there are no values
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values, percentiles=(50, 90, 99)):
+    """
+    Summarize a set of values.
+
+    Args:
+        values (Iterable[float]): The values
+        percentiles (tuple): Percentiles to include, as "p50", "p90", ...
+
+    Returns:
+        dict: count, mean, min, max and the requested percentiles (None if empty)
+    """
+    values = list(values)
+    summary = {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else None,
+        "min": min(values) if values else None,
+        "max": max(values) if values else None,
+    }
+    for pct in percentiles:
+        summary[f"p{pct}"] = percentile(values, pct)
+    return summary
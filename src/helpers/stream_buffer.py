@@ -0,0 +1,76 @@
+"""
+Stream Buffer Module
+
+This module provides the StreamBuffer class, which collects streamed text chunks
+and appends them to a text widget in batches. Appending once per timer tick instead
+of once per chunk keeps repaints (and re-highlighting) cheap while a response streams in.
+
+Dependencies:
+- PyQt6
+"""
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QTextCursor
+
+# How often buffered chunks are written to the widget, in milliseconds
+FLUSH_INTERVAL_MS = 50
+
+
+class StreamBuffer(QObject):
+    """
+    Buffers streamed text and appends it to a QTextEdit/QPlainTextEdit periodically.
+    """
+
+    def __init__(self, text_edit, interval_ms=FLUSH_INTERVAL_MS, parent=None):
+        """
+        Initialize the stream buffer.
+
+        Args:
+            text_edit (QTextEdit | QPlainTextEdit): The widget to append text to
+            interval_ms (int): Delay between batched appends, in milliseconds
+            parent (QObject): Parent object
+        """
+        super().__init__(parent or text_edit)
+        self._text_edit = text_edit
+        self._pending = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def append(self, text):
+        """
+        Queue text to be appended on the next flush.
+
+        Args:
+            text (str): The chunk to append
+        """
+        if not text:
+            return
+        self._pending.append(text)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Append all queued text to the widget in a single edit"""
+        self._timer.stop()
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
+
+        # Keep following the end of the text only if the user hasn't scrolled up
+        scroll_bar = self._text_edit.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+
+        cursor = QTextCursor(self._text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def discard(self):
+        """Drop any queued text without appending it"""
+        self._timer.stop()
+        self._pending.clear()
@@ -30,54 +30,70 @@ class PromptSyntaxHighlighter(QSyntaxHighlighter):
             document (QTextDocument): The document to apply highlighting to
         """
         super().__init__(document)
-        self._highlighting_rules = []
+        
+        # While suspended, blocks are left unformatted (see DeferredHighlighter)
+        self.suspended = False
         
         # Format for text inside angle brackets <...> (vibrant blue)
-        angle_bracket_format = QTextCharFormat()
-        angle_bracket_format.setForeground(QColor("#0077FF"))  # Vibrant blue
-        angle_bracket_format.setFontWeight(QFont.Weight.Bold)
-        self._highlighting_rules.append((
-            QRegularExpression("<[^>]*>"),
-            angle_bracket_format
-        ))
+        self._angle_bracket_format = QTextCharFormat()
+        self._angle_bracket_format.setForeground(QColor("#0077FF"))  # Vibrant blue
+        self._angle_bracket_format.setFontWeight(QFont.Weight.Bold)
         
         # Format for text inside square brackets [...] (vibrant orange)
-        square_bracket_format = QTextCharFormat()
-        square_bracket_format.setForeground(QColor("#FF9500"))  # Vibrant orange
-        square_bracket_format.setFontWeight(QFont.Weight.Bold)
-        self._highlighting_rules.append((
-            QRegularExpression("\\[[^\\]]*\\]"),
-            square_bracket_format
-        ))
+        self._square_bracket_format = QTextCharFormat()
+        self._square_bracket_format.setForeground(QColor("#FF9500"))  # Vibrant orange
+        self._square_bracket_format.setFontWeight(QFont.Weight.Bold)
         
         # Format for markdown headers (rich red)
-        header_format = QTextCharFormat()
-        header_format.setForeground(QColor("#E02020"))  # Rich red
-        header_format.setFontWeight(QFont.Weight.Bold)
-        header_format.setFontPointSize(14)  # Larger font for headers
-        self._highlighting_rules.append((
-            QRegularExpression("^#+ .*$"),
-            header_format
-        ))
+        self._header_format = QTextCharFormat()
+        self._header_format.setForeground(QColor("#E02020"))  # Rich red
+        self._header_format.setFontWeight(QFont.Weight.Bold)
+        self._header_format.setFontPointSize(14)  # Larger font for headers
         
         # Format for bullet points (vibrant green)
-        bullet_format = QTextCharFormat()
-        bullet_format.setForeground(QColor("#00B050"))  # Vibrant green
-        bullet_format.setFontWeight(QFont.Weight.Bold)
-        self._highlighting_rules.append((
-            QRegularExpression("^- .*$"),
-            bullet_format
-        ))
+        self._bullet_format = QTextCharFormat()
+        self._bullet_format.setForeground(QColor("#00B050"))  # Vibrant green
+        self._bullet_format.setFontWeight(QFont.Weight.Bold)
+        
+        # Both bracket rules in one alternation, so each block is scanned once;
+        # the index of the captured group tells which rule matched
+        self._bracket_pattern = QRegularExpression("(<[^>]*>)|(\\[[^\\]]*\\])")
+        self._bracket_formats = {
+            1: self._angle_bracket_format,
+            2: self._square_bracket_format,
+        }
     
     def highlightBlock(self, text):
         """
-        Apply highlighting rules to the given block of text.
+        Apply highlighting rules to the given block of text in a single pass.
+        
+        Header and bullet lines are formatted as a whole, so they are recognized
+        from their first characters and skip the bracket scan entirely.
         
         Args:
             text (str): The text block to highlight
         """
-        for pattern, format in self._highlighting_rules:
-            match_iterator = pattern.globalMatch(text)
-            while match_iterator.hasNext():
-                match = match_iterator.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), format)
+        if self.suspended or not text:
+            return
+        
+        # Markdown header: one or more "#" followed by a space
+        if text[0] == "#":
+            if text.lstrip("#")[:1] == " ":
+                self.setFormat(0, self.currentBlock().length(), self._header_format)
+                return
+        # Bullet point: "- " at the start of the line
+        elif text.startswith("- "):
+            self.setFormat(0, self.currentBlock().length(), self._bullet_format)
+            return
+        
+        if "<" not in text and "[" not in text:
+            return
+        
+        match_iterator = self._bracket_pattern.globalMatch(text)
+        while match_iterator.hasNext():
+            match = match_iterator.next()
+            self.setFormat(
+                match.capturedStart(),
+                match.capturedLength(),
+                self._bracket_formats[match.lastCapturedIndex()]
+            )
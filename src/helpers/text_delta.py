@@ -0,0 +1,110 @@
+"""
+Text Delta Module
+
+This module computes compact deltas between two revisions of a text and applies
+them again. A delta is a list of operations: [start, end] copies that range of
+the old text, a string inserts that text. Edits to a long prompt usually touch
+a small region, so the common prefix and suffix are found first and only the
+changed middle is diffed (by line, when it is large); the delta then holds the
+new text of the edited region plus a few copy ranges.
+
+Dependencies:
+- None (difflib from the standard library)
+"""
+
+from difflib import SequenceMatcher
+
+# Changed regions shorter than this are stored as a single insert rather than line-diffed
+LINE_DIFF_MIN_CHARS = 256
+
+
+def _common_prefix(a, b):
+    """Get the length of the common prefix of two strings"""
+    low, high = 0, min(len(a), len(b))
+    # Binary search on slice comparisons, which run at C speed
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a, b, limit):
+    """Get the length of the common suffix of two strings, at most limit"""
+    low, high = 0, min(len(a), len(b), limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:] == b[len(b) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _line_ops(old, new, offset):
+    """Diff two texts by line; copies refer to old's position offset in the full old text"""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    starts = [offset]
+    for line in old_lines:
+        starts.append(starts[-1] + len(line))
+    ops = []
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([starts[i1], starts[i2]])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+
+def make_delta(old, new):
+    """
+    Compute the delta turning one text into another.
+
+    Args:
+        old (str): The previous revision
+        new (str): The new revision
+
+    Returns:
+        list: The operations, for apply_delta
+    """
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    old_middle = old[prefix:len(old) - suffix]
+    new_middle = new[prefix:len(new) - suffix]
+
+    ops = [[0, prefix]] if prefix else []
+    if len(new_middle) >= LINE_DIFF_MIN_CHARS and old_middle:
+        ops.extend(_line_ops(old_middle, new_middle, prefix))
+    elif new_middle:
+        ops.append(new_middle)
+    if suffix:
+        ops.append([len(old) - suffix, len(old)])
+
+    # Merge adjacent copies and inserts
+    merged = []
+    for op in ops:
+        if merged and isinstance(op, list) and isinstance(merged[-1], list) and merged[-1][1] == op[0]:
+            merged[-1] = [merged[-1][0], op[1]]
+        elif merged and isinstance(op, str) and isinstance(merged[-1], str):
+            merged[-1] += op
+        else:
+            merged.append(op)
+    return merged
+
+
+def apply_delta(old, delta):
+    """
+    Apply a delta to the text it was computed from.
+
+    Args:
+        old (str): The previous revision
+        delta (list): Operations from make_delta
+
+    Returns:
+        str: The new revision
+    """
+    return "".join(old[op[0]:op[1]] if isinstance(op, list) else op for op in delta)
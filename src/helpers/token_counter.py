@@ -0,0 +1,241 @@
+"""
+Token Counter Module
+
+This module counts the tokens of prompts locally, to show how much of a model's
+context window a request will use before it is sent.
+
+Counts are exact when the optional tiktoken package is installed: its o200k_base
+encoding (used by GPT-4o and the o-series models) is loaded on a background
+thread the first time a count is asked for, and functions registered with
+on_exact_counts are called once it is. Until then, or without tiktoken,
+counts are a fast estimate from a GPT-style split of the text into words,
+numbers, punctuation and whitespace. Either way counts are cached per line, so
+recounting a long prompt after an edit only tokenizes the lines that changed.
+
+Dependencies:
+- tiktoken (optional, exact counts)
+- src.helpers.model_selector: Contains the context windows of the models
+"""
+
+import re
+import threading
+
+from .model_selector import get_model
+
+# Encoding of the GPT-4o and o-series models
+ENCODING_NAME = "o200k_base"
+
+# Tokens of a request besides the texts: message framing and the task header of the user message
+REQUEST_OVERHEAD_TOKENS = 20
+
+# Remaining context below which a request is flagged, as the output may not fit
+LOW_BUDGET_TOKENS = 1500
+
+# Share by which an estimated count must exceed the context window before a request is refused
+ESTIMATE_MARGIN = 0.1
+
+# Cached line counts kept before the cache is cleared
+_CACHE_LIMIT = 50000
+
+_PIECE = re.compile(r"[^\W\d_]+|\d{1,3}|\s+|[^\w\s]+|_+")
+
+_encoding = None
+_encoding_state = "unloaded"  # "unloaded", "loading", "loaded" or "unavailable"
+_encoding_lock = threading.Lock()
+_line_cache = {}
+_exact_callbacks = []
+
+
+def _load_encoding():
+    """Load the tiktoken encoding; run on a background thread"""
+    global _encoding, _encoding_state
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding(ENCODING_NAME)
+    except Exception:
+        # Not installed, or the encoding can't be downloaded
+        with _encoding_lock:
+            _encoding_state = "unavailable"
+        return
+    with _encoding_lock:
+        _encoding = encoding
+        _encoding_state = "loaded"
+        # Cached counts are estimates; recount with the encoding
+        _line_cache.clear()
+        callbacks = list(_exact_callbacks)
+        _exact_callbacks.clear()
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception:
+            # E.g. a receiver deleted meanwhile; the others still need to recount
+            pass
+
+
+def _get_encoding():
+    """Get the tiktoken encoding if loaded, starting to load it on first use"""
+    global _encoding_state
+    with _encoding_lock:
+        if _encoding_state == "unloaded":
+            _encoding_state = "loading"
+            threading.Thread(target=_load_encoding, name="token-encoding", daemon=True).start()
+        return _encoding
+
+
+def on_exact_counts(callback):
+    """
+    Register a function to call once counts are exact, e.g. to recount shown texts.
+
+    The function is called on the thread loading the encoding, so GUI code
+    should hand it to its own thread (e.g. by emitting a signal). It is called
+    right away if the encoding is already loaded, and never without tiktoken.
+
+    Args:
+        callback (callable): Called without arguments
+    """
+    with _encoding_lock:
+        if _encoding_state != "loaded":
+            if _encoding_state != "unavailable":
+                _exact_callbacks.append(callback)
+            return
+    callback()
+
+
+def counts_are_exact():
+    """
+    Check whether counts come from the model's tokenizer rather than an estimate.
+
+    Returns:
+        bool: True once the tiktoken encoding is loaded
+    """
+    return _get_encoding() is not None
+
+
+def _estimate(text):
+    """Estimate the tokens of a text from its words, numbers, punctuation and whitespace"""
+    tokens = 0
+    for piece in _PIECE.findall(text):
+        first = piece[0]
+        if first.isalpha():
+            # Common words are one token; long and non-Latin words split into several
+            tokens += 1 + len(piece) // 8 if piece.isascii() else 1 + len(piece) // 2
+        elif first.isspace():
+            # A single space joins the following word's token
+            tokens += piece != " "
+        elif first.isdigit():
+            tokens += 1
+        else:
+            tokens += (len(piece) + 2) // 3
+    return tokens
+
+
+def count_tokens(text):
+    """
+    Count the tokens of a text, reusing the counts of lines seen before.
+
+    Args:
+        text (str): The text
+
+    Returns:
+        int: The number of tokens; an estimate unless counts_are_exact()
+    """
+    encoding = _get_encoding()
+    cache = _line_cache
+    total = 0
+    for line in text.splitlines(keepends=True):
+        tokens = cache.get(line)
+        if tokens is None:
+            tokens = len(encoding.encode_ordinary(line)) if encoding is not None else _estimate(line)
+            if len(cache) >= _CACHE_LIMIT:
+                cache.clear()
+            cache[line] = tokens
+        total += tokens
+    return total
+
+
+def request_budget(model, prompt_tokens, input_tokens):
+    """
+    Work out how much of a model's context window a request would use.
+
+    The meta prompt is the system message, and the test input (or, without
+    one, the meta prompt again) the user message.
+
+    Args:
+        model (str): The model name
+        prompt_tokens (int): Tokens of the meta prompt
+        input_tokens (int): Tokens of the test input; 0 if there is none
+
+    Returns:
+        dict: The model's "model" label and "context_window", the request's "tokens",
+            the "remaining" tokens for the output (negative when over), and the
+            "level": "ok", "low" (less than LOW_BUDGET_TOKENS left) or "over"
+    """
+    tokens = prompt_tokens + (input_tokens or prompt_tokens) + REQUEST_OVERHEAD_TOKENS
+    profile = get_model(model)
+    remaining = profile["context_window"] - tokens
+    level = "over" if remaining < 0 else "low" if remaining < LOW_BUDGET_TOKENS else "ok"
+    return {"model": profile["label"], "tokens": tokens, "context_window": profile["context_window"],
+            "remaining": remaining, "level": level}
+
+
+def exceeds_context(budget):
+    """
+    Check whether a request should be refused for not fitting the context window.
+
+    Estimated counts must exceed it by ESTIMATE_MARGIN, so an estimate that is
+    slightly off doesn't block a request that would fit.
+
+    Args:
+        budget (dict): Budget from request_budget
+
+    Returns:
+        bool: True if the request doesn't fit
+    """
+    limit = budget["context_window"] if counts_are_exact() else budget["context_window"] * (1 + ESTIMATE_MARGIN)
+    return budget["tokens"] > limit
+
+
+def format_tokens(tokens):
+    """
+    Format a token count compactly, e.g. "950", "12.5k" or "128k".
+
+    Args:
+        tokens (int): The count
+
+    Returns:
+        str: The formatted count
+    """
+    if abs(tokens) < 1000:
+        return str(tokens)
+    if abs(tokens) < 100000:
+        return f"{tokens / 1000:.1f}k".replace(".0k", "k")
+    return f"{int(tokens / 1000)}k"
+
+
+def describe_budget(tokens, budget, variant=None):
+    """
+    Describe a text's token count and the remaining context of its request.
+
+    Args:
+        tokens (int): Tokens of the text
+        budget (dict): Budget of the request, from request_budget
+        variant (str, optional): The variant the budget belongs to, if not obvious
+
+    Returns:
+        tuple: (label, tooltip): a compact label for a header, and the details
+    """
+    approximate = "" if counts_are_exact() else "~"
+    remaining = budget["remaining"]
+    status = f"over by {format_tokens(-remaining)}" if remaining < 0 else f"{format_tokens(remaining)} left"
+    label = f"{approximate}{format_tokens(tokens)} tokens · {status}"
+    lines = [
+        f"This text: {tokens:,} tokens",
+        f"Request: {budget['tokens']:,} tokens",
+        f"Context window of {budget['model']}: {budget['context_window']:,} tokens",
+        f"Left for the output: {remaining:,} tokens",
+    ]
+    if variant is not None:
+        lines.insert(1, f"Tightest variant: {variant}")
+    if approximate:
+        lines.append("Counts are estimates; install tiktoken for exact counts")
+    return label, "\n".join(lines)
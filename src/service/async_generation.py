@@ -0,0 +1,179 @@
+"""
+Async Generation Module
+
+This module generates detailed system prompts with the async OpenAI client,
+either as a whole (agenerate_prompt) or streamed (agenerate_prompt_stream).
+
+Dependencies:
+- chat_request.py: Builds and sends the chat completion requests
+- generation_records.py: Caches, measures and traces the generations
+- rate_limiter.py: Keeps requests within the account's rate limits
+- backends.py: Contains the backend registry
+- src.helpers.model_selector: Contains the model registry
+"""
+
+import asyncio
+import time
+
+from .chat_request import build_request, create_completion, send_request, timeout_error
+from .generation_records import cache_lookup, start_metrics, trace_request
+from .rate_limiter import get_rate_limiter, estimate_tokens, EXPECTED_OUTPUT_TOKENS
+from .request_metrics import RequestMetrics
+from .backends import resolve_backend
+from ..helpers.model_selector import DEFAULT_MODEL, get_model
+
+
+async def agenerate_prompt(meta_prompt: str, test_input: str = None, use_cache: bool = True,
+                           model: str = DEFAULT_MODEL, reasoning_effort: str = None,
+                           backend: str = None, metrics: RequestMetrics = None,
+                           timeout: float = None):
+    """
+    Generate a detailed system prompt based on user input, asynchronously.
+    
+    Cancelling the awaiting task aborts the HTTP request.
+    
+    Args:
+        meta_prompt (str): The meta prompt to use for generation
+        test_input (str, optional): The test input to use with the meta prompt
+        use_cache (bool, optional): Whether to reuse a cached response for an identical request
+        model (str, optional): The model to use, from the model registry
+        reasoning_effort (str, optional): "low", "medium" or "high" for reasoning models
+        backend (str, optional): The backend to use; defaults to META_PROMPT_BACKEND or "openai"
+        metrics (RequestMetrics, optional): Filled in with the timings, usage and cost of the request
+        timeout (float, optional): Seconds the whole generation may take, including retries
+        
+    Returns:
+        str: The generated system prompt
+        
+    Raises:
+        TimeoutError: If the generation takes longer than timeout
+    """
+    backend = resolve_backend(backend)
+    metrics = start_metrics(metrics, model, backend)
+    messages = params = None
+    try:
+        messages, params = build_request(meta_prompt, test_input, model, reasoning_effort)
+        cache, key, cached = await cache_lookup(messages, params, use_cache, backend)
+        if cached is not None:
+            metrics.cache_hit = True
+            metrics.mark_first_token()
+            return cached
+        
+        completion = await send_request(messages, params, backend, metrics, timeout)
+        content = completion.choices[0].message.content
+        metrics.mark_first_token()
+        if completion.usage is None:
+            metrics.estimate_usage(estimate_tokens(messages) - EXPECTED_OUTPUT_TOKENS, content or "")
+        if cache is not None and content is not None:
+            await asyncio.to_thread(cache.put, key, content)
+        return content
+    except asyncio.CancelledError:
+        metrics.error = "cancelled"
+        raise
+    except Exception as e:
+        metrics.error = str(e)
+        raise
+    finally:
+        metrics.mark_completed()
+        trace_request(metrics, messages, params, stream=False)
+
+async def agenerate_prompt_stream(meta_prompt: str, test_input: str = None, use_cache: bool = True,
+                                  model: str = DEFAULT_MODEL, reasoning_effort: str = None,
+                                  backend: str = None, metrics: RequestMetrics = None,
+                                  timeout: float = None):
+    """
+    Generate a detailed system prompt, yielding the text asynchronously as it is produced.
+    
+    A cached response, or the response of a model that can't stream, is yielded
+    as a single chunk. A streamed response is only cached once it has been
+    received completely. Closing the generator (aclose) or cancelling the task
+    iterating it closes the HTTP stream.
+    
+    Args:
+        meta_prompt (str): The meta prompt to use for generation
+        test_input (str, optional): The test input to use with the meta prompt
+        use_cache (bool, optional): Whether to reuse a cached response for an identical request
+        model (str, optional): The model to use, from the model registry
+        reasoning_effort (str, optional): "low", "medium" or "high" for reasoning models
+        backend (str, optional): The backend to use; defaults to META_PROMPT_BACKEND or "openai"
+        metrics (RequestMetrics, optional): Filled in with the timings, usage and cost of the request
+        timeout (float, optional): Seconds the whole generation may take, including retries
+        
+    Yields:
+        str: Successive chunks of the generated system prompt
+        
+    Raises:
+        TimeoutError: If the generation takes longer than timeout
+    """
+    if not get_model(model)["supports_streaming"]:
+        yield await agenerate_prompt(meta_prompt, test_input, use_cache, model, reasoning_effort,
+                                     backend, metrics, timeout)
+        return
+    
+    backend = resolve_backend(backend)
+    metrics = start_metrics(metrics, model, backend)
+    messages = params = None
+    deadline = None if timeout is None else time.monotonic() + timeout
+    
+    async def before_deadline(awaitable):
+        # The time spent by the caller between chunks counts towards the timeout too
+        try:
+            if deadline is None:
+                return await awaitable
+            return await asyncio.wait_for(awaitable, max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            raise timeout_error(timeout) from None
+    
+    try:
+        messages, params = build_request(meta_prompt, test_input, model, reasoning_effort)
+        cache, key, cached = await cache_lookup(messages, params, use_cache, backend)
+        if cached is not None:
+            metrics.cache_hit = True
+            metrics.mark_first_token()
+            yield cached
+            return
+        
+        # Leaving the blocks releases the connection and the rate limiter slot,
+        # even if the caller stops early
+        chunks = []
+        usage = None
+        limiter = get_rate_limiter(backend)
+        async with limiter.aslot():
+            stream = await before_deadline(create_completion(messages, params, backend, metrics, stream=True))
+            async with stream:
+                iterator = stream.__aiter__()
+                while True:
+                    try:
+                        chunk = await before_deadline(iterator.__anext__())
+                    except StopAsyncIteration:
+                        break
+                    # The usage arrives in a final chunk without choices
+                    usage = getattr(chunk, "usage", None) or usage
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        metrics.mark_first_token()
+                        chunks.append(content)
+                        yield content
+        
+        text = "".join(chunks)
+        estimated = estimate_tokens(messages)
+        if usage is not None:
+            metrics.record_usage(usage)
+            limiter.record_usage(estimated, metrics.prompt_tokens + metrics.completion_tokens)
+        else:
+            metrics.estimate_usage(estimated - EXPECTED_OUTPUT_TOKENS, text)
+        if cache is not None:
+            await asyncio.to_thread(cache.put, key, text)
+    except (GeneratorExit, asyncio.CancelledError):
+        # The caller closed the stream early, e.g. because the generation was cancelled
+        if metrics.error is None:
+            metrics.error = "cancelled"
+        raise
+    except Exception as e:
+        metrics.error = str(e)
+        raise
+    finally:
+        metrics.mark_completed()
+        trace_request(metrics, messages, params, stream=True)
@@ -0,0 +1,105 @@
+"""
+Async Runtime Module
+
+This module runs a shared asyncio event loop on a background thread, so that
+synchronous code (the UI's worker threads, the batch runner, the CLI) can use the
+async generation functions. Coroutines are submitted to the loop and their results
+waited for on the calling thread; async generators are iterated one item at a time.
+
+Because every synchronous call goes through the same loop, all requests share the
+loop's async HTTP clients and connection pools.
+
+Dependencies:
+- None
+"""
+
+import asyncio
+import threading
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_loop():
+    """
+    Get the shared background event loop, starting its thread on first use.
+
+    Returns:
+        asyncio.AbstractEventLoop: The running loop
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            threading.Thread(target=run, name="async-runtime", daemon=True).start()
+            ready.wait()
+            _loop = loop
+        return _loop
+
+
+def run_sync(coroutine):
+    """
+    Run a coroutine on the shared loop and wait for its result.
+
+    If the waiting thread is interrupted (e.g. KeyboardInterrupt), the coroutine
+    is cancelled on the loop.
+
+    Args:
+        coroutine (Coroutine): The coroutine to run
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from the shared loop's own thread
+        Exception: Whatever the coroutine raises
+    """
+    loop = get_loop()
+    if _on_loop_thread(loop):
+        coroutine.close()
+        raise RuntimeError("run_sync() can't be called from the async runtime's own thread")
+    future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def iterate_sync(async_iterator):
+    """
+    Iterate an async generator from synchronous code, one item at a time.
+
+    Closing the returned generator (or abandoning it) closes the async generator
+    on the loop, which runs its cleanup, e.g. closing an HTTP stream.
+
+    Args:
+        async_iterator (AsyncGenerator): The async generator to iterate
+
+    Yields:
+        The async generator's items
+    """
+    try:
+        while True:
+            try:
+                item = run_sync(async_iterator.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        run_sync(async_iterator.aclose())
+
+
+def _on_loop_thread(loop):
+    """Check whether the current thread is running the loop"""
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
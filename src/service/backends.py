@@ -0,0 +1,117 @@
+"""
+Backends Module
+
+This module contains the registry of backends that generation requests can be sent
+to. Every backend speaks the OpenAI chat completions API, so the same client code
+works against OpenAI itself, the bundled mock server (see mock_server.py) or any
+other OpenAI-compatible endpoint registered with register_backend.
+
+The backend used when none is given is "openai", or the one named by the
+META_PROMPT_BACKEND environment variable.
+
+Dependencies:
+- None
+"""
+
+import os
+
+DEFAULT_BACKEND = "openai"
+
+# Address the mock server listens on by default
+MOCK_SERVER_HOST = "127.0.0.1"
+MOCK_SERVER_PORT = 8765
+
+# base_url/api_key of None fall back to the SDK defaults (OPENAI_BASE_URL/OPENAI_API_KEY);
+# http2 enables HTTP/2 for backends served over TLS, when the h2 package is installed
+BACKENDS = {
+    "openai": {
+        "label": "OpenAI",
+        "base_url": None,
+        "api_key": None,
+        "http2": True,
+    },
+    "mock": {
+        "label": "Local mock server",
+        "base_url": os.environ.get(
+            "META_PROMPT_MOCK_URL", f"http://{MOCK_SERVER_HOST}:{MOCK_SERVER_PORT}/v1"
+        ),
+        "api_key": "mock",
+        "http2": False,
+    },
+}
+
+
+def list_backends():
+    """
+    List the registered backends.
+
+    Returns:
+        list: Backend names, in registry order
+    """
+    return list(BACKENDS)
+
+
+def get_backend(name):
+    """
+    Get the settings of a backend.
+
+    Args:
+        name (str): The backend name
+
+    Returns:
+        dict: The backend settings
+
+    Raises:
+        ValueError: If the backend isn't registered
+    """
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown backend: {name}") from None
+
+
+def default_backend():
+    """
+    Get the name of the backend used when none is given.
+
+    Returns:
+        str: The META_PROMPT_BACKEND environment variable, or "openai"
+    """
+    return os.environ.get("META_PROMPT_BACKEND", DEFAULT_BACKEND)
+
+
+def resolve_backend(name=None):
+    """
+    Resolve an optional backend name to a registered one.
+
+    Args:
+        name (str, optional): The backend name; None selects the default backend
+
+    Returns:
+        str: The backend name
+
+    Raises:
+        ValueError: If the backend isn't registered
+    """
+    name = name or default_backend()
+    get_backend(name)
+    return name
+
+
+def register_backend(name, base_url, api_key=None, label=None, http2=False):
+    """
+    Register an OpenAI-compatible backend, replacing any with the same name.
+
+    Args:
+        name (str): The backend name
+        base_url (str): Base URL of the API, e.g. "http://localhost:8000/v1"
+        api_key (str, optional): API key to send; defaults to the SDK's OPENAI_API_KEY
+        label (str, optional): Human-readable name; defaults to the backend name
+        http2 (bool): Whether to use HTTP/2, for servers that support it
+    """
+    BACKENDS[name] = {
+        "label": label or name,
+        "base_url": base_url,
+        "api_key": api_key,
+        "http2": http2,
+    }
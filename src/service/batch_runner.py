@@ -0,0 +1,187 @@
+"""
+Batch Runner Module
+
+This module runs a file of test inputs through one or more meta prompts without the UI.
+All requests run as coroutines on the shared event loop (see async_runtime.py), at most
+`concurrency` of them in flight, so a batch needs no thread per request. Each result is
+appended to a JSONL output file as soon as it completes, so large evaluations can be
+monitored (and survive interruption) while they run.
+
+Dependencies:
+- src.service.async_generation: Contains the agenerate_prompt function
+- src.service.async_runtime: Runs the batch on the shared event loop
+- src.service.request_metrics: Records the usage and cost of each request
+- src.helpers.reasoning_parser: Contains the reasoning parsing functions
+- src.helpers.prompt_set: Reads saved prompt sets
+"""
+
+import asyncio
+import csv
+import json
+import os
+import time
+
+from .async_generation import agenerate_prompt
+from .async_runtime import run_sync
+from .request_metrics import RequestMetrics
+from ..helpers.reasoning_parser import extract_reasoning
+from ..helpers.prompt_set import read_variants
+
+DEFAULT_CONCURRENCY = 8
+
+# Column/field names accepted for the test input text, in order of preference
+_INPUT_FIELDS = ("test_input", "input", "prompt", "text")
+
+
+def _input_record(index, row):
+    """Normalize a JSONL/CSV row into an {"id", "input"} record"""
+    if isinstance(row, str):
+        return {"id": str(index), "input": row}
+    for field in _INPUT_FIELDS:
+        if field in row:
+            return {"id": str(row.get("id", index)), "input": row[field]}
+    raise ValueError(f"Row {index} has none of the fields: {', '.join(_INPUT_FIELDS)}")
+
+
+def load_test_inputs(path):
+    """
+    Load test inputs from a JSONL or CSV file.
+
+    JSONL lines may be plain strings or objects; objects and CSV rows take the
+    input from a "test_input", "input", "prompt" or "text" field and an optional "id".
+
+    Args:
+        path (str): Path to a .jsonl or .csv file
+
+    Returns:
+        list: Records of the form {"id": str, "input": str}
+    """
+    records = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            for index, row in enumerate(csv.DictReader(f)):
+                records.append(_input_record(index, row))
+        else:
+            for index, line in enumerate(line for line in f if line.strip()):
+                records.append(_input_record(index, json.loads(line)))
+    return records
+
+
+def load_meta_prompts(paths):
+    """
+    Load meta prompts from text files or saved prompt sets.
+
+    A saved prompt set (.json written by the UI) contributes the prompt of each
+    of its variants; any other file is used as a single meta prompt.
+
+    Args:
+        paths (list): Paths to meta prompt files
+
+    Returns:
+        dict: Maps a name derived from the file name to the meta prompt text
+    """
+    meta_prompts = {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if path.lower().endswith(".json"):
+            data = json.loads(text)
+            for variant in read_variants(data):
+                if "prompt" in variant:
+                    meta_prompts[f"{name}:{variant['name']}"] = variant["prompt"]
+        else:
+            meta_prompts[name] = text
+    return meta_prompts
+
+
+async def _run_one(semaphore, meta_name, meta_prompt, record, use_cache, options):
+    """Generate a single output once a slot is free and build its result record"""
+    async with semaphore:
+        start = time.monotonic()
+        metrics = RequestMetrics()
+        result = {"input_id": record["id"], "meta_prompt": meta_name}
+        try:
+            full_output = await agenerate_prompt(meta_prompt, record["input"], use_cache=use_cache,
+                                                 metrics=metrics, **options)
+        except Exception as e:
+            result["error"] = str(e)
+        else:
+            reasoning, output = extract_reasoning(full_output or "")
+            result["output"] = output
+            result["reasoning"] = reasoning
+        result["elapsed"] = round(time.monotonic() - start, 3)
+    for key in ("model", "cache_hit", "prompt_tokens", "completion_tokens", "reasoning_tokens", "retries"):
+        result[key] = getattr(metrics, key)
+    result["estimated_cost"] = round(metrics.estimated_cost, 6)
+    return result
+
+
+async def arun_batch(test_inputs, meta_prompts, output_path, concurrency=DEFAULT_CONCURRENCY,
+                     use_cache=True, on_result=None, **options):
+    """
+    Run every test input through every meta prompt and stream results to a JSONL file, asynchronously.
+
+    Cancelling the awaiting task cancels the requests still running or queued.
+
+    Args:
+        test_inputs (list): Records from load_test_inputs
+        meta_prompts (dict): Meta prompts from load_meta_prompts
+        output_path (str): JSONL file that results are appended to in completion order
+        concurrency (int): Maximum number of requests in flight
+        use_cache (bool): Whether to reuse cached responses
+        on_result (callable, optional): Called on the event loop with each result record as it completes
+        **options: Extra keyword arguments for agenerate_prompt (e.g. model, reasoning_effort)
+
+    Returns:
+        dict: Summary with the number of requests, failures and total elapsed seconds
+    """
+    start = time.monotonic()
+    failed = 0
+    total = 0
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    with open(output_path, "a", encoding="utf-8") as out:
+        tasks = [
+            asyncio.ensure_future(_run_one(semaphore, meta_name, meta_prompt, record, use_cache, options))
+            for record in test_inputs
+            for meta_name, meta_prompt in meta_prompts.items()
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                total += 1
+                failed += "error" in result
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                if on_result is not None:
+                    on_result(result)
+        finally:
+            # Interrupted (e.g. Ctrl+C): stop the requests in flight and don't start queued ones
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    return {"requests": total, "failed": failed, "elapsed": round(time.monotonic() - start, 3)}
+
+
+def run_batch(test_inputs, meta_prompts, output_path, concurrency=DEFAULT_CONCURRENCY,
+              use_cache=True, on_result=None, **options):
+    """
+    Run every test input through every meta prompt and stream results to a JSONL file.
+
+    The requests run on the shared event loop (see arun_batch); this waits for them.
+
+    Args:
+        test_inputs (list): Records from load_test_inputs
+        meta_prompts (dict): Meta prompts from load_meta_prompts
+        output_path (str): JSONL file that results are appended to in completion order
+        concurrency (int): Maximum number of requests in flight
+        use_cache (bool): Whether to reuse cached responses
+        on_result (callable, optional): Called with each result record as it completes,
+            on the event loop's thread
+        **options: Extra keyword arguments for agenerate_prompt (e.g. model, reasoning_effort)
+
+    Returns:
+        dict: Summary with the number of requests, failures and total elapsed seconds
+    """
+    return run_sync(arun_batch(test_inputs, meta_prompts, output_path, concurrency, use_cache,
+                               on_result, **options))
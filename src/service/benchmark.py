@@ -0,0 +1,198 @@
+"""
+Benchmark Module
+
+This module contains the benchmark suite for the generation pipeline. It runs
+entirely offline against an in-process mock server (see mock_server.py) and
+writes its results as JSON, so runs on different commits can be compared.
+
+Suites:
+- generation: generate_prompt throughput and latency percentiles at several concurrency levels
+- reasoning: extract_reasoning cost across response sizes
+- highlighter: PromptSyntaxHighlighter time per 1k lines
+- save_load: saving and loading a large prompt set through the main window
+
+Run it with:
+    python main.py --benchmark --output results.json
+    python main.py --benchmark --compare baseline.json
+
+Dependencies:
+- benchmark_suites.py: Contains the benchmark suites
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from .benchmark_suites import SUITE_RUNNERS
+
+SUITES = tuple(SUITE_RUNNERS)
+
+# Settings for a full run, and the smaller ones used with --quick
+DEFAULT_SETTINGS = {
+    "concurrency": [1, 4, 16],
+    "requests": 48,
+    "latency": 0.05,
+    "tokens_per_sec": 2000.0,
+    "response_tokens": 300,
+    "reasoning_sizes": [1000, 10000, 100000, 1000000],
+    "highlight_lines": 20000,
+    "prompt_set_lines": 20000,
+}
+QUICK_SETTINGS = {
+    **DEFAULT_SETTINGS,
+    "concurrency": [1, 4],
+    "requests": 8,
+    "reasoning_sizes": [1000, 100000],
+    "highlight_lines": 2000,
+    "prompt_set_lines": 2000,
+}
+
+# Metrics where a larger value is an improvement; all others are durations
+_HIGHER_IS_BETTER = ("_rps", "_mb_per_s")
+
+
+def flatten_metrics(results):
+    """
+    Flatten benchmark results into comparable "suite.case.metric" values.
+
+    Args:
+        results (dict): Results keyed by suite
+
+    Returns:
+        dict: Metric name to value
+    """
+    metrics = {}
+    for entry in results.get("generation", []):
+        prefix = f"generation.c{entry['concurrency']}"
+        metrics[f"{prefix}.throughput_rps"] = entry["throughput_rps"]
+        for pct in ("p50", "p90", "p99"):
+            if entry["latency_ms"][pct] is not None:
+                metrics[f"{prefix}.latency_{pct}_ms"] = entry["latency_ms"][pct]
+    for entry in results.get("reasoning", []):
+        metrics[f"reasoning.{entry['chars']}.best_ms"] = entry["best_ms"]
+    if "highlighter" in results:
+        metrics["highlighter.per_1k_lines_ms"] = results["highlighter"]["per_1k_lines_ms"]
+    if "save_load" in results:
+        for key in ("save_ms", "load_ms", "load_settled_ms"):
+            metrics[f"save_load.{key}"] = results["save_load"][key]
+    return metrics
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Compare two sets of metrics.
+
+    Args:
+        baseline (dict): Metrics of the reference run
+        current (dict): Metrics of the new run
+        threshold (float): Relative change from which a metric counts as changed
+
+    Returns:
+        list: (metric, baseline, current, relative_change, verdict) for each shared metric;
+            verdict is "better", "worse" or "same"
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        old, new = baseline[name], current[name]
+        change = (new - old) / old if old else 0.0
+        improvement = change if name.endswith(_HIGHER_IS_BETTER) else -change
+        if abs(change) < threshold:
+            verdict = "same"
+        else:
+            verdict = "better" if improvement > 0 else "worse"
+        rows.append((name, old, new, change, verdict))
+    return rows
+
+
+def _git_commit():
+    """Get the current git commit, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(suites=SUITES, settings=None, log=None):
+    """
+    Run benchmark suites.
+
+    Args:
+        suites (Iterable[str]): Names of the suites to run
+        settings (dict, optional): Benchmark settings; defaults to DEFAULT_SETTINGS
+        log (callable, optional): Called with a progress message before each suite
+
+    Returns:
+        dict: The report, with metadata, settings, results per suite and flat metrics
+    """
+    settings = settings or DEFAULT_SETTINGS
+    results = {}
+    for suite in suites:
+        if log is not None:
+            log(f"Running {suite}...")
+        results[suite] = SUITE_RUNNERS[suite](settings)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "settings": settings,
+        "results": results,
+        "metrics": flatten_metrics(results),
+    }
+
+
+def main(argv=None):
+    """Run the benchmarks from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="main.py --benchmark",
+        description="Benchmark the generation pipeline offline against the mock server."
+    )
+    parser.add_argument("--suite", action="append", choices=SUITES,
+                        help="Suite to run; repeatable (default: all)")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="JSON file to write the results to (default: %(default)s)")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Results file of an earlier run to compare against")
+    parser.add_argument("--quick", action="store_true", help="Use smaller sizes, e.g. for CI")
+    parser.add_argument("--concurrency", help="Comma-separated concurrency levels, e.g. 1,4,16")
+    parser.add_argument("--requests", type=int, help="Requests per concurrency level")
+    parser.add_argument("--latency", type=float, help="Mock server latency before the first token, in seconds")
+    parser.add_argument("--tokens-per-sec", type=float, help="Mock server token rate")
+    args = parser.parse_args(argv)
+
+    settings = dict(QUICK_SETTINGS if args.quick else DEFAULT_SETTINGS)
+    if args.concurrency:
+        settings["concurrency"] = [int(level) for level in args.concurrency.split(",")]
+    for key in ("requests", "latency", "tokens_per_sec"):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+
+    report = run_benchmarks(args.suite or SUITES, settings,
+                            log=lambda message: print(message, file=sys.stderr))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name, value in report["metrics"].items():
+        print(f"{name:<40} {value:12.3f}")
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} ({baseline['meta'].get('commit') or 'unknown commit'}):")
+        for name, old, new, change, verdict in compare(baseline["metrics"], report["metrics"]):
+            print(f"{name:<40} {old:12.3f} -> {new:12.3f}  {change:+7.1%}  {verdict}")
+
+
+if __name__ == "__main__":
+    main()
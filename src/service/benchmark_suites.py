@@ -0,0 +1,260 @@
+"""
+Benchmark Suites Module
+
+This module contains the suites of the benchmark (see benchmark.py). Each suite
+takes the benchmark settings and returns its results as plain data.
+
+Suites:
+- generation: agenerate_prompt throughput and latency percentiles at several concurrency levels
+- reasoning: extract_reasoning cost across response sizes
+- highlighter: PromptSyntaxHighlighter time per 1k lines
+- save_load: saving and loading a large prompt set through the main window
+
+Dependencies:
+- PyQt6 (highlighter and save_load suites only)
+- mock_server.py: Contains the mock server
+- mock_responses.py: Generates canned responses
+- async_generation.py: Contains the agenerate_prompt function
+- async_runtime.py: Runs the requests on the shared event loop
+- src.helpers.reasoning_parser: Contains the extract_reasoning function
+- src.helpers.stats: Contains the percentile helpers
+- src.helpers.prompt_set: Contains the saved prompt set format
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from .mock_server import start_mock_server
+from .mock_responses import canned_response
+from .backends import register_backend
+from .async_generation import agenerate_prompt
+from .async_runtime import run_sync
+from ..helpers.reasoning_parser import extract_reasoning
+from ..helpers.stats import summarize
+from ..helpers.prompt_set import make_prompt_set
+from ..prompts.default_meta_prompt import META_PROMPT
+
+# Backend name the in-process mock server is registered under
+BENCHMARK_BACKEND = "benchmark"
+
+
+def _repeat(fn, min_time=0.2, max_runs=1000):
+    """
+    Call fn repeatedly and return the duration of each call.
+
+    Args:
+        fn (callable): The function to time
+        min_time (float): Keep calling until this many seconds have passed
+        max_runs (int): Upper bound on the number of calls
+
+    Returns:
+        list: Duration of each call, in seconds
+    """
+    durations = []
+    deadline = time.perf_counter() + min_time
+    while len(durations) < max_runs and (len(durations) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _lines(text, count):
+    """Repeat the lines of text until there are count of them"""
+    source = text.strip("\n").splitlines()
+    return "\n".join(source[i % len(source)] for i in range(count))
+
+
+def _qt_app():
+    """Get the QApplication, creating an offscreen one if needed"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([sys.argv[0]])
+
+
+def bench_generation(settings):
+    """
+    Measure agenerate_prompt throughput and latency against the mock server.
+
+    Each level runs its requests as coroutines on the shared event loop, at most
+    that many in flight, as the batch runner does.
+
+    Args:
+        settings (dict): Benchmark settings
+
+    Returns:
+        list: One result per concurrency level
+    """
+    server = start_mock_server(
+        port=0, latency=settings["latency"], tokens_per_sec=settings["tokens_per_sec"],
+        response_tokens=settings["response_tokens"],
+    )
+    register_backend(BENCHMARK_BACKEND, server.base_url, api_key="benchmark", label="Benchmark mock server")
+    try:
+        # Warm up the client and connection pool outside the measurements
+        run_sync(agenerate_prompt(META_PROMPT, "warm-up", use_cache=False, backend=BENCHMARK_BACKEND))
+
+        async def one(semaphore, level, index):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    await agenerate_prompt(META_PROMPT, f"benchmark {level}/{index}", use_cache=False,
+                                           backend=BENCHMARK_BACKEND)
+                except Exception:
+                    return None
+                return time.perf_counter() - start
+
+        async def run_level(level):
+            semaphore = asyncio.Semaphore(level)
+            return await asyncio.gather(*(one(semaphore, level, index) for index in range(settings["requests"])))
+
+        results = []
+        for level in settings["concurrency"]:
+            start = time.perf_counter()
+            durations = run_sync(run_level(level))
+            elapsed = time.perf_counter() - start
+
+            latencies = [d * 1000 for d in durations if d is not None]
+            results.append({
+                "concurrency": level,
+                "requests": len(durations),
+                "errors": len(durations) - len(latencies),
+                "elapsed_s": elapsed,
+                "throughput_rps": len(latencies) / elapsed,
+                "latency_ms": summarize(latencies),
+            })
+        return results
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_reasoning(settings):
+    """
+    Measure extract_reasoning on responses of increasing size.
+
+    Args:
+        settings (dict): Benchmark settings
+
+    Returns:
+        list: One result per response size
+    """
+    results = []
+    for size in settings["reasoning_sizes"]:
+        text = canned_response(f"reasoning {size}", tokens=max(10, size // 6))
+        durations = _repeat(lambda: extract_reasoning(text))
+        best = min(durations)
+        results.append({
+            "chars": len(text),
+            "runs": len(durations),
+            "best_ms": best * 1000,
+            "median_ms": summarize([d * 1000 for d in durations])["p50"],
+            "throughput_mb_per_s": len(text) / best / 1e6,
+        })
+    return results
+
+
+def bench_highlighter(settings):
+    """
+    Measure a full rehighlight of a large prompt with PromptSyntaxHighlighter.
+
+    Args:
+        settings (dict): Benchmark settings
+
+    Returns:
+        dict: The result
+    """
+    _qt_app()
+    from PyQt6.QtGui import QTextDocument
+    from ..helpers.syntax_highlighter import PromptSyntaxHighlighter
+
+    lines = settings["highlight_lines"]
+    document = QTextDocument(_lines(META_PROMPT, lines))
+    highlighter = PromptSyntaxHighlighter(document)
+    durations = _repeat(highlighter.rehighlight, max_runs=20)
+    best = min(durations)
+    return {
+        "lines": lines,
+        "runs": len(durations),
+        "best_ms": best * 1000,
+        "per_1k_lines_ms": best * 1000 / (lines / 1000),
+    }
+
+
+def bench_save_load(settings):
+    """
+    Measure saving and loading a large prompt set through the main window.
+
+    Loading is timed until the call returns (what the user waits for) and until
+    deferred highlighting of the loaded text has finished.
+
+    Args:
+        settings (dict): Benchmark settings
+
+    Returns:
+        dict: The result
+    """
+    app = _qt_app()
+    from ..ui.main_window import MainWindow
+
+    lines = settings["prompt_set_lines"]
+    prompt = _lines(META_PROMPT, lines)
+    output = _lines(canned_response("save_load", tokens=lines * 8), lines)
+    reasoning, output = extract_reasoning(output)
+    data = make_prompt_set([
+        {"name": "A", "prompt": prompt, "output": output, "reasoning": reasoning},
+        {"name": "B", "prompt": prompt.replace("prompt", "Prompt"), "output": output.upper(),
+         "reasoning": reasoning},
+    ], "benchmark")
+    empty = make_prompt_set([{"name": "A"}, {"name": "B"}], "")
+
+    # Leave the user's autosave journal and prompt history alone
+    window = MainWindow(autosave=False, history=False)
+    view = window.comparison_view
+    highlighted = [view.variant_widgets(name)[key] for name in ("A", "B") for key in ("editor", "output")]
+
+    def settle():
+        while any(widget.deferred_highlighter.is_pending() for widget in highlighted):
+            app.processEvents()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "prompt_set.json")
+        window.apply_prompt_set(data)
+        settle()
+
+        start = time.perf_counter()
+        window.save_prompt_set(path)
+        save = time.perf_counter() - start
+
+        window.apply_prompt_set(empty)
+        settle()
+
+        start = time.perf_counter()
+        window.load_prompt_set(path)
+        load = time.perf_counter() - start
+        settle()
+        load_settled = time.perf_counter() - start
+
+        size = os.path.getsize(path)
+
+    window.close()
+    window.deleteLater()
+    return {
+        "lines_per_field": lines,
+        "file_bytes": size,
+        "save_ms": save * 1000,
+        "load_ms": load * 1000,
+        "load_settled_ms": load_settled * 1000,
+    }
+
+
+# Suite name -> function running it
+SUITE_RUNNERS = {
+    "generation": bench_generation,
+    "reasoning": bench_reasoning,
+    "highlighter": bench_highlighter,
+    "save_load": bench_save_load,
+}
@@ -2,49 +2,100 @@
 Caption Creator Module
 
 This module provides functionality to generate detailed system prompts
-for language models based on user input.
+for language models based on user input. Requests are made with the async
+OpenAI client (agenerate_prompt, agenerate_prompt_stream, agenerate_samples);
+generate_prompt, generate_prompt_stream and generate_samples are synchronous
+wrappers around them.
 
 Dependencies:
 - meta_prompt.py: Contains the META_PROMPT template
+- async_generation.py: Contains agenerate_prompt and agenerate_prompt_stream
+- prompt_samples.py: Contains agenerate_samples
+- async_runtime.py: Runs the async functions for synchronous callers
+- request_metrics.py: Records the timings, usage and cost of each request
+- src.helpers.model_selector: Contains the model registry
 """
 
-from openai import OpenAI
 from ..prompts.default_meta_prompt import META_PROMPT
+from .async_generation import agenerate_prompt, agenerate_prompt_stream
+from .prompt_samples import agenerate_samples
+from .request_metrics import RequestMetrics
+from .async_runtime import run_sync, iterate_sync
+from ..helpers.model_selector import DEFAULT_MODEL
 
-client = OpenAI()
-
-def generate_prompt(meta_prompt: str, test_input: str = None):
+def generate_prompt(meta_prompt: str, test_input: str = None, use_cache: bool = True,
+                    model: str = DEFAULT_MODEL, reasoning_effort: str = None,
+                    backend: str = None, metrics: RequestMetrics = None,
+                    timeout: float = None):
     """
     Generate a detailed system prompt based on user input.
     
+    Runs agenerate_prompt on the shared background event loop and waits for it.
+    
     Args:
         meta_prompt (str): The meta prompt to use for generation
         test_input (str, optional): The test input to use with the meta prompt
+        use_cache (bool, optional): Whether to reuse a cached response for an identical request
+        model (str, optional): The model to use, from the model registry
+        reasoning_effort (str, optional): "low", "medium" or "high" for reasoning models
+        backend (str, optional): The backend to use; defaults to META_PROMPT_BACKEND or "openai"
+        metrics (RequestMetrics, optional): Filled in with the timings, usage and cost of the request
+        timeout (float, optional): Seconds the whole generation may take, including retries
         
     Returns:
         str: The generated system prompt
     """
-    # If no test input is provided, use the meta prompt as the task
-    if test_input is None or test_input.strip() == "":
-        task_content = "Task, Goal, or Current Prompt:\n" + meta_prompt
-    else:
-        task_content = "Task, Goal, or Current Prompt:\n" + test_input
+    return run_sync(agenerate_prompt(meta_prompt, test_input, use_cache, model, reasoning_effort,
+                                     backend, metrics, timeout))
+
+def generate_prompt_stream(meta_prompt: str, test_input: str = None, use_cache: bool = True,
+                           model: str = DEFAULT_MODEL, reasoning_effort: str = None,
+                           backend: str = None, metrics: RequestMetrics = None,
+                           timeout: float = None):
+    """
+    Generate a detailed system prompt, yielding the text as it is produced.
+    
+    Iterates agenerate_prompt_stream on the shared background event loop.
+    Closing the returned generator closes the HTTP stream.
     
-    completion = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {
-                "role": "system",
-                "content": meta_prompt,
-            },
-            {
-                "role": "user",
-                "content": task_content,
-            },
-        ],
-    )
+    Args:
+        meta_prompt (str): The meta prompt to use for generation
+        test_input (str, optional): The test input to use with the meta prompt
+        use_cache (bool, optional): Whether to reuse a cached response for an identical request
+        model (str, optional): The model to use, from the model registry
+        reasoning_effort (str, optional): "low", "medium" or "high" for reasoning models
+        backend (str, optional): The backend to use; defaults to META_PROMPT_BACKEND or "openai"
+        metrics (RequestMetrics, optional): Filled in with the timings, usage and cost of the request
+        timeout (float, optional): Seconds the whole generation may take, including retries
+        
+    Returns:
+        Generator[str]: Successive chunks of the generated system prompt
+    """
+    return iterate_sync(agenerate_prompt_stream(meta_prompt, test_input, use_cache, model,
+                                                reasoning_effort, backend, metrics, timeout))
 
-    return completion.choices[0].message.content
+def generate_samples(meta_prompt: str, test_input: str = None, samples: int = 1,
+                     model: str = DEFAULT_MODEL, reasoning_effort: str = None,
+                     backend: str = None, timeout: float = None):
+    """
+    Generate several independent samples of the system prompt.
+    
+    Runs agenerate_samples on the shared background event loop and waits for it.
+    
+    Args:
+        meta_prompt (str): The meta prompt to use for generation
+        test_input (str, optional): The test input to use with the meta prompt
+        samples (int, optional): Number of samples to generate
+        model (str, optional): The model to use, from the model registry
+        reasoning_effort (str, optional): "low", "medium" or "high" for reasoning models
+        backend (str, optional): The backend to use; defaults to META_PROMPT_BACKEND or "openai"
+        timeout (float, optional): Seconds each request may take, including retries
+        
+    Returns:
+        list: A (text, RequestMetrics) pair per sample; the text is None if the sample failed
+    """
+    return run_sync(agenerate_samples(meta_prompt, test_input, samples, model, reasoning_effort,
+                                      backend, timeout))
 
 if __name__ == "__main__":
     import sys
@@ -61,4 +112,4 @@ if __name__ == "__main__":
         result = generate_prompt(META_PROMPT, task_or_prompt)
         print(result)
     else:
-        print("No input provided. Exiting.")
\ No newline at end of file
+        print("No input provided. Exiting.")
@@ -0,0 +1,146 @@
+"""
+Chat Request Module
+
+This module builds the chat completion requests of meta prompt generations and
+sends them through the backend's rate limiter, with the raw response headers
+fed back to the limiter and failed attempts retried or recorded.
+
+Dependencies:
+- rate_limiter.py: Keeps requests within the account's rate limits
+- rate_limit_headers.py: Reads the retry delay of throttled responses
+- openai_client.py: Provides the lazily created OpenAI clients
+- src.helpers.model_selector: Contains the model request profiles
+"""
+
+import asyncio
+
+from .rate_limiter import get_rate_limiter, estimate_tokens, EXPECTED_OUTPUT_TOKENS
+from .rate_limit_headers import retry_delay
+from .openai_client import get_async_client
+from ..helpers.model_selector import build_request_params, adapt_messages
+
+# Parameters newer than the pinned SDK's create() signature; sent via extra_body
+_EXTRA_BODY_PARAMS = ("reasoning_effort", "max_completion_tokens")
+
+def _build_messages(meta_prompt: str, test_input: str = None):
+    """
+    Build the chat messages sent for a meta prompt and optional test input.
+    
+    Args:
+        meta_prompt (str): The meta prompt to use for generation
+        test_input (str, optional): The test input to use with the meta prompt
+        
+    Returns:
+        list: The messages for the chat completion request
+    """
+    # If no test input is provided, use the meta prompt as the task
+    if test_input is None or test_input.strip() == "":
+        task_content = "Task, Goal, or Current Prompt:\n" + meta_prompt
+    else:
+        task_content = "Task, Goal, or Current Prompt:\n" + test_input
+    
+    return [
+        {
+            "role": "system",
+            "content": meta_prompt,
+        },
+        {
+            "role": "user",
+            "content": task_content,
+        },
+    ]
+
+def build_request(meta_prompt, test_input, model, reasoning_effort):
+    """
+    Build the messages and parameters of a request for a model.
+    
+    Args:
+        meta_prompt (str): The meta prompt to use for generation
+        test_input (str): The test input to use with the meta prompt
+        model (str): The model name
+        reasoning_effort (str): Reasoning effort for reasoning models, or None for the default
+        
+    Returns:
+        tuple: (messages, params)
+    """
+    messages = adapt_messages(model, _build_messages(meta_prompt, test_input))
+    return messages, build_request_params(model, reasoning_effort)
+
+def _is_retryable(error):
+    """Check whether a failed request is worth retrying"""
+    import openai
+    return isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError))
+
+def _is_throttled(error):
+    """Check whether a failed request was rejected by the rate limit"""
+    import openai
+    return isinstance(error, openai.RateLimitError)
+
+def _retry_after(error):
+    """Get the delay the server asked for before retrying, in seconds"""
+    response = getattr(error, "response", None)
+    return retry_delay(response.headers) if response is not None else None
+
+async def create_completion(messages, params, backend, metrics, stream=False):
+    """
+    Send a chat completion request through the shared rate limiter.
+    
+    The caller must hold a rate limiter slot (see RateLimiter.aslot) for as long
+    as the request is in flight, including while a stream is being read.
+    
+    Args:
+        messages (list): The chat messages of the request
+        params (dict): The model parameters of the request
+        backend (str): The backend to send the request to
+        metrics (RequestMetrics): Metrics to record the attempts and usage in
+        stream (bool): Whether to stream the response
+        
+    Returns:
+        ChatCompletion | AsyncStream: The parsed response
+    """
+    limiter = get_rate_limiter(backend)
+    # Each extra sample requested with n generates another response
+    estimated = estimate_tokens(messages) + EXPECTED_OUTPUT_TOKENS * (params.get("n", 1) - 1)
+    
+    kwargs = {key: value for key, value in params.items() if key not in _EXTRA_BODY_PARAMS}
+    extra_body = {key: params[key] for key in _EXTRA_BODY_PARAMS if key in params}
+    if stream:
+        # Ask for the usage in a final chunk, so streamed requests can be costed too
+        extra_body["stream_options"] = {"include_usage": True}
+    if extra_body:
+        kwargs["extra_body"] = extra_body
+    
+    async def send():
+        metrics.mark_sent()
+        try:
+            raw = await get_async_client(backend).chat.completions.with_raw_response.create(
+                messages=messages,
+                stream=stream,
+                **kwargs,
+            )
+        except Exception as e:
+            metrics.record_attempt_error(e)
+            raise
+        limiter.update_from_headers(raw.headers)
+        return raw.parse()
+    
+    response = await limiter.acall(send, estimated, _is_retryable, _is_throttled, _retry_after)
+    if not stream and response.usage is not None:
+        limiter.record_usage(estimated, response.usage.total_tokens)
+        metrics.record_usage(response.usage)
+    return response
+
+def timeout_error(timeout):
+    """Build the error raised when a generation exceeds its timeout"""
+    return TimeoutError(f"Generation timed out after {timeout:g}s")
+
+async def send_request(messages, params, backend, metrics, timeout):
+    """Send a non-streamed request in a rate limiter slot, within an optional timeout"""
+    async def request():
+        async with get_rate_limiter(backend).aslot():
+            return await create_completion(messages, params, backend, metrics)
+    
+    try:
+        return await asyncio.wait_for(request(), timeout)
+    except asyncio.TimeoutError:
+        raise timeout_error(timeout) from None
@@ -0,0 +1,314 @@
+"""
+Generation Executor Module
+
+This module provides the GenerationExecutor class, which runs prompt generation
+requests off the Qt main thread so it never blocks on the API. Each request runs
+as a coroutine on the shared event loop (see async_runtime.py), waited for by a
+worker thread pool. Responses are streamed, and both the chunks and the final
+result are delivered back to the GUI thread through Qt signals.
+
+A request either streams one output or collects several samples (see
+agenerate_samples). Each request belongs to a "side" (e.g. "A" or "B"). A side can have at most one
+request in flight; submitting again or cancelling supersedes the previous one.
+Cancelling a request cancels its coroutine on the loop right away, which closes
+its HTTP stream; anything it delivered after that is discarded.
+
+Dependencies:
+- PyQt6
+- src.service.async_generation: Contains the agenerate_prompt_stream function
+- src.service.prompt_samples: Contains the agenerate_samples function
+- src.service.async_runtime: Runs the requests on the shared event loop
+- src.service.request_metrics: Records the timings, usage and cost of each request
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .async_generation import agenerate_prompt_stream
+from .prompt_samples import agenerate_samples
+from .async_runtime import get_loop
+from .request_metrics import RequestMetrics
+
+# Requests are network-bound, so run more workers than CPU cores; this also
+# guarantees that every side of a comparison can be in flight at the same time
+MAX_WORKERS = 8
+
+
+class _TaskSignals(QObject):
+    """Signals emitted by a generation task (QRunnable cannot emit signals itself)"""
+
+    chunk = pyqtSignal(str, int, str)
+    finished = pyqtSignal(str, int, str)
+    failed = pyqtSignal(str, int, str)
+    samples_finished = pyqtSignal(str, int, object)
+
+
+class _LoopTask(QRunnable):
+    """Runnable that runs a request's coroutine on the shared event loop and waits for it"""
+
+    def __init__(self, side, request_id):
+        """
+        Initialize the task.
+
+        Args:
+            side (str): The side this request belongs to
+            request_id (int): Unique id used to detect superseded requests
+        """
+        super().__init__()
+        self.side = side
+        self.request_id = request_id
+        self.signals = _TaskSignals()
+        self.cancelled = False
+        self._future = None  # The coroutine running on the loop, once started
+
+    async def arun(self):
+        """Perform the request on the loop, reporting the outcome through signals"""
+        raise NotImplementedError
+
+    def run(self):
+        """Start the request on the loop and wait until it completes or is cancelled"""
+        self._future = asyncio.run_coroutine_threadsafe(self.arun(), get_loop())
+        if self.cancelled:
+            # Cancelled while queued for a worker
+            self.cancel()
+        try:
+            self._future.result()
+        except concurrent.futures.CancelledError:
+            pass
+
+    def cancel(self):
+        """Cancel the request; if it is running, its coroutine is cancelled on the loop"""
+        self.cancelled = True
+        future = self._future
+        if future is not None:
+            get_loop().call_soon_threadsafe(future.cancel)
+
+
+class _GenerationTask(_LoopTask):
+    """Task that performs a single streamed generation"""
+
+    def __init__(self, side, request_id, meta_prompt, test_input, options):
+        """
+        Initialize the task.
+
+        Args:
+            side (str): The side this request belongs to
+            request_id (int): Unique id used to detect superseded requests
+            meta_prompt (str): The meta prompt to use for generation
+            test_input (str): The test input to use with the meta prompt
+            options (dict): Extra keyword arguments for agenerate_prompt_stream (e.g. model)
+        """
+        super().__init__(side, request_id)
+        self.meta_prompt = meta_prompt
+        self.test_input = test_input
+        self.options = options
+        # Created on submission, so the time spent queued for a worker is included
+        self.metrics = RequestMetrics()
+
+    async def arun(self):
+        """Stream the output, forwarding chunks and the outcome through signals"""
+        chunks = []
+        stream = agenerate_prompt_stream(self.meta_prompt, self.test_input, metrics=self.metrics,
+                                         **self.options)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                self.signals.chunk.emit(self.side, self.request_id, chunk)
+        except Exception as e:
+            self.signals.failed.emit(self.side, self.request_id, str(e))
+        else:
+            self.signals.finished.emit(self.side, self.request_id, "".join(chunks))
+        finally:
+            # Closes the HTTP stream, also when the task was cancelled mid-stream
+            await stream.aclose()
+
+
+class _SamplingTask(_LoopTask):
+    """Task that collects several samples of one request"""
+
+    def __init__(self, side, request_id, meta_prompt, test_input, samples, options):
+        """
+        Initialize the task.
+
+        Args:
+            side (str): The side this request belongs to
+            request_id (int): Unique id used to detect superseded requests
+            meta_prompt (str): The meta prompt to use for generation
+            test_input (str): The test input to use with the meta prompt
+            samples (int): Number of samples to generate
+            options (dict): Extra keyword arguments for agenerate_samples (e.g. model)
+        """
+        super().__init__(side, request_id)
+        self.meta_prompt = meta_prompt
+        self.test_input = test_input
+        self.samples = samples
+        self.options = options
+        # Each sample records its own metrics; there is no single request to report
+        self.metrics = None
+
+    async def arun(self):
+        """Run the requests and deliver the samples through a signal"""
+        try:
+            samples = await agenerate_samples(self.meta_prompt, self.test_input, self.samples, **self.options)
+        except Exception as e:
+            self.signals.failed.emit(self.side, self.request_id, str(e))
+        else:
+            self.signals.samples_finished.emit(self.side, self.request_id, samples)
+
+
+class GenerationExecutor(QObject):
+    """
+    Runs generation requests off the GUI thread and reports results via signals.
+
+    Signals:
+        started: Emitted with the side when a request is submitted
+        chunk: Emitted with the side and each streamed piece of text
+        finished: Emitted with the side and generated text on success
+        failed: Emitted with the side and an error message on failure
+        cancelled: Emitted with the side when an in-flight request is cancelled
+        busy_changed: Emitted with the side and its new in-flight state
+        metrics: Emitted with the side and the RequestMetrics of a completed request,
+            just before finished or failed (not for sampling requests)
+        samples_finished: Emitted with the side and the (text, RequestMetrics) pairs
+            of a completed sampling request
+    """
+
+    started = pyqtSignal(str)
+    chunk = pyqtSignal(str, str)
+    finished = pyqtSignal(str, str)
+    failed = pyqtSignal(str, str)
+    cancelled = pyqtSignal(str)
+    busy_changed = pyqtSignal(str, bool)
+    metrics = pyqtSignal(str, object)
+    samples_finished = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        """
+        Initialize the executor with its own thread pool.
+
+        Args:
+            parent (QObject): Parent object
+        """
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(MAX_WORKERS, self._pool.maxThreadCount()))
+        self._ids = itertools.count(1)
+        self._in_flight = {}  # side -> task currently running for the side
+
+    def submit(self, side, meta_prompt, test_input=None, **options):
+        """
+        Start a generation request for a side, superseding any request in flight.
+
+        Args:
+            side (str): The side to generate for
+            meta_prompt (str): The meta prompt to use for generation
+            test_input (str, optional): The test input to use with the meta prompt
+            **options: Extra keyword arguments for agenerate_prompt_stream (e.g. model)
+        """
+        if side in self._in_flight:
+            self.cancel(side)
+        self._start(_GenerationTask(side, next(self._ids), meta_prompt, test_input, options))
+
+    def submit_samples(self, side, meta_prompt, test_input=None, samples=1, **options):
+        """
+        Start a sampling request for a side, superseding any request in flight.
+
+        Args:
+            side (str): The side to generate for
+            meta_prompt (str): The meta prompt to use for generation
+            test_input (str, optional): The test input to use with the meta prompt
+            samples (int): Number of samples to generate
+            **options: Extra keyword arguments for agenerate_samples (e.g. model)
+        """
+        if side in self._in_flight:
+            self.cancel(side)
+        self._start(_SamplingTask(side, next(self._ids), meta_prompt, test_input, samples, options))
+
+    def _start(self, task):
+        """Connect a task's signals, mark its side busy and run it on the pool"""
+        task.signals.chunk.connect(self._on_task_chunk)
+        task.signals.finished.connect(self._on_task_finished)
+        task.signals.failed.connect(self._on_task_failed)
+        task.signals.samples_finished.connect(self._on_task_samples_finished)
+
+        self._in_flight[task.side] = task
+        self.started.emit(task.side)
+        self.busy_changed.emit(task.side, True)
+        self._pool.start(task)
+
+    def submit_all(self, requests):
+        """
+        Start generation requests for several sides at once.
+
+        All requests are dispatched to the pool immediately, so they run
+        concurrently and each side is reported as soon as its result arrives.
+
+        Args:
+            requests (dict): Maps each side to a (meta_prompt, test_input, options) tuple
+        """
+        for side, (meta_prompt, test_input, options) in requests.items():
+            self.submit(side, meta_prompt, test_input, **options)
+
+    def cancel(self, side):
+        """
+        Cancel the request in flight for a side, if any.
+
+        Args:
+            side (str): The side to cancel
+        """
+        task = self._in_flight.pop(side, None)
+        if task is None:
+            return
+        task.cancel()
+        self.cancelled.emit(side)
+        self.busy_changed.emit(side, False)
+
+    def is_busy(self, side):
+        """
+        Check whether a side has a request in flight.
+
+        Args:
+            side (str): The side to check
+
+        Returns:
+            bool: True if a request is running for the side
+        """
+        return side in self._in_flight
+
+    def _is_current(self, side, request_id):
+        """Check whether a request is still the one in flight for its side"""
+        task = self._in_flight.get(side)
+        return task is not None and task.request_id == request_id
+
+    def _take(self, side, request_id):
+        """Mark a request as done; returns False if it was cancelled or superseded"""
+        if not self._is_current(side, request_id):
+            return False
+        task = self._in_flight.pop(side)
+        self.busy_changed.emit(side, False)
+        if task.metrics is not None:
+            self.metrics.emit(side, task.metrics)
+        return True
+
+    def _on_task_chunk(self, side, request_id, text):
+        """Forward a streamed chunk if the request is still current"""
+        if self._is_current(side, request_id):
+            self.chunk.emit(side, text)
+
+    def _on_task_finished(self, side, request_id, output):
+        """Forward a successful result if the request is still current"""
+        if self._take(side, request_id):
+            self.finished.emit(side, output)
+
+    def _on_task_failed(self, side, request_id, error):
+        """Forward a failure if the request is still current"""
+        if self._take(side, request_id):
+            self.failed.emit(side, error)
+
+    def _on_task_samples_finished(self, side, request_id, samples):
+        """Forward the samples of a sampling request if it is still current"""
+        if self._take(side, request_id):
+            self.samples_finished.emit(side, samples)
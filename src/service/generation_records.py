@@ -0,0 +1,72 @@
+"""
+Generation Records Module
+
+This module keeps the records of generations: the response cache lookup of a
+request, its RequestMetrics and its entry in the optional trace log.
+
+Dependencies:
+- response_cache.py: Caches responses for identical requests
+- request_metrics.py: Records the timings, usage and cost of each request
+- trace_log.py: Writes the optional trace log of requests
+- backends.py: Contains the backend registry
+"""
+
+import asyncio
+import time
+
+from .response_cache import get_cache, make_key
+from .request_metrics import RequestMetrics
+from .trace_log import get_tracer
+from .backends import DEFAULT_BACKEND
+
+
+async def cache_lookup(messages, params, use_cache, backend):
+    """
+    Look up a request in the response cache, reading the disk off the event loop.
+    
+    Args:
+        messages (list): The chat messages of the request
+        params (dict): The model parameters of the request
+        use_cache (bool): Whether the caller allows cached responses
+        backend (str): The backend the request is sent to
+        
+    Returns:
+        tuple: (cache, key, cached_text); cache is None when caching is off
+    """
+    cache = get_cache()
+    if not (use_cache and cache.enabled):
+        return None, None, None
+    # Responses of other backends must not be served as OpenAI's (or vice versa)
+    if backend != DEFAULT_BACKEND:
+        params = {**params, "backend": backend}
+    key = make_key(messages, params)
+    return cache, key, await asyncio.to_thread(cache.get, key)
+
+def start_metrics(metrics, model, backend):
+    """Create the metrics of a request if the caller didn't pass any"""
+    metrics = metrics if metrics is not None else RequestMetrics()
+    metrics.model = model
+    metrics.backend = backend
+    return metrics
+
+def trace_request(metrics, messages, params, stream):
+    """
+    Record a finished request in the trace log, if tracing is enabled.
+    
+    Args:
+        metrics (RequestMetrics): The request's metrics
+        messages (list): The chat messages of the request, or None if it wasn't built
+        params (dict): The model parameters of the request, or None if it wasn't built
+        stream (bool): Whether the response was streamed
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        return
+    record = metrics.as_dict()
+    record.update({
+        "time": time.time(),
+        "messages_hash": make_key(messages, {}) if messages is not None else None,
+        "params": params,
+        "stream": stream,
+    })
+    tracer.write(record)
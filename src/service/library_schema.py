@@ -0,0 +1,120 @@
+"""
+Library Schema Module
+
+This module contains the SQLite schema and queries of the prompt library (see
+prompt_library.py), and the helpers turning texts and searches into their keys
+and full-text queries.
+
+Dependencies:
+- None
+"""
+
+import hashlib
+import re
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    set_hash TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    saved REAL NOT NULL,
+    test_input_id INTEGER NOT NULL REFERENCES blobs(id),
+    variant_count INTEGER NOT NULL,
+    models TEXT NOT NULL,
+    preview TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_saved ON entries(saved);
+CREATE INDEX IF NOT EXISTS entries_test_input ON entries(test_input_id);
+CREATE TABLE IF NOT EXISTS entry_variants (
+    entry_id INTEGER NOT NULL REFERENCES entries(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    prompt_id INTEGER NOT NULL REFERENCES blobs(id),
+    output_id INTEGER NOT NULL REFERENCES blobs(id),
+    reasoning_id INTEGER NOT NULL REFERENCES blobs(id),
+    model TEXT,
+    reasoning_effort TEXT,
+    PRIMARY KEY (entry_id, position)
+);
+CREATE INDEX IF NOT EXISTS entry_variants_prompt ON entry_variants(prompt_id);
+CREATE INDEX IF NOT EXISTS entry_variants_output ON entry_variants(output_id);
+CREATE INDEX IF NOT EXISTS entry_variants_reasoning ON entry_variants(reasoning_id);
+"""
+
+# Full-text index over the distinct texts; it reads the text from blobs instead of copying it
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS blobs_fts USING fts5(text, content='blobs', content_rowid='id');
+"""
+
+# Ids of the texts still referenced by an entry
+REFERENCED_BLOBS = """
+SELECT test_input_id FROM entries UNION SELECT prompt_id FROM entry_variants
+UNION SELECT output_id FROM entry_variants UNION SELECT reasoning_id FROM entry_variants
+"""
+
+
+def text_hash(text):
+    """Get the content hash of a text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def fts_query(query):
+    """Turn free text into an FTS5 query matching entries containing every word (as a prefix)"""
+    words = re.findall(r"\w+", query, re.UNICODE)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def like_pattern(query):
+    """Turn free text into a LIKE pattern (with ESCAPE '\\') matching texts containing it literally"""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+# Columns of the entries returned by listings and searches
+ENTRY_COLUMNS = "e.id, e.name, e.saved, e.variant_count, e.models, e.preview"
+
+# Texts of a saved prompt set: its test input, then its variants in order
+LOAD_TEST_INPUT = (
+    "SELECT blobs.text AS test_input FROM entries JOIN blobs ON blobs.id = entries.test_input_id "
+    "WHERE entries.id = ?"
+)
+LOAD_VARIANTS = (
+    "SELECT v.name, p.text AS prompt, o.text AS output, r.text AS reasoning, "
+    "v.model, v.reasoning_effort FROM entry_variants v "
+    "JOIN blobs p ON p.id = v.prompt_id "
+    "JOIN blobs o ON o.id = v.output_id "
+    "JOIN blobs r ON r.id = v.reasoning_id "
+    "WHERE v.entry_id = ? ORDER BY v.position"
+)
+
+
+def search_query(full_text):
+    """
+    Build the query finding the entries whose name or texts match a search.
+
+    Each distinct text is matched once, however many entries share it.
+
+    Args:
+        full_text (bool): Whether to match the texts with the FTS5 index (:match)
+            rather than with LIKE (:like)
+
+    Returns:
+        str: The query, taking the :match, :like, :limit and :offset parameters
+    """
+    if full_text:
+        hits = "SELECT rowid FROM blobs_fts WHERE blobs_fts MATCH :match"
+    else:
+        hits = "SELECT id FROM blobs WHERE text LIKE :like ESCAPE '\\'"
+    return (
+        f"WITH hits(id) AS ({hits}) "
+        f"SELECT {ENTRY_COLUMNS} FROM entries e WHERE e.name LIKE :like ESCAPE '\\' "
+        "OR e.test_input_id IN hits OR e.id IN ("
+        "SELECT entry_id FROM entry_variants "
+        "WHERE prompt_id IN hits OR output_id IN hits OR reasoning_id IN hits) "
+        "ORDER BY e.saved DESC LIMIT :limit OFFSET :offset"
+    )
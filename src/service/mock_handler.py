@@ -0,0 +1,172 @@
+"""
+Mock Handler Module
+
+This module contains the request handler of the mock server (see mock_server.py),
+which serves the OpenAI chat completions API: POST /v1/chat/completions, streamed
+as server-sent events or not, and GET /v1/models.
+
+Dependencies:
+- None (standard library only)
+- src.helpers.model_selector: Contains the model registry
+- mock_responses.py: Splits responses into streamed tokens
+"""
+
+import json
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler
+
+from ..helpers.model_selector import list_models, MODELS
+from .mock_responses import split_tokens
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Handles a single request to the mock server"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle + delayed ACK add ~40 ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        """Log requests unless the server is quiet"""
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        """Serve the model list"""
+        if self.path.rstrip("/") != "/v1/models":
+            self._send_error(404, "Not found")
+            return
+        models = [{"id": name, "object": "model", "created": 0, "owned_by": "mock"} for name in list_models()]
+        self._send_json(200, {"object": "list", "data": models})
+
+    def do_POST(self):
+        """Serve a chat completion"""
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length)
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send_error(404, "Not found")
+            return
+        try:
+            body = json.loads(raw_body or b"{}")
+        except ValueError:
+            self._send_error(400, "Request body is not valid JSON")
+            return
+
+        server = self.server
+        if server.next_request():
+            time.sleep(server.latency)
+            headers = dict(server.rate_limit_headers)
+            if server.error_status == 429:
+                headers["retry-after-ms"] = "100"
+            self._send_error(server.error_status, "Injected error", headers)
+            return
+
+        # Streams always carry a single choice; other requests return n of them
+        count = 1 if body.get("stream") else max(1, int(body.get("n") or 1))
+        texts = [server.response_for(body, choice) for choice in range(count)]
+        tokens = split_tokens(texts[0])
+        generated = sum(len(split_tokens(text)) for text in texts)
+        prompt_chars = sum(len(str(message.get("content", ""))) for message in body.get("messages", []))
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "mock")
+        # Reasoning models are billed for hidden reasoning on top of the visible text
+        reasoning_tokens = generated // 2 if MODELS.get(model, {}).get("reasoning") else 0
+        usage = {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": generated + reasoning_tokens,
+            "total_tokens": prompt_chars // 4 + generated + reasoning_tokens,
+            "completion_tokens_details": {"reasoning_tokens": reasoning_tokens},
+        }
+
+        time.sleep(server.latency)
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage")
+            self._stream(completion_id, model, tokens, usage if include_usage else None)
+            return
+
+        if server.tokens_per_sec > 0:
+            # Choices are generated in parallel, so the longest one sets the pace
+            time.sleep(max(len(split_tokens(text)) for text in texts) / server.tokens_per_sec)
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": index,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            } for index, text in enumerate(texts)],
+            "usage": usage,
+        }, server.rate_limit_headers)
+
+    def _stream(self, completion_id, model, tokens, usage=None):
+        """
+        Send tokens as server-sent events at the configured rate.
+
+        Args:
+            completion_id (str): Id shared by all chunks of the completion
+            model (str): The model name to report
+            tokens (list): The pieces of text to send
+            usage (dict, optional): Usage to send in a final chunk without choices
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        for name, value in self.server.rate_limit_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.close_connection = True
+
+        created = int(time.time())
+
+        def event(delta, finish_reason=None, usage=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            if usage:
+                chunk["usage"] = usage
+            return f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+
+        interval = 1.0 / self.server.tokens_per_sec if self.server.tokens_per_sec > 0 else 0.0
+        start = time.monotonic()
+        try:
+            self.wfile.write(event({"role": "assistant", "content": ""}))
+            for index, token in enumerate(tokens):
+                # Pace against the start time so sleep overshoot doesn't accumulate
+                delay = start + index * interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self.wfile.write(event({"content": token}))
+                self.wfile.flush()
+            self.wfile.write(event({}, "stop"))
+            if usage is not None:
+                self.wfile.write(event({}, usage=usage))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client stopped reading (e.g. the generation was cancelled)
+
+    def _send_json(self, status, payload, headers=None):
+        """Send a JSON response"""
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client gave up waiting (e.g. the generation timed out)
+
+    def _send_error(self, status, message, headers=None):
+        """Send an error in the OpenAI error format"""
+        self._send_json(status, {"error": {"message": message, "type": "mock_error", "code": status}}, headers)
@@ -0,0 +1,80 @@
+"""
+Mock Responses Module
+
+This module generates the canned responses of the mock server (see
+mock_server.py): deterministic texts shaped like generated system prompts,
+derived from a hash of the request, and their split into streamed tokens.
+
+Dependencies:
+- None (standard library only)
+"""
+
+import hashlib
+import random
+
+# Length of generated responses, in tokens
+DEFAULT_RESPONSE_TOKENS = 300
+
+_WORDS = (
+    "the", "model", "should", "always", "respond", "with", "clear", "concise", "steps",
+    "context", "output", "format", "user", "task", "examples", "include", "reasoning",
+    "constraints", "tone", "identify", "goal", "before", "answering", "each", "section",
+    "must", "use", "markdown", "headers", "and", "bullet", "points", "where", "helpful",
+)
+
+
+def canned_response(seed_text, tokens=DEFAULT_RESPONSE_TOKENS, reasoning=True):
+    """
+    Generate a deterministic response shaped like a generated system prompt.
+
+    Args:
+        seed_text (str): Text the response is derived from (e.g. the request body)
+        tokens (int): Approximate length of the response, in tokens
+        reasoning (bool): Whether to start with a <reasoning> section
+
+    Returns:
+        str: The response text
+    """
+    rng = random.Random(hashlib.sha256(seed_text.encode("utf-8")).hexdigest())
+    lines = []
+    remaining = tokens
+    if reasoning:
+        count = max(1, tokens // 5)
+        lines += ["<reasoning>", " ".join(rng.choice(_WORDS) for _ in range(count)), "</reasoning>", ""]
+        remaining -= count
+    section = 0
+    while remaining > 0:
+        section += 1
+        lines.append(f"# Section {section}")
+        for _ in range(3):
+            count = min(remaining, rng.randint(6, 14))
+            if count <= 0:
+                break
+            lines.append("- " + " ".join(rng.choice(_WORDS) for _ in range(count)))
+            remaining -= count
+        lines.append("")
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def split_tokens(text):
+    """
+    Split text into the pieces streamed as individual tokens.
+
+    Args:
+        text (str): The text to split
+
+    Returns:
+        list: Pieces of text (words with their trailing whitespace) that join back to text
+    """
+    tokens = []
+    start = 0
+    length = len(text)
+    while start < length:
+        end = start
+        while end < length and not text[end].isspace():
+            end += 1
+        while end < length and text[end].isspace():
+            end += 1
+        tokens.append(text[start:end])
+        start = end
+    return tokens
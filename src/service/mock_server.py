@@ -0,0 +1,210 @@
+"""
+Mock Server Module
+
+This module provides a local stand-in for the OpenAI chat completions API, so the
+application, the batch runner and the benchmarks can run offline with repeatable
+results. It serves POST /v1/chat/completions (streamed or not) and GET /v1/models.
+
+Responses are canned and deterministic: the same request always gets the same
+text, chosen from a responses file or generated from a hash of the request (and,
+for requests asking for n samples, of the choice index). The server can simulate
+latency before the first token, a token rate, and injected errors (e.g. 429s with
+a retry-after header, or 500s) at a seeded random rate.
+
+Run it with:
+    python -m src.service.mock_server --latency 0.5 --tokens-per-sec 50
+and point the application at it with META_PROMPT_BACKEND=mock.
+
+Dependencies:
+- None (standard library only)
+- backends.py: Contains the default mock server address
+- mock_handler.py: Contains the request handler
+- mock_responses.py: Generates the canned responses
+"""
+
+import hashlib
+import json
+import random
+import threading
+from http.server import ThreadingHTTPServer
+
+from .backends import MOCK_SERVER_HOST, MOCK_SERVER_PORT
+from .mock_handler import MockRequestHandler
+from .mock_responses import canned_response, DEFAULT_RESPONSE_TOKENS
+
+# Rate limits advertised in the x-ratelimit-* headers; generous so clients aren't slowed down
+DEFAULT_RPM = 100000
+DEFAULT_TPM = 100000000
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server imitating the OpenAI chat completions API.
+
+    Attributes:
+        latency (float): Seconds to wait before the first token
+        tokens_per_sec (float): Rate at which tokens are produced; 0 for no delay
+        response_tokens (int): Length of generated responses, in tokens
+        reasoning (bool): Whether generated responses include a <reasoning> section
+        responses (list): Canned responses to choose from instead of generated ones
+        error_rate (float): Fraction of requests that fail, between 0 and 1
+        error_status (int): HTTP status of injected errors (429 includes retry-after)
+        rpm (int): Requests per minute advertised in the rate limit headers
+        tpm (int): Tokens per minute advertised in the rate limit headers
+        requests (int): Number of completion requests received so far
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host=MOCK_SERVER_HOST, port=MOCK_SERVER_PORT, latency=0.0, tokens_per_sec=0.0,
+                 response_tokens=DEFAULT_RESPONSE_TOKENS, reasoning=True, responses=None,
+                 error_rate=0.0, error_status=500, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM, seed=0, quiet=True):
+        """
+        Initialize the server and bind it to its address.
+
+        Args:
+            host (str): Interface to listen on
+            port (int): Port to listen on; 0 picks a free port
+            latency (float): Seconds to wait before the first token
+            tokens_per_sec (float): Rate at which tokens are produced; 0 for no delay
+            response_tokens (int): Length of generated responses, in tokens
+            reasoning (bool): Whether generated responses include a <reasoning> section
+            responses (list, optional): Canned responses to choose from by request hash
+            error_rate (float): Fraction of requests that fail, between 0 and 1
+            error_status (int): HTTP status of injected errors
+            rpm (int): Requests per minute advertised in the rate limit headers
+            tpm (int): Tokens per minute advertised in the rate limit headers
+            seed (int): Seed for the error injection, so failures are repeatable
+            quiet (bool): Whether to suppress the per-request access log
+        """
+        super().__init__((host, port), MockRequestHandler)
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.response_tokens = response_tokens
+        self.reasoning = reasoning
+        self.responses = list(responses or [])
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rpm = rpm
+        self.tpm = tpm
+        self.quiet = quiet
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def rate_limit_headers(self):
+        """dict: The x-ratelimit-* headers sent with every completion"""
+        return {
+            "x-ratelimit-limit-requests": str(self.rpm),
+            "x-ratelimit-limit-tokens": str(self.tpm),
+        }
+
+    @property
+    def base_url(self):
+        """str: Base URL to configure an OpenAI client with"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def next_request(self):
+        """
+        Count a completion request and decide whether it should fail.
+
+        Returns:
+            bool: True if an error should be injected for this request
+        """
+        with self._lock:
+            self.requests += 1
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def response_for(self, body, choice=0):
+        """
+        Get the deterministic response text for a request.
+
+        Args:
+            body (dict): The parsed request body
+            choice (int): Index of the choice, for requests asking for n > 1 samples
+
+        Returns:
+            str: The response text
+        """
+        seed = {"model": body.get("model"), "messages": body.get("messages")}
+        if choice:
+            seed["choice"] = choice
+        seed_text = json.dumps(seed, sort_keys=True)
+        if self.responses:
+            digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+            return self.responses[int.from_bytes(digest[:8], "big") % len(self.responses)]
+        return canned_response(seed_text, self.response_tokens, self.reasoning)
+
+
+def start_mock_server(**options):
+    """
+    Start a mock server on a background thread.
+
+    Args:
+        **options: Settings for MockLLMServer (port=0 picks a free port)
+
+    Returns:
+        MockLLMServer: The running server; call shutdown() and server_close() to stop it
+    """
+    server = MockLLMServer(**options)
+    thread = threading.Thread(target=server.serve_forever, name="mock-llm-server", daemon=True)
+    thread.start()
+    return server
+
+
+def main(argv=None):
+    """Run the mock server from the command line until interrupted"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.service.mock_server",
+        description="Local OpenAI-compatible mock server for offline testing and benchmarks."
+    )
+    parser.add_argument("--host", default=MOCK_SERVER_HOST, help="Interface to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=MOCK_SERVER_PORT, help="Port to listen on (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds before the first token (default: %(default)s)")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0,
+                        help="Token rate; 0 sends the response at once (default: %(default)s)")
+    parser.add_argument("--response-tokens", type=int, default=DEFAULT_RESPONSE_TOKENS,
+                        help="Length of generated responses (default: %(default)s)")
+    parser.add_argument("--no-reasoning", action="store_true",
+                        help="Leave the <reasoning> section out of generated responses")
+    parser.add_argument("--responses", metavar="FILE",
+                        help="JSON list of canned responses to use instead of generated ones")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests that fail (default: %(default)s)")
+    parser.add_argument("--error-status", type=int, default=500,
+                        help="HTTP status of injected errors, e.g. 429 or 500 (default: %(default)s)")
+    parser.add_argument("--rpm", type=int, default=DEFAULT_RPM,
+                        help="Requests per minute advertised to clients (default: %(default)s)")
+    parser.add_argument("--tpm", type=int, default=DEFAULT_TPM,
+                        help="Tokens per minute advertised to clients (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for error injection (default: %(default)s)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    responses = None
+    if args.responses:
+        with open(args.responses, "r", encoding="utf-8") as f:
+            responses = json.load(f)
+
+    server = MockLLMServer(
+        host=args.host, port=args.port, latency=args.latency, tokens_per_sec=args.tokens_per_sec,
+        response_tokens=args.response_tokens, reasoning=not args.no_reasoning, responses=responses,
+        error_rate=args.error_rate, error_status=args.error_status,
+        rpm=args.rpm, tpm=args.tpm, seed=args.seed, quiet=not args.verbose,
+    )
+    print(f"Mock server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+OpenAI Client Module
+
+This module provides lazy access to the shared AsyncOpenAI clients, one per backend
+and event loop, since an async connection pool can only be used from the loop it
+was created on. The clients are closed at exit, on their own loops.
+The openai SDK (and httpx underneath it) is only imported, and a client only
+constructed, the first time a request is made to its backend. This keeps
+application start-up fast and lets the UI open even when no API key is configured.
+
+Every client gets its own tuned httpx connection pool: keep-alive connections are
+reused across requests (skipping TCP/TLS handshakes), HTTP/2 is used where the
+backend and the installed h2 package allow it, and the pool size and timeouts are
+set explicitly rather than left to the SDK defaults.
+
+Dependencies:
+- openai, httpx (imported on first use)
+- h2 (optional, enables HTTP/2)
+- backends.py: Contains the backend registry
+"""
+
+import asyncio
+import atexit
+import threading
+import weakref
+
+from .backends import get_backend, resolve_backend
+
+# Sized to the rate limiter's maximum concurrency, so requests never wait for a socket
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+
+# Idle connections are kept this long, in seconds, so bursts of requests reuse them
+KEEPALIVE_EXPIRY = 120.0
+
+# Seconds; read is the longest gap between bytes, which covers slow reasoning models
+TIMEOUTS = {
+    "connect": 10.0,
+    "read": 180.0,
+    "write": 30.0,
+    "pool": 30.0,
+}
+
+_async_clients = weakref.WeakKeyDictionary()  # loop -> {backend: (settings, client)}
+_client_lock = threading.Lock()
+
+
+def http2_available():
+    """
+    Check whether HTTP/2 can be used.
+
+    Returns:
+        bool: True if the optional h2 package is installed
+    """
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(backend=None):
+    """
+    Create a pooled async httpx client tuned for a backend.
+
+    Args:
+        backend (str, optional): The backend name; None selects the default backend
+
+    Returns:
+        httpx.AsyncClient: The HTTP client
+    """
+    import httpx
+
+    settings = get_backend(resolve_backend(backend))
+    return httpx.AsyncClient(
+        http2=settings.get("http2", False) and http2_available(),
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(**TIMEOUTS),
+        follow_redirects=True,
+    )
+
+
+def get_async_client(backend=None):
+    """
+    Get the shared async client of a backend for the running event loop.
+
+    Args:
+        backend (str, optional): The backend name; None selects the default backend
+
+    Returns:
+        AsyncOpenAI: The shared client
+
+    Raises:
+        RuntimeError: If no event loop is running
+        ValueError: If the backend isn't registered
+        openai.OpenAIError: If the client can't be created (e.g. no API key is set)
+    """
+    loop = asyncio.get_running_loop()
+    backend = resolve_backend(backend)
+    settings = get_backend(backend)
+    with _client_lock:
+        clients = _async_clients.setdefault(loop, {})
+        created_with, client = clients.get(backend, (None, None))
+        if client is not None and created_with != settings:
+            # The backend was registered again with different settings
+            loop.create_task(_close_quietly(client))
+            client = None
+        if client is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            http_client = create_http_client(backend)
+            try:
+                # Retries are handled by the rate limiter, which also backs off its concurrency
+                client = AsyncOpenAI(
+                    base_url=settings["base_url"],
+                    api_key=settings["api_key"],
+                    max_retries=0,
+                    timeout=httpx.Timeout(**TIMEOUTS),
+                    http_client=http_client,
+                )
+            except Exception:
+                loop.create_task(http_client.aclose())
+                raise
+            clients[backend] = (dict(settings), client)
+        return client
+
+
+async def _close_quietly(client):
+    """Close a client on its loop, ignoring errors of an already broken connection"""
+    try:
+        await client.close()
+    except Exception:
+        pass
+
+
+async def _close_loop_clients(clients):
+    """Close the clients of one event loop"""
+    await asyncio.gather(*(_close_quietly(client) for _, client in clients))
+
+
+@atexit.register
+def close_clients(timeout=5.0):
+    """
+    Close the shared async clients and their connection pools.
+
+    Each client is closed on the event loop it belongs to; clients of loops that
+    are no longer running can't be closed and are left to the garbage collector.
+
+    Args:
+        timeout (float): Maximum seconds to wait for the clients of each loop
+    """
+    with _client_lock:
+        loops = [(loop, list(clients.values())) for loop, clients in _async_clients.items()]
+        _async_clients.clear()
+    for loop, clients in loops:
+        if loop.is_closed() or not loop.is_running():
+            continue
+        future = asyncio.run_coroutine_threadsafe(_close_loop_clients(clients), loop)
+        try:
+            future.result(timeout)
+        except Exception:
+            future.cancel()
@@ -0,0 +1,289 @@
+"""
+Prompt History Module
+
+This module keeps the version history of each meta prompt editor in a SQLite
+database. Every revision is stored as a compressed delta against the previous
+one (see src.helpers.text_delta), with a compressed full snapshot every
+SNAPSHOT_INTERVAL revisions, so thousands of revisions of a long prompt take a
+small fraction of the space of full copies, and any revision is rebuilt from
+the nearest snapshot with at most SNAPSHOT_INTERVAL - 1 deltas. Only the latest
+text of each history is kept in memory. Editors hand their revisions to
+record_later, which computes the deltas and writes them on a background thread.
+
+Histories are identified by a key, one per prompt document (see history_key).
+The database lives in ~/.local/share/meta-prompt-playground/history.sqlite3, or the
+file named by the META_PROMPT_HISTORY environment variable.
+
+Dependencies:
+- None (sqlite3 and zlib from the standard library)
+- src.helpers.text_delta: Contains the delta functions
+"""
+
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+
+from ..helpers.text_delta import make_delta, apply_delta
+
+DEFAULT_HISTORY_PATH = os.path.join(
+    os.path.expanduser("~"), ".local", "share", "meta-prompt-playground", "history.sqlite3"
+)
+
+# A full snapshot is stored every this many revisions
+SNAPSHOT_INTERVAL = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    key TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    saved REAL NOT NULL,
+    snapshot INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (key, number)
+) WITHOUT ROWID;
+"""
+
+
+def history_key(variant, text):
+    """
+    Get the key of the history of a prompt document.
+
+    A document is identified by the variant it is edited in and the text it was
+    loaded with, so loading an unrelated prompt into a variant starts a new
+    history, while loading the same prompt again continues its own.
+
+    Args:
+        variant (str): The variant name
+        text (str): The text the prompt was loaded with
+
+    Returns:
+        str: The history key
+    """
+    return f"variant {variant} {hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _encode_snapshot(text):
+    """Compress a full text"""
+    return zlib.compress(text.encode("utf-8"))
+
+
+def _encode_delta(delta):
+    """Compress a delta"""
+    return zlib.compress(json.dumps(delta, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+class PromptHistory:
+    """
+    Thread-safe SQLite store of text revisions, as deltas with periodic snapshots.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        """
+        Open (or create) a history database.
+
+        Args:
+            path (str): Path of the SQLite database file, or ":memory:"
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._queue = queue.Queue()
+        self._writer = None
+        self.error = None
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Write the queued revisions and close the database"""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+        with self._lock:
+            self._conn.close()
+
+    def record_later(self, key, text):
+        """
+        Queue a revision to be recorded on the writer thread, in order.
+
+        Args:
+            key (str): The history
+            text (str): The text of the revision
+        """
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_queued, name="prompt-history", daemon=True)
+                self._writer.start()
+        self._queue.put((key, text))
+
+    def flush(self):
+        """Wait until the queued revisions are recorded"""
+        self._queue.join()
+
+    def _write_queued(self):
+        """Record queued revisions until closed"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self.record(*item)
+            except Exception as e:
+                self.error = e
+            finally:
+                self._queue.task_done()
+
+    def _rebuild(self, key, number):
+        """Rebuild a revision from its nearest snapshot; the caller holds the lock"""
+        rows = self._conn.execute(
+            "SELECT snapshot, data FROM revisions WHERE key = ? AND number <= ? AND number >= "
+            "(SELECT MAX(number) FROM revisions WHERE key = ? AND number <= ? AND snapshot = 1) "
+            "ORDER BY number",
+            (key, number, key, number),
+        ).fetchall()
+        if not rows:
+            raise KeyError(f"No revision {number} in history {key!r}")
+        text = zlib.decompress(rows[0][1]).decode("utf-8")
+        for _, data in rows[1:]:
+            text = apply_delta(text, json.loads(zlib.decompress(data)))
+        return text
+
+    def _latest_revision(self, key):
+        """Get the (number, text) of a history's latest revision, or (0, None); the caller holds the lock"""
+        if key not in self._latest:
+            row = self._conn.execute("SELECT MAX(number) FROM revisions WHERE key = ?", (key,)).fetchone()
+            number = row[0] or 0
+            self._latest[key] = (number, self._rebuild(key, number) if number else None)
+        return self._latest[key]
+
+    def record(self, key, text):
+        """
+        Record a new revision, unless it equals the latest one.
+
+        Args:
+            key (str): The history
+            text (str): The text of the revision
+
+        Returns:
+            int | None: Number of the new revision, or None if the text is unchanged
+        """
+        with self._lock:
+            number, latest = self._latest_revision(key)
+            if text == latest:
+                return None
+            number += 1
+            data, is_snapshot = None, True
+            if latest is not None and number % SNAPSHOT_INTERVAL != 1:
+                delta = _encode_delta(make_delta(latest, text))
+                # A rewrite can make the delta larger than a snapshot; only compress one to compare then
+                if len(delta) * 4 < len(text) or len(delta) < len(_encode_snapshot(text)):
+                    data, is_snapshot = delta, False
+            if data is None:
+                data = _encode_snapshot(text)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO revisions (key, number, saved, snapshot, length, data) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, number, time.time(), int(is_snapshot), len(text), data),
+                )
+            self._latest[key] = (number, text)
+            return number
+
+    def get(self, key, number=None):
+        """
+        Rebuild a revision.
+
+        Args:
+            key (str): The history
+            number (int, optional): The revision; the latest by default
+
+        Returns:
+            str: The text of the revision
+
+        Raises:
+            KeyError: If the revision doesn't exist
+        """
+        with self._lock:
+            latest_number, latest = self._latest_revision(key)
+            if number is None or number == latest_number:
+                if latest is None:
+                    raise KeyError(f"History {key!r} is empty")
+                return latest
+            return self._rebuild(key, number)
+
+    def revisions(self, key):
+        """
+        List the revisions of a history, newest first.
+
+        Args:
+            key (str): The history
+
+        Returns:
+            list: Dicts with the number, saved (epoch seconds), length (characters),
+                size (stored bytes) and snapshot flag of each revision
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT number, saved, length, LENGTH(data), snapshot FROM revisions WHERE key = ? "
+                "ORDER BY number DESC", (key,)
+            ).fetchall()
+        return [{"number": number, "saved": saved, "length": length, "size": size, "snapshot": bool(snapshot)}
+                for number, saved, length, size, snapshot in rows]
+
+    def clear(self, key):
+        """
+        Delete every revision of a history.
+
+        Args:
+            key (str): The history
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM revisions WHERE key = ?", (key,))
+            self._latest.pop(key, None)
+
+    def stats(self, key=None):
+        """
+        Get the size of the history, or of one history.
+
+        Args:
+            key (str, optional): The history; all histories by default
+
+        Returns:
+            dict: Number of revisions, total characters of the revisions and stored bytes
+        """
+        where, params = ("WHERE key = ?", (key,)) if key is not None else ("", ())
+        with self._lock:
+            revisions, chars, size = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(length), 0), COALESCE(SUM(LENGTH(data)), 0) FROM revisions {where}",
+                params,
+            ).fetchone()
+        return {"revisions": revisions, "text_chars": chars, "stored_bytes": size}
+
+
+_default_history = None
+_default_history_lock = threading.Lock()
+
+
+def get_history():
+    """
+    Get the shared prompt history, opening it on first use.
+
+    The location can be overridden with the META_PROMPT_HISTORY environment variable.
+
+    Returns:
+        PromptHistory: The shared history
+    """
+    global _default_history
+    with _default_history_lock:
+        if _default_history is None:
+            _default_history = PromptHistory(os.environ.get("META_PROMPT_HISTORY", DEFAULT_HISTORY_PATH))
+        return _default_history
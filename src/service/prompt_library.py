@@ -0,0 +1,248 @@
+"""
+Prompt Library Module
+
+This module provides the prompt library: a single SQLite database holding every
+saved prompt set (its variants' prompts, outputs, reasoning and models, and the
+test input), with full-text search.
+
+Texts are stored (and full-text indexed) once per distinct content, keyed by
+their SHA-256, so saving the same meta prompt or output again only adds a small
+row referencing it; saving an identical prompt set again just refreshes the
+existing entry. Listing and searching only read the small entries table (and the
+full-text index), a page at a time, so opening a library with thousands of
+entries is instant.
+
+The library lives in ~/.local/share/meta-prompt-playground/library.sqlite3, or
+the file named by the META_PROMPT_LIBRARY environment variable.
+
+Dependencies:
+- None (sqlite3 from the standard library)
+- library_schema.py: Contains the database schema and queries
+- src.helpers.prompt_set: Contains the saved prompt set format
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .library_schema import (SCHEMA, FTS_SCHEMA, REFERENCED_BLOBS, ENTRY_COLUMNS, LOAD_TEST_INPUT,
+                             LOAD_VARIANTS, search_query, text_hash, fts_query, like_pattern)
+from ..helpers.prompt_set import read_variants, make_prompt_set
+
+DEFAULT_LIBRARY_PATH = os.path.join(
+    os.path.expanduser("~"), ".local", "share", "meta-prompt-playground", "library.sqlite3"
+)
+
+# Entries returned by one listing or search
+DEFAULT_PAGE_SIZE = 200
+
+# Characters of the first prompt shown as an entry's preview
+_PREVIEW_CHARS = 160
+
+
+class PromptLibrary:
+    """
+    Thread-safe SQLite store of prompt sets with content-hash dedup and full-text search.
+    """
+
+    def __init__(self, path=DEFAULT_LIBRARY_PATH):
+        """
+        Open (or create) a library.
+
+        Args:
+            path (str): Path of the SQLite database file, or ":memory:"
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            try:
+                self._conn.executescript(FTS_SCHEMA)
+                self.full_text = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5; searching falls back to LIKE
+                self.full_text = False
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+    def _store_text(self, text):
+        """Store and index a text unless identical content is already stored; returns its id"""
+        key = text_hash(text)
+        row = self._conn.execute("SELECT id FROM blobs WHERE hash = ?", (key,)).fetchone()
+        if row is not None:
+            return row["id"]
+        blob_id = self._conn.execute("INSERT INTO blobs (hash, text) VALUES (?, ?)", (key, text)).lastrowid
+        if self.full_text:
+            self._conn.execute("INSERT INTO blobs_fts (rowid, text) VALUES (?, ?)", (blob_id, text))
+        return blob_id
+
+    def save(self, prompt_set, name=None):
+        """
+        Save a prompt set.
+
+        Args:
+            prompt_set (dict): The prompt set, in the saved file format
+            name (str, optional): Name of the entry; defaults to the start of the
+                test input or the first prompt
+
+        Returns:
+            int: Id of the entry; the existing one if an identical set was saved before
+        """
+        variants = read_variants(prompt_set)
+        test_input = prompt_set.get("test_input") or ""
+        normalized = make_prompt_set(variants, test_input)
+        set_hash = text_hash(json.dumps(normalized, sort_keys=True, ensure_ascii=False))
+        first_prompt = (variants[0].get("prompt") or "") if variants else ""
+        if not name:
+            name = next((line.strip() for line in (test_input or first_prompt).splitlines() if line.strip()),
+                        "Untitled")[:80]
+
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM entries WHERE set_hash = ?", (set_hash,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE entries SET saved = ?, name = ? WHERE id = ?",
+                                   (time.time(), name, row["id"]))
+                return row["id"]
+
+            models = sorted({variant["model"] for variant in normalized["variants"] if variant["model"]})
+            cursor = self._conn.execute(
+                "INSERT INTO entries (set_hash, name, saved, test_input_id, variant_count, models, preview) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (set_hash, name, time.time(), self._store_text(test_input), len(variants),
+                 ", ".join(models), " ".join(first_prompt.split())[:_PREVIEW_CHARS]),
+            )
+            entry_id = cursor.lastrowid
+            for position, variant in enumerate(normalized["variants"]):
+                self._conn.execute(
+                    "INSERT INTO entry_variants (entry_id, position, name, prompt_id, output_id, "
+                    "reasoning_id, model, reasoning_effort) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (entry_id, position, variant["name"],
+                     self._store_text(variant["prompt"] or ""),
+                     self._store_text(variant["output"] or ""),
+                     self._store_text(variant["reasoning"] or ""),
+                     variant["model"], variant["reasoning_effort"]),
+                )
+            return entry_id
+
+    def load(self, entry_id):
+        """
+        Load a saved prompt set.
+
+        Args:
+            entry_id (int): Id of the entry
+
+        Returns:
+            dict: The prompt set, in the saved file format
+
+        Raises:
+            KeyError: If there is no entry with the id
+        """
+        with self._lock:
+            entry = self._conn.execute(LOAD_TEST_INPUT, (entry_id,)).fetchone()
+            if entry is None:
+                raise KeyError(entry_id)
+            rows = self._conn.execute(LOAD_VARIANTS, (entry_id,)).fetchall()
+        return make_prompt_set([dict(row) for row in rows], entry["test_input"])
+
+    def delete(self, entry_id):
+        """
+        Delete an entry, and any texts no other entry uses.
+
+        Args:
+            entry_id (int): Id of the entry
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+            if self.full_text:
+                # An external content index must be told the exact text it is dropping
+                self._conn.execute(
+                    "INSERT INTO blobs_fts (blobs_fts, rowid, text) "
+                    f"SELECT 'delete', id, text FROM blobs WHERE id NOT IN ({REFERENCED_BLOBS})"
+                )
+            self._conn.execute(f"DELETE FROM blobs WHERE id NOT IN ({REFERENCED_BLOBS})")
+
+    def search(self, query=None, limit=DEFAULT_PAGE_SIZE, offset=0):
+        """
+        List entries, newest first, optionally only those matching a search.
+
+        Args:
+            query (str, optional): Text to look for: entries whose name contains it, or
+                whose test input, a prompt, output or reasoning contains all of its
+                words (as prefixes)
+            limit (int): Maximum number of entries to return
+            offset (int): Number of matching entries to skip
+
+        Returns:
+            list: Dicts with the id, name, saved (epoch seconds), variant_count,
+                models and preview of each entry
+        """
+        match = fts_query(query or "")
+        with self._lock:
+            if not match:
+                rows = self._conn.execute(
+                    f"SELECT {ENTRY_COLUMNS} FROM entries e ORDER BY e.saved DESC LIMIT ? OFFSET ?", (limit, offset)
+                )
+            else:
+                rows = self._conn.execute(
+                    search_query(self.full_text),
+                    {"match": match, "like": like_pattern(query.strip()), "limit": limit, "offset": offset},
+                )
+            return [dict(row) for row in rows.fetchall()]
+
+    def import_file(self, path):
+        """
+        Save a prompt set file (as written by the UI) into the library.
+
+        Args:
+            path (str): Path of the JSON file
+
+        Returns:
+            int: Id of the entry
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return self.save(data, os.path.splitext(os.path.basename(path))[0])
+
+    def stats(self):
+        """
+        Get the size of the library.
+
+        Returns:
+            dict: Number of entries, distinct texts and their total characters
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            blobs, chars = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(text)), 0) FROM blobs").fetchone()
+        return {"entries": entries, "texts": blobs, "text_chars": chars}
+
+
+_default_library = None
+_default_library_lock = threading.Lock()
+
+
+def get_library():
+    """
+    Get the shared prompt library, opening it on first use.
+
+    The location can be overridden with the META_PROMPT_LIBRARY environment variable.
+
+    Returns:
+        PromptLibrary: The shared library
+    """
+    global _default_library
+    with _default_library_lock:
+        if _default_library is None:
+            _default_library = PromptLibrary(os.environ.get("META_PROMPT_LIBRARY", DEFAULT_LIBRARY_PATH))
+        return _default_library
@@ -0,0 +1,90 @@
+"""
+Prompt Samples Module
+
+This module generates several independent samples of a system prompt at once,
+with the n parameter where the model supports it and concurrent requests otherwise.
+
+Dependencies:
+- async_generation.py: Generates single system prompts
+- chat_request.py: Builds and sends the chat completion requests
+- generation_records.py: Measures and traces the generations
+- rate_limiter.py: Contains the token estimates
+- backends.py: Contains the backend registry
+- src.helpers.model_selector: Contains the model registry
+"""
+
+import asyncio
+
+from .async_generation import agenerate_prompt
+from .chat_request import build_request, send_request
+from .generation_records import start_metrics, trace_request
+from .rate_limiter import estimate_tokens, EXPECTED_OUTPUT_TOKENS
+from .request_metrics import RequestMetrics
+from .backends import resolve_backend
+from ..helpers.model_selector import DEFAULT_MODEL, get_model
+
+
+async def agenerate_samples(meta_prompt: str, test_input: str = None, samples: int = 1,
+                            model: str = DEFAULT_MODEL, reasoning_effort: str = None,
+                            backend: str = None, timeout: float = None):
+    """
+    Generate several independent samples of the system prompt, asynchronously.
+    
+    Models that support the n parameter return all samples from a single request;
+    for other models the samples are requested concurrently. Samples never come
+    from the response cache, since they are meant to differ.
+    
+    Args:
+        meta_prompt (str): The meta prompt to use for generation
+        test_input (str, optional): The test input to use with the meta prompt
+        samples (int, optional): Number of samples to generate
+        model (str, optional): The model to use, from the model registry
+        reasoning_effort (str, optional): "low", "medium" or "high" for reasoning models
+        backend (str, optional): The backend to use; defaults to META_PROMPT_BACKEND or "openai"
+        timeout (float, optional): Seconds each request may take, including retries
+        
+    Returns:
+        list: A (text, RequestMetrics) pair per sample. The text is None if the sample
+            failed, with the reason in the metrics' error. Samples from one n request
+            share its metrics.
+        
+    Raises:
+        ValueError: If samples is less than 1
+    """
+    if samples < 1:
+        raise ValueError("At least one sample is needed")
+    
+    if samples == 1 or not get_model(model)["supports_n"]:
+        async def sample():
+            metrics = RequestMetrics()
+            try:
+                text = await agenerate_prompt(meta_prompt, test_input, False, model, reasoning_effort,
+                                              backend, metrics, timeout)
+            except Exception:
+                text = None
+            return text, metrics
+        
+        return list(await asyncio.gather(*(sample() for _ in range(samples))))
+    
+    backend = resolve_backend(backend)
+    metrics = start_metrics(None, model, backend)
+    messages = params = None
+    try:
+        messages, params = build_request(meta_prompt, test_input, model, reasoning_effort)
+        params["n"] = samples
+        completion = await send_request(messages, params, backend, metrics, timeout)
+        metrics.mark_first_token()
+        texts = [choice.message.content for choice in sorted(completion.choices, key=lambda c: c.index)]
+        if completion.usage is None:
+            metrics.estimate_usage(estimate_tokens(messages) - EXPECTED_OUTPUT_TOKENS,
+                                   "".join(text or "" for text in texts))
+        return [(text, metrics) for text in texts]
+    except asyncio.CancelledError:
+        metrics.error = "cancelled"
+        raise
+    except Exception as e:
+        metrics.error = str(e)
+        return [(None, metrics)] * samples
+    finally:
+        metrics.mark_completed()
+        trace_request(metrics, messages, params, stream=False)
@@ -0,0 +1,153 @@
+"""
+Rate Limit Budgets Module
+
+This module provides the building blocks of the rate limiter (see rate_limiter.py):
+- TokenBucket: a refilling budget of requests or tokens per minute
+- AdaptiveConcurrency: an AIMD limit on requests in flight, halved on throttling
+  and grown slowly while requests succeed
+
+Dependencies:
+- None
+"""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe budget that refills continuously up to a per-minute capacity.
+
+    Reservations are debited immediately, so concurrent callers queue up behind
+    each other instead of all waking at the same moment.
+    """
+
+    def __init__(self, per_minute):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute (float): Capacity, refilled over one minute
+        """
+        self._lock = threading.Lock()
+        self.capacity = float(per_minute)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        """Add the budget accrued since the last update (lock must be held)"""
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def reserve(self, amount):
+        """
+        Debit an amount from the budget.
+
+        Args:
+            amount (float): The amount to reserve
+
+        Returns:
+            float: Seconds to wait before the reservation is covered
+        """
+        with self._lock:
+            self._refill()
+            self._level -= amount
+            if self._level >= 0:
+                return 0.0
+            return -self._level * 60.0 / self.capacity
+
+    def credit(self, amount):
+        """
+        Return (or, if negative, further debit) part of a reservation.
+
+        Args:
+            amount (float): The amount to give back
+        """
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level + amount)
+
+    def sync(self, limit=None, remaining=None):
+        """
+        Align the bucket with the limits reported by the server.
+
+        Args:
+            limit (float, optional): The server's per-minute limit
+            remaining (float, optional): The budget the server says is left
+        """
+        with self._lock:
+            self._refill()
+            if limit:
+                self.capacity = float(limit)
+            if remaining is not None:
+                self._level = min(self._level, float(remaining))
+
+
+def _resolve(future):
+    """Complete a waiter future unless it was cancelled meanwhile"""
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveConcurrency:
+    """
+    Limit on concurrent requests that adapts with additive increase, multiplicative decrease.
+    """
+
+    def __init__(self, initial=8, minimum=1, maximum=64):
+        """
+        Initialize the limit.
+
+        Args:
+            initial (int): Starting number of requests allowed in flight
+            minimum (int): Lower bound for the limit
+            maximum (int): Upper bound for the limit
+        """
+        self._lock = threading.Lock()
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(initial)
+        self.in_flight = 0
+        self._waiters = []  # (loop, future) of coroutines waiting in acquire
+
+    async def acquire(self):
+        """Wait, without blocking the event loop, until a request may start"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def release(self):
+        """Mark a request as finished"""
+        with self._lock:
+            self.in_flight -= 1
+            self._wake_waiters()
+
+    def on_success(self):
+        """Grow the limit by about one request per limit's worth of successes"""
+        with self._lock:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._wake_waiters()
+
+    def _wake_waiters(self):
+        """Let every waiting coroutine re-check the limit (lock must be held)"""
+        for loop, waiter in self._waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+        self._waiters.clear()
+
+    def on_throttled(self):
+        """Halve the limit after the server throttled a request"""
+        with self._lock:
+            self.limit = max(self.minimum, self.limit / 2.0)
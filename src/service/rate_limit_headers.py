@@ -0,0 +1,77 @@
+"""
+Rate Limit Headers Module
+
+This module reads the rate limit headers of API responses: the x-ratelimit-*
+limits and remaining budgets the server reports with every response, and the
+delay it asks for (retry-after, or the time until the budgets reset) before a
+throttled request is retried.
+
+Dependencies:
+- None
+"""
+
+import re
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Budgets reported in x-ratelimit-limit-<kind> and x-ratelimit-remaining-<kind>
+LIMIT_KINDS = ("requests", "tokens")
+
+
+def parse_duration(value):
+    """
+    Parse a rate limit reset duration such as "20ms", "1s" or "6m0s".
+
+    Args:
+        value (str): The header value
+
+    Returns:
+        float | None: The duration in seconds, or None if it can't be parsed
+    """
+    parts = _DURATION_PART.findall(value or "")
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def read_limits(headers):
+    """
+    Read the limits and remaining budgets reported in response headers.
+
+    Args:
+        headers (Mapping): The HTTP response headers
+
+    Returns:
+        dict: kind ("requests" or "tokens") -> (limit, remaining), each a float or
+            None when the header is missing or malformed
+    """
+    limits = {}
+    for kind in LIMIT_KINDS:
+        values = []
+        for header in (f"x-ratelimit-limit-{kind}", f"x-ratelimit-remaining-{kind}"):
+            try:
+                values.append(float(headers.get(header) or ""))
+            except ValueError:
+                values.append(None)
+        limits[kind] = tuple(values)
+    return limits
+
+
+def retry_delay(headers):
+    """
+    Get the delay a throttling response asked for before retrying.
+
+    Args:
+        headers (Mapping): The HTTP response headers
+
+    Returns:
+        float | None: Seconds to wait, or None if the server didn't say
+    """
+    if headers.get("retry-after-ms"):
+        return parse_duration(headers["retry-after-ms"] + "ms")
+    if headers.get("retry-after"):
+        return parse_duration(headers["retry-after"] + "s")
+    resets = [parse_duration(headers.get(f"x-ratelimit-reset-{kind}")) for kind in LIMIT_KINDS]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
@@ -0,0 +1,166 @@
+"""
+Rate Limiter Module
+
+This module provides client-side rate limiting for API requests. A RateLimiter
+combines request and token budgets with an adaptive concurrency limit (see
+rate_limit_budgets.py), learns the real limits from the x-ratelimit-* response
+headers, and retries throttled or transient failures with jittered backoff.
+
+Waiting is done in coroutines (aslot/acall), so requests queue up on the event loop
+without blocking it; loops on different threads can share one limiter.
+
+Dependencies:
+- backends.py: Contains the backend registry
+- rate_limit_budgets.py: Contains the token buckets and the concurrency limit
+- rate_limit_headers.py: Reads the rate limit headers of responses
+"""
+
+import asyncio
+import os
+import random
+import threading
+from contextlib import asynccontextmanager
+
+from .backends import resolve_backend
+from .rate_limit_budgets import TokenBucket, AdaptiveConcurrency
+from .rate_limit_headers import read_limits
+
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 30000
+
+# Rough output allowance reserved for each request until its real usage is known
+EXPECTED_OUTPUT_TOKENS = 1500
+
+
+def estimate_tokens(messages):
+    """
+    Estimate the tokens a request will consume, before its real usage is known.
+
+    Args:
+        messages (list): The chat messages of the request
+
+    Returns:
+        int: Estimated prompt tokens (about 4 characters each) plus an output allowance
+    """
+    prompt_chars = sum(len(message["content"]) for message in messages)
+    return prompt_chars // 4 + 4 * len(messages) + EXPECTED_OUTPUT_TOKENS
+
+
+class RateLimiter:
+    """
+    Request/token budgets plus adaptive concurrency and retries for one API account.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, max_retries=5,
+                 base_delay=0.5, max_delay=30.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute (float): Initial request budget, until headers report the real one
+            tokens_per_minute (float): Initial token budget, until headers report the real one
+            max_retries (int): Retries for throttled or transient failures
+            base_delay (float): Backoff delay before the first retry, in seconds
+            max_delay (float): Upper bound for a single backoff delay, in seconds
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrency()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Hold one of the concurrent request slots for the duration of an async block"""
+        await self.concurrency.acquire()
+        try:
+            yield
+        finally:
+            self.concurrency.release()
+
+    def update_from_headers(self, headers):
+        """
+        Learn the account's limits and remaining budgets from response headers.
+
+        Args:
+            headers (Mapping): The HTTP response headers
+        """
+        limits = read_limits(headers)
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            bucket.sync(*limits[kind])
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """
+        Correct the token budget once a request's real usage is known.
+
+        Args:
+            estimated_tokens (int): Tokens reserved for the request
+            actual_tokens (int): Tokens the request actually consumed
+        """
+        self.tokens.credit(estimated_tokens - actual_tokens)
+
+    async def acall(self, fn, estimated_tokens, is_retryable, is_throttled, retry_after=None):
+        """
+        Await fn() once the budgets allow it, retrying failures with jittered backoff.
+
+        Waits with asyncio.sleep, so the event loop keeps running.
+
+        Args:
+            fn (callable): Returns an awaitable that performs the request
+            estimated_tokens (int): Tokens to reserve for the request
+            is_retryable (callable): Returns True if an exception should be retried
+            is_throttled (callable): Returns True if an exception means the server throttled us
+            retry_after (callable, optional): Returns the server-requested delay for an exception
+
+        Returns:
+            The result of the awaited fn()
+        """
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens)))
+            try:
+                result = await fn()
+            except Exception as e:
+                # A rejected request doesn't consume the account's budget
+                self.requests.credit(1)
+                self.tokens.credit(estimated_tokens)
+                if is_throttled(e):
+                    self.concurrency.on_throttled()
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                # Full jitter, but never sooner than the server asked for
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                requested = retry_after(e) if retry_after is not None else None
+                await asyncio.sleep(max(delay, requested or 0))
+            else:
+                self.concurrency.on_success()
+                return result
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(backend=None):
+    """
+    Get the shared rate limiter of a backend, creating it on first use.
+
+    Each backend is a separate account with its own limits. The initial budgets
+    can be set with the OPENAI_RPM and OPENAI_TPM environment variables; they are
+    replaced by the limits reported in response headers.
+
+    Args:
+        backend (str, optional): The backend name; None selects the default backend
+
+    Returns:
+        RateLimiter: The backend's limiter
+    """
+    backend = resolve_backend(backend)
+    with _limiters_lock:
+        if backend not in _limiters:
+            _limiters[backend] = RateLimiter(
+                requests_per_minute=float(os.environ.get("OPENAI_RPM", DEFAULT_REQUESTS_PER_MINUTE)),
+                tokens_per_minute=float(os.environ.get("OPENAI_TPM", DEFAULT_TOKENS_PER_MINUTE)),
+            )
+        return _limiters[backend]
@@ -0,0 +1,189 @@
+"""
+Request Metrics Module
+
+This module provides the RequestMetrics class, which records the timings, token
+usage and estimated cost of a single generation request. generate_prompt and
+generate_prompt_stream fill one in as the request progresses; callers that want
+the numbers pass their own instance.
+
+All timings are measured from submission, so they reflect what the user waits for:
+- queue_wait: until the request was sent (worker pool, rate limiter and retries)
+- ttft: until the first token arrived
+- total_latency: until the response was complete
+
+Dependencies:
+- src.helpers.model_selector: Contains the model registry and cost estimates
+"""
+
+import time
+
+from ..helpers.model_selector import estimate_cost
+
+
+def _usage_value(usage, *path):
+    """Read a nested usage field from an SDK object or a plain dict"""
+    value = usage
+    for key in path:
+        if value is None:
+            return None
+        value = value.get(key) if isinstance(value, dict) else getattr(value, key, None)
+    return value
+
+
+class RequestMetrics:
+    """
+    Timings, token usage and cost of one generation request.
+
+    Attributes:
+        model (str): The model the request was sent to
+        backend (str): The backend the request was sent to
+        cache_hit (bool): Whether the response came from the response cache
+        attempts (int): Number of times the request was sent (1 + retries)
+        attempt_errors (list): Error messages of the failed attempts, in order
+        prompt_tokens (int): Tokens sent, as reported by the API (or estimated)
+        completion_tokens (int): Tokens generated, including reasoning tokens
+        reasoning_tokens (int): Hidden reasoning tokens of reasoning models
+        usage_estimated (bool): Whether the token counts are estimates rather than reported
+        error (str): The error message if the request failed
+    """
+
+    def __init__(self, submitted=None):
+        """
+        Initialize the metrics.
+
+        Args:
+            submitted (float, optional): time.monotonic() when the request was submitted; defaults to now
+        """
+        self.submitted = time.monotonic() if submitted is None else submitted
+        self.sent = None
+        self.first_token = None
+        self.completed = None
+        self.model = None
+        self.backend = None
+        self.cache_hit = False
+        self.attempts = 0
+        self.attempt_errors = []
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.reasoning_tokens = 0
+        self.usage_estimated = False
+        self.error = None
+
+    @property
+    def retries(self):
+        """int: Number of times the request was retried"""
+        return max(0, self.attempts - 1)
+
+    @property
+    def queue_wait(self):
+        """float | None: Seconds between submission and sending the request"""
+        return None if self.sent is None else self.sent - self.submitted
+
+    @property
+    def ttft(self):
+        """float | None: Seconds between submission and the first token"""
+        return None if self.first_token is None else self.first_token - self.submitted
+
+    @property
+    def total_latency(self):
+        """float | None: Seconds between submission and the complete response"""
+        return None if self.completed is None else self.completed - self.submitted
+
+    @property
+    def estimated_cost(self):
+        """float: Estimated cost in USD; cached responses cost nothing"""
+        if self.cache_hit or self.model is None:
+            return 0.0
+        return estimate_cost(self.model, self.prompt_tokens, self.completion_tokens)
+
+    def mark_sent(self):
+        """Record that the request is being sent (again, when retrying)"""
+        self.attempts += 1
+        if self.sent is None:
+            self.sent = time.monotonic()
+
+    def record_attempt_error(self, error):
+        """
+        Record why an attempt to send the request failed.
+
+        Args:
+            error (Exception): The error of the attempt
+        """
+        self.attempt_errors.append(f"{type(error).__name__}: {error}")
+
+    def mark_first_token(self):
+        """Record the arrival of the first token, if not already recorded"""
+        if self.first_token is None:
+            self.first_token = time.monotonic()
+
+    def mark_completed(self):
+        """Record that the request has finished, successfully or not"""
+        if self.completed is None:
+            self.completed = time.monotonic()
+
+    def record_usage(self, usage):
+        """
+        Record the token usage reported by the API.
+
+        Args:
+            usage (CompletionUsage | dict): The usage of the completion
+        """
+        self.prompt_tokens = _usage_value(usage, "prompt_tokens") or 0
+        self.completion_tokens = _usage_value(usage, "completion_tokens") or 0
+        self.reasoning_tokens = _usage_value(usage, "completion_tokens_details", "reasoning_tokens") or 0
+        self.usage_estimated = False
+
+    def estimate_usage(self, prompt_tokens, text):
+        """
+        Estimate the token usage when the API didn't report it.
+
+        Args:
+            prompt_tokens (int): Estimated tokens sent
+            text (str): The generated text
+        """
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = len(text) // 4
+        self.reasoning_tokens = 0
+        self.usage_estimated = True
+
+    def summary(self):
+        """
+        Get a compact one-line summary, e.g. for the status bar.
+
+        Returns:
+            str: The summary
+        """
+        if self.error is not None:
+            return f"failed after {self.total_latency or 0:.1f}s"
+        if self.cache_hit:
+            return "cached"
+        ttft = f"{self.ttft:.2f}s" if self.ttft is not None else "-"
+        total = f"{self.total_latency:.1f}s" if self.total_latency is not None else "-"
+        approx = "~" if self.usage_estimated else ""
+        return (f"TTFT {ttft}, {total}, {approx}{self.prompt_tokens}+{self.completion_tokens} tok, "
+                f"${self.estimated_cost:.4f}")
+
+    def as_dict(self):
+        """
+        Get the metrics as plain values.
+
+        Returns:
+            dict: The metrics, with timings in seconds
+        """
+        return {
+            "model": self.model,
+            "backend": self.backend,
+            "cache_hit": self.cache_hit,
+            "queue_wait": self.queue_wait,
+            "ttft": self.ttft,
+            "total_latency": self.total_latency,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "attempt_errors": list(self.attempt_errors),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "reasoning_tokens": self.reasoning_tokens,
+            "usage_estimated": self.usage_estimated,
+            "estimated_cost": self.estimated_cost,
+            "error": self.error,
+        }
@@ -0,0 +1,202 @@
+"""
+Response Cache Module
+
+This module provides an on-disk, content-addressed cache for generated responses.
+Entries are keyed by a hash of the exact messages and model parameters of a request,
+so re-running an unchanged comparison is answered from disk instead of the API.
+The cache is bounded by entry count and total size, evicting least recently used entries.
+A cache directory that can't be read or written behaves as an empty cache: every
+lookup misses and nothing is stored, but requests still succeed.
+
+Dependencies:
+- None
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "meta-prompt-playground", "responses")
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def make_key(messages, params):
+    """
+    Compute the cache key for a request.
+
+    Args:
+        messages (list): The chat messages of the request
+        params (dict): The model parameters of the request
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    payload = json.dumps({"messages": messages, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Thread-safe, size-bounded LRU cache of responses stored as one file per entry.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache. The directory is scanned lazily on first use.
+
+        Args:
+            directory (str): Directory holding the cache entries
+            max_entries (int): Maximum number of entries to keep
+            max_bytes (int): Maximum total size of the entries, in bytes
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = None  # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+
+    def get(self, key):
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): The cache key from make_key
+
+        Returns:
+            str | None: The cached response, or None on a miss
+        """
+        with self._lock:
+            self._load_index()
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = json.load(f)["text"]
+                os.utime(path)  # Persist recency for the next session
+            except (OSError, ValueError, KeyError):
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key, text):
+        """
+        Store a response, evicting least recently used entries if needed.
+
+        Args:
+            key (str): The cache key from make_key
+            text (str): The response to store
+        """
+        data = json.dumps({"text": text}, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._load_index()
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def clear(self):
+        """Remove every entry and reset the hit/miss counters"""
+        with self._lock:
+            self._load_index()
+            for key in list(self._entries):
+                self._remove(key)
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hits, misses, entry count and total size in bytes
+        """
+        with self._lock:
+            entries = len(self._entries) if self._entries is not None else 0
+            return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": self._total_bytes}
+
+    def _path(self, key):
+        """Get the file path for a key"""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self):
+        """Build the LRU index from the files on disk, oldest first"""
+        if self._entries is not None:
+            return
+        self._entries = OrderedDict()
+        files = []
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            # Removed meanwhile, e.g. by another instance's eviction
+                            continue
+                        files.append((stat.st_mtime, entry.name[:-len(".json")], stat.st_size))
+        except OSError:
+            # Missing or unreadable directory; put() fails quietly on it too
+            pass
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is within its bounds"""
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        """Delete an entry from the index and from disk"""
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Get the shared response cache, creating it on first use.
+
+    The location can be overridden with the META_PROMPT_CACHE_DIR environment variable.
+
+    Returns:
+        ResponseCache: The shared cache
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(os.environ.get("META_PROMPT_CACHE_DIR", DEFAULT_CACHE_DIR))
+        return _default_cache
@@ -0,0 +1,235 @@
+"""
+Session Journal Module
+
+This module provides the autosave journal: an append-only file of the session's
+latest state (named texts and small values), written by a background thread so
+callers never wait on disk I/O. Callers only hand over the values that changed;
+the writer thread wakes up every flush interval (or when asked to flush), drops
+values equal to what it already wrote, appends the rest as one JSON line and
+fsyncs once for the whole batch. When the file has grown well past the size of
+the state, it is compacted into a single snapshot line, written to a temporary
+file and atomically swapped in.
+
+After a crash the journal is replayed with read_journal; a torn last line is
+ignored. A session that ends normally writes a final "clean" record.
+
+The journal lives in ~/.local/share/meta-prompt-playground/session.journal, or
+the file named by the META_PROMPT_JOURNAL environment variable.
+
+Dependencies:
+- None (standard library only)
+"""
+
+import json
+import os
+import threading
+import time
+
+DEFAULT_JOURNAL_PATH = os.path.join(
+    os.path.expanduser("~"), ".local", "share", "meta-prompt-playground", "session.journal"
+)
+
+# Seconds between writes of pending changes
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# The journal is compacted once it is this large and four times the size of the state
+COMPACT_MIN_BYTES = 1024 * 1024
+
+
+def journal_path():
+    """
+    Get the path of the session journal.
+
+    Returns:
+        str: META_PROMPT_JOURNAL if set, else the default location
+    """
+    return os.environ.get("META_PROMPT_JOURNAL", DEFAULT_JOURNAL_PATH)
+
+
+def _bytes(value):
+    """Get the UTF-8 size of a text value, or 0 for other values"""
+    return len(value.encode("utf-8")) if isinstance(value, str) else 0
+
+
+def read_journal(path):
+    """
+    Replay a journal.
+
+    Args:
+        path (str): Path of the journal file
+
+    Returns:
+        tuple: (state, saved, clean): the latest value of every key, the time of the
+            last record (epoch seconds, or None), and whether the session ended normally
+    """
+    state, saved, clean = {}, None, False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A record torn by a crash; everything before it is intact
+                break
+            if "snapshot" in record:
+                state = record["snapshot"]
+            state.update(record.get("set", {}))
+            saved = record.get("time", saved)
+            clean = record.get("clean", False)
+    return state, saved, clean
+
+
+class SessionJournal:
+    """
+    Append-only autosave journal written by a background thread.
+    """
+
+    def __init__(self, path, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        Start a new journal, replacing any file at the path.
+
+        Args:
+            path (str): Path of the journal file
+            flush_interval (float): Seconds between writes of pending changes
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        # The error of the last write, or None if it succeeded
+        self.error = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+        self._size = 0
+        self._pending = {}
+        self._written = {}
+        self._state_bytes = 0
+        self._condition = threading.Condition()
+        self._flush_requested = False
+        self._writes = 0
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+        self._thread.start()
+
+    def update(self, key, value):
+        """
+        Record the latest value of a key; it is written with the next batch.
+
+        Args:
+            key (str): The key
+            value: A JSON-serializable value, or a function returning one (called on
+                the writer thread, e.g. to decode a lazily loaded text there)
+        """
+        with self._condition:
+            self._pending[key] = value
+
+    def flush(self, timeout=None):
+        """
+        Write pending changes now and wait until they are on disk.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait
+        """
+        with self._condition:
+            target = self._writes + 1
+            self._flush_requested = True
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._writes >= target or not self._thread.is_alive(), timeout)
+
+    def close(self, clean=True):
+        """
+        Write pending changes and stop the writer thread.
+
+        Args:
+            clean (bool): Mark the session as ended normally
+        """
+        with self._condition:
+            if self._closing:
+                return
+            self._closing = True
+            self._clean = clean
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        """Write batches of pending changes until closed"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._flush_requested or self._closing, self.flush_interval)
+                pending, self._pending = self._pending, {}
+                self._flush_requested = False
+                closing = self._closing
+            try:
+                self._write(pending, closing and self._clean)
+                self.error = None
+            except OSError as e:
+                self.error = e
+                with self._condition:
+                    # Retry the batch with the next one; values updated meanwhile are newer
+                    self._pending = {**pending, **self._pending}
+            with self._condition:
+                self._writes += 1
+                self._condition.notify_all()
+            if closing:
+                self._file.close()
+                return
+
+    def _write(self, pending, clean):
+        """Append the changed values as one record and fsync it"""
+        changes = {}
+        for key, value in pending.items():
+            if callable(value):
+                try:
+                    value = value()
+                except Exception:
+                    continue
+            if self._written.get(key) != value:
+                changes[key] = value
+        if not changes and not clean:
+            return
+
+        record = {"time": time.time(), "set": changes}
+        if clean:
+            record["clean"] = True
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        if self._file.closed:
+            # A failed compaction couldn't reopen the journal
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(line)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._size += len(line.encode("utf-8"))
+        # Only values that reached the disk count as written, so failed ones are retried
+        for key, value in changes.items():
+            self._state_bytes += _bytes(value) - _bytes(self._written.get(key))
+            self._written[key] = value
+
+        if self._size > max(COMPACT_MIN_BYTES, 4 * self._state_bytes):
+            self._compact(clean)
+
+    def _compact(self, clean):
+        """
+        Replace the journal with a single snapshot of the written state.
+
+        If the snapshot can't be swapped in, the journal keeps growing as it was.
+        """
+        record = {"time": time.time(), "snapshot": self._written}
+        if clean:
+            record["clean"] = True
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        temporary = self.path + ".tmp"
+        try:
+            with open(temporary, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(temporary, self.path)
+            self._size = len(data)
+        except OSError:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            raise
+        finally:
+            # Appending goes on at the same path, whichever file is there now
+            if self._file.closed:
+                self._file = open(self.path, "a", encoding="utf-8")
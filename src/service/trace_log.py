@@ -0,0 +1,205 @@
+"""
+Trace Log Module
+
+This module provides opt-in structured tracing of generation requests. Each
+request is recorded as one JSON line: a hash of the messages, the model and
+parameters, timings, token usage, cache hit/miss and error/retry information.
+
+Records are handed to a background writer thread through a bounded queue, so
+tracing never blocks a request: serialization, buffered writes and rotation of
+the files all happen on the writer thread. If the writer falls behind, records
+are dropped (and counted) rather than slowing requests down.
+
+Tracing is enabled by setting the META_PROMPT_TRACE_DIR environment variable
+to a directory, or by calling enable_tracing.
+
+Dependencies:
+- None
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+# Seconds between flushes of the write buffer while records keep arriving
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Records held in memory for the writer before new ones are dropped
+_QUEUE_SIZE = 10000
+
+_WRITE_BUFFER = 256 * 1024
+
+_STOP = object()
+
+
+class TraceWriter:
+    """
+    Appends records to size-rotated JSONL files from a background thread.
+
+    The current file is trace.jsonl; when it grows past max_bytes it is renamed
+    to trace.jsonl.1 (older files shift up) and a new file is started.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        Initialize the writer and start its thread.
+
+        Args:
+            directory (str): Directory holding the trace files
+            max_bytes (int): Size from which the current file is rotated
+            backup_count (int): Number of rotated files to keep
+            flush_interval (float): Seconds between flushes while records keep arriving
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, "trace.jsonl")
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(_QUEUE_SIZE)
+        self._file = None
+        self._size = 0
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record):
+        """
+        Queue a record for writing, without blocking.
+
+        Args:
+            record (dict): JSON-serializable record
+        """
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """
+        Write the queued records, close the file and stop the thread.
+
+        Args:
+            timeout (float): Seconds to wait for the writer to finish
+        """
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Write records as they arrive, flushing at most every flush_interval"""
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                record = None
+            if record is _STOP:
+                break
+            if record is not None:
+                self._write_line(record)
+            if self._file is not None and time.monotonic() - last_flush >= self.flush_interval:
+                self._file.flush()
+                last_flush = time.monotonic()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_line(self, record):
+        """Serialize and append a record, rotating the file when it is full"""
+        try:
+            line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8", buffering=_WRITE_BUFFER)
+                self._size = self._file.tell()
+            self._file.write(line)
+            self._size += len(line.encode("utf-8"))
+            self.written += 1
+            if self._size >= self.max_bytes:
+                self._rotate()
+        except (OSError, TypeError, ValueError):
+            # Tracing is diagnostic; a failed write must never break the application
+            self.dropped += 1
+
+    def _rotate(self):
+        """Move the current file to trace.jsonl.1, shifting older files up"""
+        self._file.close()
+        self._file = None
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+_configured = False
+
+
+def enable_tracing(directory, **options):
+    """
+    Start tracing requests to a directory, replacing any active tracer.
+
+    Args:
+        directory (str): Directory holding the trace files
+        **options: Settings for TraceWriter (max_bytes, backup_count, flush_interval)
+
+    Returns:
+        TraceWriter: The active tracer
+    """
+    global _tracer, _configured
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.close()
+        _tracer = TraceWriter(directory, **options)
+        _configured = True
+        return _tracer
+
+
+def disable_tracing():
+    """Stop tracing, writing out any queued records"""
+    global _tracer, _configured
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.close()
+        _tracer = None
+        _configured = True
+
+
+def get_tracer():
+    """
+    Get the active tracer, enabling it from META_PROMPT_TRACE_DIR on first use.
+
+    Returns:
+        TraceWriter | None: The tracer, or None if tracing is off
+    """
+    global _tracer, _configured
+    if _configured:
+        return _tracer
+    with _tracer_lock:
+        if not _configured:
+            directory = os.environ.get("META_PROMPT_TRACE_DIR")
+            if directory:
+                _tracer = TraceWriter(directory)
+            _configured = True
+        return _tracer
+
+
+@atexit.register
+def _close_tracer():
+    """Write out queued records when the process exits"""
+    if _tracer is not None:
+        _tracer.close()
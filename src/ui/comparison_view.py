@@ -2,7 +2,7 @@
 Comparison View Component
 
 This file contains the ComparisonView widget, which provides a side-by-side layout
-for comparing two meta prompts and their outputs.
+for comparing any number of meta prompt variants and their outputs.
 
 Dependencies:
 - PyQt6
@@ -10,43 +10,120 @@ Dependencies:
 - src.ui.output_display: Contains the OutputDisplay widget
 - src.ui.reasoning_display: Contains the ReasoningDisplay widget
 - src.ui.prompt_input: Contains the PromptInput widget
-- src.service.caption_creator: Contains the generate_prompt function
+- src.ui.model_picker: Contains the ModelPicker widget
+- src.service.generation_executor: Runs generation requests off the GUI thread
+- src.service.response_cache: Contains the shared response cache
+- src.service.prompt_history: Contains the keys of the prompt histories
+- src.prompts.default_meta_prompt: Contains the default meta prompt
+- src.helpers.model_selector: Contains the model registry
+- src.helpers.prompt_set: Contains the variant naming of saved prompt sets
+- src.helpers.lazy_json: Contains the lazily decoded texts of loaded files
 - src.helpers.reasoning_parser: Contains the reasoning parsing functions
+- src.helpers.sample_stats: Aggregates the samples of multi-sample runs
+- src.helpers.token_counter: Contains the context budget of requests
 - src.helpers.ui_styles: Contains common UI styles
 """
 
+import itertools
+import time
+
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, 
     QPushButton, QSplitter, QLabel,
-    QFrame, QTabWidget, QSizePolicy
+    QFrame, QTabWidget, QSizePolicy,
+    QCheckBox, QSpinBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 
 from .prompt_editor import PromptEditor
 from .output_display import OutputDisplay
 from .reasoning_display import ReasoningDisplay
 from .prompt_input import PromptInput
-from ..service.caption_creator import generate_prompt
-from ..helpers.reasoning_parser import extract_reasoning
+from .model_picker import ModelPicker
+from ..service.generation_executor import GenerationExecutor, MAX_WORKERS
+from ..service.response_cache import get_cache
+from ..service.prompt_history import history_key
+from ..prompts.default_meta_prompt import META_PROMPT
+from ..helpers.model_selector import DEFAULT_MODEL
+from ..helpers.prompt_set import variant_name
+from ..helpers.lazy_json import LazyText, resolve
+from ..helpers.token_counter import request_budget, exceeds_context, on_exact_counts
+from ..helpers.reasoning_parser import StreamingReasoningParser, REASONING, extract_reasoning
+from ..helpers.sample_stats import summarize_samples, describe_sample_stats
 from ..helpers.ui_styles import STYLES, COLORS, FONTS, LAYOUT
 
+# Every variant can have a request in flight at the same time
+MAX_VARIANTS = MAX_WORKERS
+
+# Most samples per variant in a multi-sample run
+MAX_SAMPLES = 20
+
 
 class ComparisonView(QWidget):
     """
-    Widget for side-by-side comparison of meta prompts and their outputs.
+    Widget for side-by-side comparison of meta prompt variants and their outputs.
+    
+    Variants are added and removed at runtime. The widgets of a variant (editor,
+    output and reasoning tabs, model picker and buttons) are only created when
+    the variant is first needed, and are kept and reused when it is removed.
+    
+    Signals:
+        status_message: Emitted with a short message describing generation progress
+        metrics_updated: Emitted with the variant and RequestMetrics of each completed request
+        variant_removed: Emitted with the name of a variant when it is removed
+        sample_stats_updated: Emitted with the variant and the stats of each completed
+            multi-sample run (see src.helpers.sample_stats.summarize_samples)
     """
     
-    def __init__(self, parent=None):
+    status_message = pyqtSignal(str)
+    metrics_updated = pyqtSignal(str, object)
+    variant_removed = pyqtSignal(str)
+    sample_stats_updated = pyqtSignal(str, object)
+    # Emitted from the token counter's loading thread; delivered on the GUI thread
+    _exact_counts_loaded = pyqtSignal()
+    
+    def __init__(self, parent=None, variants=2, history=True):
         """
         Initialize the comparison view.
         
         Args:
             parent (QWidget): Parent widget
+            variants (int): Number of variants to start with
+            history (bool): Record the edits of the meta prompts in the prompt history
         """
         super().__init__(parent)
+        self.history = history
+        
+        # Widgets of each shown variant, keyed by name in display order,
+        # and the widgets of removed variants, kept for reuse
+        self._sides = {}
+        self._spare_slots = []
+        
         self._init_ui()
         
+        # The headers show estimates until the tokenizer has loaded
+        self._exact_counts_loaded.connect(self._recount_tokens)
+        on_exact_counts(self._exact_counts_loaded.emit)
+        
+        # Run generations on a worker pool so the window stays responsive
+        self.executor = GenerationExecutor(self)
+        self.executor.started.connect(self._on_generation_started)
+        self.executor.chunk.connect(self._on_generation_chunk)
+        self.executor.finished.connect(self._on_generation_finished)
+        self.executor.failed.connect(self._on_generation_failed)
+        self.executor.busy_changed.connect(self._on_busy_changed)
+        self.executor.cancelled.connect(self._on_generation_cancelled)
+        self.executor.metrics.connect(self._on_generation_metrics)
+        self.executor.samples_finished.connect(self._on_samples_finished)
+        
+        # Variants still pending from the last "Generate All", and when it started
+        self._batch_pending = set()
+        self._batch_started = 0.0
+        
+        for _ in range(variants):
+            self.add_variant()
+    
     def _init_ui(self):
         """Set up the UI components"""
         # Main layout - remove outer margins completely
@@ -60,87 +137,29 @@ class ComparisonView(QWidget):
         self.v_splitter.setStyleSheet(STYLES["splitter"])
         self.v_splitter.setHandleWidth(4)  # Slightly wider handle for easier resizing
         
-        # Top area - Prompt editors
+        # Top area - Prompt editors, one column per variant
         prompt_area = QWidget()
         prompt_layout = QHBoxLayout(prompt_area)
         prompt_layout.setContentsMargins(1, 1, 1, 1)  # Minimal margins
         prompt_layout.setSpacing(1)  # Minimal spacing
         
-        # Create prompt editors
-        self.prompt_editor_left = PromptEditor("Meta Prompt A")
-        self.prompt_editor_right = PromptEditor("Meta Prompt B")
-        
-        # Create a horizontal splitter for the prompt editors
-        h_splitter_top = QSplitter(Qt.Orientation.Horizontal)
-        h_splitter_top.setChildrenCollapsible(False)
-        h_splitter_top.setStyleSheet(STYLES["splitter"])
-        h_splitter_top.setHandleWidth(4)  # Slightly wider handle for easier resizing
-        h_splitter_top.addWidget(self.prompt_editor_left)
-        h_splitter_top.addWidget(self.prompt_editor_right)
-        h_splitter_top.setSizes([500, 500])  # Equal initial sizes
+        self.editor_splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.editor_splitter.setChildrenCollapsible(False)
+        self.editor_splitter.setStyleSheet(STYLES["splitter"])
+        self.editor_splitter.setHandleWidth(4)  # Slightly wider handle for easier resizing
+        prompt_layout.addWidget(self.editor_splitter)
         
-        # Add splitter to layout
-        prompt_layout.addWidget(h_splitter_top)
-        
-        # Bottom area - Output and reasoning displays
+        # Bottom area - Output and reasoning displays, one column per variant
         output_area = QWidget()
         output_layout = QHBoxLayout(output_area)
         output_layout.setContentsMargins(1, 1, 1, 1)  # Minimal margins
         output_layout.setSpacing(1)  # Minimal spacing
         
-        # Create a horizontal splitter for the output displays
-        h_splitter_bottom = QSplitter(Qt.Orientation.Horizontal)
-        h_splitter_bottom.setChildrenCollapsible(False)
-        h_splitter_bottom.setStyleSheet(STYLES["splitter"])
-        h_splitter_bottom.setHandleWidth(4)  # Slightly wider handle for easier resizing
-        
-        # Left side output and reasoning - more compact
-        left_output_container = QWidget()
-        left_output_layout = QVBoxLayout(left_output_container)
-        left_output_layout.setContentsMargins(1, 1, 1, 1)  # Minimal margins
-        
-        # Create tab widget for output and reasoning on left side - more compact
-        self.left_tabs = QTabWidget()
-        self.left_tabs.setStyleSheet(STYLES["tab_widget"])
-        self.left_tabs.setTabPosition(QTabWidget.TabPosition.South)  # Move tabs to bottom for more editor space
-        
-        # Create output and reasoning displays for left side
-        self.output_display_left = OutputDisplay("Output A")
-        self.reasoning_display_left = ReasoningDisplay("Reasoning A")
-        
-        # Add displays to tabs - Output tab first (default)
-        self.left_tabs.addTab(self.output_display_left, "Output")
-        self.left_tabs.addTab(self.reasoning_display_left, "Reasoning")
-        
-        left_output_layout.addWidget(self.left_tabs)
-        
-        # Right side output and reasoning - more compact
-        right_output_container = QWidget()
-        right_output_layout = QVBoxLayout(right_output_container)
-        right_output_layout.setContentsMargins(1, 1, 1, 1)  # Minimal margins
-        
-        # Create tab widget for output and reasoning on right side - more compact
-        self.right_tabs = QTabWidget()
-        self.right_tabs.setStyleSheet(STYLES["tab_widget"]) 
-        self.right_tabs.setTabPosition(QTabWidget.TabPosition.South)  # Move tabs to bottom for more editor space
-        
-        # Create output and reasoning displays for right side
-        self.output_display_right = OutputDisplay("Output B")
-        self.reasoning_display_right = ReasoningDisplay("Reasoning B")
-        
-        # Add displays to tabs - Output tab first (default)
-        self.right_tabs.addTab(self.output_display_right, "Output")
-        self.right_tabs.addTab(self.reasoning_display_right, "Reasoning")
-        
-        right_output_layout.addWidget(self.right_tabs)
-        
-        # Add containers to splitter
-        h_splitter_bottom.addWidget(left_output_container)
-        h_splitter_bottom.addWidget(right_output_container)
-        h_splitter_bottom.setSizes([500, 500])  # Equal initial sizes
-        
-        # Add splitter to layout
-        output_layout.addWidget(h_splitter_bottom)
+        self.output_splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.output_splitter.setChildrenCollapsible(False)
+        self.output_splitter.setStyleSheet(STYLES["splitter"])
+        self.output_splitter.setHandleWidth(4)  # Slightly wider handle for easier resizing
+        output_layout.addWidget(self.output_splitter)
         
         # Add the main areas to the splitter
         self.v_splitter.addWidget(prompt_area)
@@ -163,76 +182,540 @@ class ComparisonView(QWidget):
         
         # Create prompt input with ultra compact style
         self.prompt_input = PromptInput(compact=True)
+        self.prompt_input.tokens_changed.connect(self._update_token_budgets)
         test_input_layout.addWidget(self.prompt_input)
         
         # Add test input to main layout with minimum size policy
         main_layout.addWidget(test_input_container, 0)  # 0 stretch factor to prevent expansion
         
-        # Control area with generate buttons - more compact
+        # Control area with the buttons shared by all variants - more compact
         control_area = QFrame()
         control_area.setFrameShape(QFrame.Shape.StyledPanel)
         control_area.setStyleSheet(STYLES["control_container"])
         control_area.setMaximumHeight(40)  # Limit height for more editor space
         control_layout = QHBoxLayout(control_area)
-        control_layout.setContentsMargins(LAYOUT["padding_small"], LAYOUT["padding_tiny"], 
+        control_layout.setContentsMargins(LAYOUT["padding_small"], LAYOUT["padding_tiny"],
                                          LAYOUT["padding_small"], LAYOUT["padding_tiny"])
         
-        # Generate buttons with improved styling
-        self.generate_left_button = QPushButton("Generate A")  # Shorter label
-        self.generate_left_button.setStyleSheet(STYLES["action_button"])
-        self.generate_left_button.clicked.connect(self._generate_left)
+        self.add_variant_button = QPushButton("Add Variant")
+        self.add_variant_button.setStyleSheet(STYLES["action_button"])
+        self.add_variant_button.setToolTip(f"Compare another meta prompt (up to {MAX_VARIANTS})")
+        self.add_variant_button.clicked.connect(lambda: self.add_variant())
+        
+        self.generate_all_button = QPushButton("Generate All")  # Shorter label
+        self.generate_all_button.setStyleSheet(STYLES["primary_button"])
+        self.generate_all_button.setFont(QFont(FONTS["sans"], FONTS["size_small"], QFont.Weight.Bold))
+        self.generate_all_button.clicked.connect(self.generate_all)
         
-        self.generate_right_button = QPushButton("Generate B")  # Shorter label
-        self.generate_right_button.setStyleSheet(STYLES["action_button"])
-        self.generate_right_button.clicked.connect(self._generate_right)
+        # Samples per variant; more than one switches to multi-sample runs with statistics
+        self.samples_spin = QSpinBox()
+        self.samples_spin.setRange(1, MAX_SAMPLES)
+        self.samples_spin.setPrefix("Samples: ")
+        self.samples_spin.setToolTip("Generate several samples per variant and compare their statistics")
         
-        self.generate_both_button = QPushButton("Generate Both")  # Shorter label
-        self.generate_both_button.setStyleSheet(STYLES["primary_button"])
-        self.generate_both_button.setFont(QFont(FONTS["sans"], FONTS["size_small"], QFont.Weight.Bold))
-        self.generate_both_button.clicked.connect(self._generate_both)
+        # Cache toggle and hit/miss counter
+        self.cache_checkbox = QCheckBox("Cache")
+        self.cache_checkbox.setToolTip("Reuse saved responses for unchanged requests")
+        self.cache_checkbox.setChecked(get_cache().enabled)
+        self.cache_checkbox.toggled.connect(self._set_cache_enabled)
+        
+        self.cache_label = QLabel()
+        self.cache_label.setStyleSheet(f"font-size: {FONTS['size_small']}px; color: {COLORS['text_secondary']};")
+        self._update_cache_label()
         
         # Add buttons to layout
-        control_layout.addWidget(self.generate_left_button)
-        control_layout.addWidget(self.generate_right_button)
+        control_layout.addWidget(self.add_variant_button)
         control_layout.addStretch()
-        control_layout.addWidget(self.generate_both_button)
+        control_layout.addWidget(self.samples_spin)
+        control_layout.addWidget(self.cache_checkbox)
+        control_layout.addWidget(self.cache_label)
+        control_layout.addWidget(self.generate_all_button)
         
         # Add control area to main layout
         main_layout.addWidget(control_area)
     
-    def _generate_left(self):
-        """Generate output for the left prompt"""
-        prompt = self.prompt_editor_left.get_prompt()
-        test_input = self.prompt_input.get_input()
-        full_output = generate_prompt(prompt, test_input)
+    def _create_slot(self):
+        """
+        Create the widgets of one variant and add them to the splitters.
         
-        # Extract reasoning if present
-        reasoning, output = extract_reasoning(full_output)
+        Returns:
+            dict: The widgets; "name" is set when the slot is shown as a variant
+        """
+        slot = {"name": None, "editor": PromptEditor()}
+        slot["editor"].tokens_changed.connect(self._update_token_budgets)
+        
+        # Output column: the variant's controls above its output and reasoning tabs
+        pane = QWidget()
+        pane_layout = QVBoxLayout(pane)
+        pane_layout.setContentsMargins(1, 1, 1, 1)  # Minimal margins
+        pane_layout.setSpacing(1)  # Minimal spacing
+        
+        controls = QFrame()
+        controls.setFrameShape(QFrame.Shape.StyledPanel)
+        controls.setStyleSheet(STYLES["control_container"])
+        controls_layout = QHBoxLayout(controls)
+        controls_layout.setContentsMargins(LAYOUT["padding_tiny"], LAYOUT["padding_tiny"],
+                                           LAYOUT["padding_tiny"], LAYOUT["padding_tiny"])
+        
+        # Model selection and the variant's generate/remove buttons
+        slot["model_picker"] = ModelPicker()
+        slot["model_picker"].model_changed.connect(self._update_token_budgets)
+        slot["button"] = QPushButton()
+        slot["button"].setStyleSheet(STYLES["action_button"])
+        slot["button"].clicked.connect(lambda: self._toggle_generation(slot["name"]))
+        slot["remove_button"] = QPushButton("Remove")
+        slot["remove_button"].setStyleSheet(STYLES["action_button"])
+        slot["remove_button"].clicked.connect(lambda: self.remove_variant(slot["name"]))
+        
+        controls_layout.addWidget(slot["model_picker"])
+        controls_layout.addStretch()
+        controls_layout.addWidget(slot["button"])
+        controls_layout.addWidget(slot["remove_button"])
+        
+        # Create tab widget for output and reasoning - more compact
+        slot["tabs"] = QTabWidget()
+        slot["tabs"].setStyleSheet(STYLES["tab_widget"])
+        slot["tabs"].setTabPosition(QTabWidget.TabPosition.South)  # Move tabs to bottom for more editor space
+        slot["output"] = OutputDisplay()
+        slot["reasoning"] = ReasoningDisplay()
         
-        # Set output and reasoning
-        self.output_display_left.set_output(output)
-        self.reasoning_display_left.set_reasoning(reasoning)
+        # Add displays to tabs - Output tab first (default)
+        slot["tabs"].addTab(slot["output"], "Output")
+        slot["tabs"].addTab(slot["reasoning"], "Reasoning")
         
-        # Always show the output tab first, regardless of reasoning presence
-        self.left_tabs.setCurrentWidget(self.output_display_left)
+        pane_layout.addWidget(controls)
+        pane_layout.addWidget(slot["tabs"], 1)
+        slot["pane"] = pane
+        return slot
+    
+    def _show_slot(self, slot, name, prompt):
+        """
+        Show a new or reused slot as a variant, after the current ones.
+        
+        Args:
+            slot (dict): The variant's widgets
+            name (str): The variant name
+            prompt (str): The meta prompt to start with
+        """
+        slot["name"] = name
+        slot["editor"].set_title(f"Meta Prompt {name}")
+        slot["editor"].set_prompt(prompt)
+        slot["editor"].set_history_key(history_key(name, prompt) if self.history else None)
+        slot["output"].set_title(f"Output {name}")
+        slot["reasoning"].set_title(f"Reasoning {name}")
+        slot["tabs"].setCurrentWidget(slot["output"])
+        slot["button"].setText(f"Generate {name}")
+        slot["model_picker"].set_model(DEFAULT_MODEL)
+        
+        # Adding a widget that is already in a splitter moves it to the end
+        self.editor_splitter.addWidget(slot["editor"])
+        self.output_splitter.addWidget(slot["pane"])
+        slot["editor"].show()
+        slot["pane"].show()
     
-    def _generate_right(self):
-        """Generate output for the right prompt"""
-        prompt = self.prompt_editor_right.get_prompt()
+    def _update_variant_controls(self):
+        """Share the width equally between the variants and update the add/remove buttons"""
+        for splitter in (self.editor_splitter, self.output_splitter):
+            splitter.setSizes([1000] * splitter.count())
+        self.add_variant_button.setEnabled(len(self._sides) < MAX_VARIANTS)
+        for slot in self._sides.values():
+            slot["remove_button"].setVisible(len(self._sides) > 1)
+    
+    def variants(self):
+        """
+        Get the names of the shown variants.
+        
+        Returns:
+            list: Variant names, in display order
+        """
+        return list(self._sides)
+    
+    def variant_widgets(self, name):
+        """
+        Get the widgets of a variant.
+        
+        Args:
+            name (str): The variant name
+        
+        Returns:
+            dict: The variant's "editor", "output", "reasoning", "tabs", "model_picker" and buttons
+        """
+        return self._sides[name]
+    
+    def add_variant(self, name=None, prompt=META_PROMPT):
+        """
+        Add a variant after the current ones, reusing the widgets of a removed one if any.
+        
+        Args:
+            name (str, optional): The variant name; defaults to the first unused letter
+            prompt (str, optional): The meta prompt to start with; defaults to the default meta prompt
+        
+        Returns:
+            str: The variant name
+        
+        Raises:
+            ValueError: If MAX_VARIANTS variants are already shown, or the name is taken
+        """
+        if len(self._sides) >= MAX_VARIANTS:
+            raise ValueError(f"At most {MAX_VARIANTS} variants can be compared")
+        if name is None:
+            name = next(variant_name(index) for index in itertools.count()
+                        if variant_name(index) not in self._sides)
+        elif name in self._sides:
+            raise ValueError(f"Variant {name} already exists")
+        
+        slot = self._spare_slots.pop() if self._spare_slots else self._create_slot()
+        self._show_slot(slot, name, prompt)
+        self._sides[name] = slot
+        self._update_variant_controls()
+        return name
+    
+    def remove_variant(self, name):
+        """
+        Remove a variant, cancelling its generation and keeping its widgets for reuse.
+        
+        Args:
+            name (str): The variant name
+        """
+        if self.executor.is_busy(name):
+            self.executor.cancel(name)
+        slot = self._sides.pop(name)
+        slot.pop("metrics", None)
+        slot["editor"].hide()
+        slot["pane"].hide()
+        
+        # Record the last edits in the variant's history, then stop recording
+        slot["editor"].flush_changes()
+        slot["editor"].set_history_key(None)
+        
+        # Release the texts now rather than when the slot is reused
+        slot["editor"].set_prompt("")
+        slot["output"].set_output("")
+        slot["reasoning"].set_reasoning("")
+        self._spare_slots.append(slot)
+        
+        self._batch_pending.discard(name)
+        self._update_all_button()
+        self._update_variant_controls()
+        self.variant_removed.emit(name)
+    
+    def get_variants(self):
+        """
+        Get the contents of every variant.
+        
+        Returns:
+            list: One dict per variant, with its "name", "prompt", "output",
+                "reasoning", "model" and "reasoning_effort"
+        """
+        return [
+            {
+                "name": name,
+                "prompt": slot["editor"].get_prompt(),
+                "output": slot["output"].get_output(),
+                "reasoning": slot["reasoning"].get_reasoning(),
+                "model": slot["model_picker"].model(),
+                "reasoning_effort": slot["model_picker"].reasoning_effort(),
+            }
+            for name, slot in self._sides.items()
+        ]
+    
+    def set_variants(self, variants):
+        """
+        Show a list of variants in place of the current ones.
+        
+        If the names match the current variants, the variants are updated in
+        place; fields missing from a variant are left unchanged.
+        
+        Args:
+            variants (list): Dicts with a "name" and any of "prompt", "output",
+                "reasoning", "model" and "reasoning_effort"; the texts may be LazyText.
+                A "history" key continues that prompt history instead of the one of
+                the loaded prompt (see src.service.prompt_history.history_key)
+        
+        Raises:
+            ValueError: If there are more than MAX_VARIANTS variants or a name is repeated;
+                the current variants are left unchanged
+        """
+        names = [variant["name"] for variant in variants]
+        if len(names) > MAX_VARIANTS:
+            raise ValueError(f"The prompt set has {len(names)} variants, but at most {MAX_VARIANTS} can be compared")
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"The prompt set has more than one variant named {', '.join(duplicates)}")
+        if names != self.variants():
+            for name in self.variants():
+                self.remove_variant(name)
+            for name in names:
+                self.add_variant(name)
+        
+        for variant in variants:
+            slot = self._sides[variant["name"]]
+            # Always show the output tab first, regardless of reasoning presence
+            slot["tabs"].setCurrentWidget(slot["output"])
+            if "prompt" in variant:
+                prompt = resolve(variant["prompt"]) or ""
+                # Records the last edits in the old prompt's history before switching histories
+                slot["editor"].set_prompt(prompt)
+                if self.history:
+                    slot["editor"].set_history_key(variant.get("history") or history_key(variant["name"], prompt))
+            if "output" in variant:
+                slot["output"].set_output(resolve(variant["output"]) or "")
+            if isinstance(variant.get("reasoning"), LazyText):
+                # The reasoning tab is hidden; decode its text when it is first shown
+                slot["reasoning"].set_reasoning_loader(variant["reasoning"].value)
+            elif "reasoning" in variant:
+                slot["reasoning"].set_reasoning(variant["reasoning"] or "")
+            if variant.get("model"):
+                slot["model_picker"].set_model(variant["model"])
+            if variant.get("reasoning_effort"):
+                slot["model_picker"].set_reasoning_effort(variant["reasoning_effort"])
+    
+    def generate_all(self):
+        """
+        Generate output for every variant concurrently, or cancel them if running.
+        
+        All requests are sent at the same time and each pane is filled as soon
+        as its own result arrives, so the wait is the slowest of the requests.
+        """
+        if self._batch_pending:
+            for side in list(self._batch_pending):
+                self.executor.cancel(side)
+            self._batch_pending.clear()
+            self._update_all_button()
+            self.status_message.emit("Cancelled generation")
+            return
+        
+        self._batch_started = time.monotonic()
+        self._batch_pending = {side for side in list(self._sides) if self._start_generation(side)}
+        self._update_all_button()
+        if self._batch_pending:
+            self.status_message.emit(f"Generating {len(self._batch_pending)} variants...")
+
+    def _toggle_generation(self, side):
+        """
+        Start a generation for a side, or cancel the one in flight.
+        
+        Args:
+            side (str): The side to generate for
+        """
+        if self.executor.is_busy(side):
+            self.executor.cancel(side)
+            self.status_message.emit(f"Cancelled generation {side}")
+        else:
+            self._start_generation(side)
+    
+    def _start_generation(self, side):
+        """
+        Submit a generation request for a side.
+        
+        Args:
+            side (str): The side to generate for
+        
+        Returns:
+            bool: False if the request was not sent because it doesn't fit the model's context window
+        """
+        widgets = self._sides[side]
+        prompt = widgets["editor"].get_prompt()
         test_input = self.prompt_input.get_input()
-        full_output = generate_prompt(prompt, test_input)
+        options = widgets["model_picker"].request_options()
+        budget = request_budget(options["model"], widgets["editor"].token_count(), self.prompt_input.token_count())
+        if exceeds_context(budget):
+            self.status_message.emit(
+                f"{side} not sent: the request needs about {budget['tokens']:,} tokens, more than the "
+                f"{budget['context_window']:,} of {budget['model']}"
+            )
+            return False
+        samples = self.samples_spin.value()
+        if samples > 1:
+            self.executor.submit_samples(side, prompt, test_input, samples, **options)
+            self.status_message.emit(f"Generating {samples} samples of {side}...")
+        else:
+            self.executor.submit(side, prompt, test_input, **options)
+            self.status_message.emit(f"Generating {side}...")
+        return True
+    
+    def _recount_tokens(self):
+        """Replace the estimated token counts with exact ones"""
+        self.prompt_input.reset_token_count()
+        for slot in [*self._sides.values(), *self._spare_slots]:
+            slot["editor"].reset_token_count()
+        self._update_token_budgets()
+    
+    def _update_token_budgets(self, *_):
+        """Show each variant's token count and remaining context, and the tightest one in the test input"""
+        input_tokens = self.prompt_input.token_count()
+        tightest = None
+        for name, slot in self._sides.items():
+            budget = request_budget(slot["model_picker"].model(), slot["editor"].token_count(), input_tokens)
+            slot["editor"].show_token_budget(budget)
+            if tightest is None or budget["remaining"] < tightest[1]["remaining"]:
+                tightest = (name, budget)
+        if tightest is not None:
+            self.prompt_input.show_token_budget(tightest[1], tightest[0])
+    
+    def _on_generation_started(self, side):
+        """
+        Prepare a side's displays for a new streamed generation.
+        
+        Args:
+            side (str): The side being generated
+        """
+        widgets = self._sides[side]
+        widgets["parser"] = StreamingReasoningParser()
+        widgets["output"].begin_stream()
+        widgets["reasoning"].begin_stream()
+        widgets["tabs"].setCurrentWidget(widgets["output"])
+    
+    def _on_generation_chunk(self, side, text):
+        """
+        Show a streamed chunk as soon as it arrives.
         
-        # Extract reasoning if present
-        reasoning, output = extract_reasoning(full_output)
+        Args:
+            side (str): The side the chunk belongs to
+            text (str): The streamed text
+        """
+        widgets = self._sides[side]
+        self._route_chunks(widgets, widgets["parser"].feed(text))
+    
+    def _route_chunks(self, widgets, events):
+        """
+        Append parsed chunks to the reasoning or output display of a side.
+        
+        Args:
+            widgets (dict): The side's widgets
+            events (list): (channel, text) pairs from StreamingReasoningParser
+        """
+        for channel, text in events:
+            display = widgets["reasoning"] if channel == REASONING else widgets["output"]
+            if text is None:
+                display.begin_stream()
+            else:
+                display.append_chunk(text)
+    
+    def _on_generation_finished(self, side, full_output):
+        """
+        Display a finished generation.
         
-        # Set output and reasoning
-        self.output_display_right.set_output(output)
-        self.reasoning_display_right.set_reasoning(reasoning)
+        Args:
+            side (str): The side the output belongs to
+            full_output (str): The generated text
+        """
+        widgets = self._sides[side]
+        self._end_streams(widgets)
         
         # Always show the output tab first, regardless of reasoning presence
-        self.right_tabs.setCurrentWidget(self.output_display_right)
+        widgets["tabs"].setCurrentWidget(widgets["output"])
+        self._finish_batch_side(side, f"Generated {side} ({widgets['metrics'].summary()})")
+    
+    def _end_streams(self, widgets):
+        """
+        Flush any text held back by the parser and finish both display streams.
+        
+        Args:
+            widgets (dict): The side's widgets
+        """
+        parser = widgets.pop("parser", None)
+        if parser is not None:
+            self._route_chunks(widgets, parser.close())
+        widgets["output"].end_stream()
+        widgets["reasoning"].end_stream()
+    
+    def _on_generation_failed(self, side, error):
+        """
+        Report a failed generation.
+        
+        Args:
+            side (str): The side that failed
+            error (str): The error message
+        """
+        self._end_streams(self._sides[side])
+        self._finish_batch_side(side, f"Generation {side} failed: {error}")
+    
+    def _on_samples_finished(self, side, samples):
+        """
+        Show the first successful sample of a multi-sample run and publish the run's stats.
+        
+        Args:
+            side (str): The side the samples belong to
+            samples (list): (text, RequestMetrics) pairs; text is None for failed samples
+        """
+        widgets = self._sides[side]
+        self._end_streams(widgets)
+        text = next((text for text, _ in samples if text is not None), "")
+        reasoning, output = extract_reasoning(text)
+        widgets["output"].set_output(output)
+        widgets["reasoning"].set_reasoning(reasoning)
+        widgets["tabs"].setCurrentWidget(widgets["output"])
+        
+        stats = summarize_samples(samples)
+        self.sample_stats_updated.emit(side, stats)
+        self._finish_batch_side(side, f"Sampled {side} ({describe_sample_stats(stats)})")
+    
+    def _on_generation_metrics(self, side, metrics):
+        """
+        Keep and publish the metrics of a side's completed request.
+        
+        Args:
+            side (str): The side the request belonged to
+            metrics (RequestMetrics): The request's metrics
+        """
+        self._sides[side]["metrics"] = metrics
+        self.metrics_updated.emit(side, metrics)
+    
+    def _set_cache_enabled(self, enabled):
+        """
+        Turn the response cache on or off.
+        
+        Args:
+            enabled (bool): Whether cached responses may be used
+        """
+        get_cache().enabled = enabled
+    
+    def _update_cache_label(self):
+        """Show the current cache hit/miss counts"""
+        stats = get_cache().stats()
+        self.cache_label.setText(f"{stats['hits']} hits / {stats['misses']} misses")
+    
+    def _finish_batch_side(self, side, message):
+        """
+        Record that a side is done and report progress of any "Generate All" run.
+        
+        Args:
+            side (str): The side that completed
+            message (str): Status message describing the side's outcome
+        """
+        self._update_cache_label()
+        if side in self._batch_pending:
+            self._batch_pending.discard(side)
+            if not self._batch_pending:
+                elapsed = time.monotonic() - self._batch_started
+                message = f"{message} - all done in {elapsed:.1f}s"
+            self._update_all_button()
+        self.status_message.emit(message)
+    
+    def _on_busy_changed(self, side, busy):
+        """
+        Update the side's generate button to reflect its in-flight state.
+        
+        Args:
+            side (str): The side whose state changed
+            busy (bool): Whether a request is in flight
+        """
+        button = self._sides[side]["button"]
+        button.setText(f"Cancel {side}" if busy else f"Generate {side}")
+    
+    def _on_generation_cancelled(self, side):
+        """
+        Drop a cancelled side from any pending "Generate All" run.
+        
+        Args:
+            side (str): The side that was cancelled
+        """
+        self._end_streams(self._sides[side])
+        if side in self._batch_pending:
+            self._batch_pending.discard(side)
+            self._update_all_button()
     
-    def _generate_both(self):
-        """Generate output for both prompts"""
-        self._generate_left()
-        self._generate_right() 
\ No newline at end of file
+    def _update_all_button(self):
+        """Show whether the "Generate All" button will start or cancel a run"""
+        self.generate_all_button.setText("Cancel All" if self._batch_pending else "Generate All")
@@ -0,0 +1,107 @@
+"""
+History Dialog Component
+
+This file contains the HistoryDialog, which lists the saved revisions of a meta
+prompt editor, previews any of them (rebuilt on demand from the prompt history)
+and restores the chosen one.
+
+Dependencies:
+- PyQt6
+- src.service.prompt_history: Contains the prompt history
+- src.helpers.ui_styles: Contains common UI styles
+"""
+
+import time
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
+    QPlainTextEdit, QPushButton, QSplitter, QLabel
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+
+from ..helpers.ui_styles import COLORS, FONTS
+
+
+class HistoryDialog(QDialog):
+    """
+    Dialog for browsing and restoring the revisions of one history.
+    """
+
+    def __init__(self, history, key, title="History", parent=None):
+        """
+        Initialize the dialog.
+
+        Args:
+            history (PromptHistory): The history store
+            key (str): The history to show
+            title (str): Window title
+            parent (QWidget): Parent widget
+        """
+        super().__init__(parent)
+        self.history = history
+        self.key = key
+        self.selected_text = None
+        self.setWindowTitle(title)
+        self.resize(900, 600)
+        self._init_ui()
+        self._load_revisions()
+
+    def _init_ui(self):
+        """Set up the UI components"""
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet(f"font-size: {FONTS['size_small']}px; color: {COLORS['text_secondary']};")
+        layout.addWidget(self.summary_label)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.revision_list = QListWidget()
+        self.revision_list.currentItemChanged.connect(self._show_revision)
+        self.revision_list.itemDoubleClicked.connect(lambda *_: self.accept())
+        self.preview = QPlainTextEdit()
+        self.preview.setReadOnly(True)
+        preview_font = QFont(FONTS["monospace"], FONTS["size_normal"])
+        preview_font.setStyleHint(QFont.StyleHint.Monospace)
+        self.preview.setFont(preview_font)
+        splitter.addWidget(self.revision_list)
+        splitter.addWidget(self.preview)
+        splitter.setSizes([260, 640])
+        layout.addWidget(splitter, 1)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.restore_button = QPushButton("Restore")
+        self.restore_button.setEnabled(False)
+        self.restore_button.clicked.connect(self.accept)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.reject)
+        buttons.addWidget(self.restore_button)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def _load_revisions(self):
+        """List the revisions, newest first"""
+        revisions = self.history.revisions(self.key)
+        stats = self.history.stats(self.key)
+        summary = (f"{stats['revisions']} revisions, {stats['text_chars']:,} characters "
+                   f"stored in {stats['stored_bytes']:,} bytes")
+        if self.history.error is not None:
+            summary += f" (the last revisions couldn't all be saved: {self.history.error})"
+        self.summary_label.setText(summary)
+        for revision in revisions:
+            saved = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(revision["saved"]))
+            item = QListWidgetItem(f"#{revision['number']}  {saved}  {revision['length']:,} chars")
+            item.setData(Qt.ItemDataRole.UserRole, revision["number"])
+            self.revision_list.addItem(item)
+        if revisions:
+            self.revision_list.setCurrentRow(0)
+
+    def _show_revision(self, item, _previous=None):
+        """Rebuild and preview the selected revision"""
+        if item is None:
+            self.selected_text = None
+        else:
+            self.selected_text = self.history.get(self.key, item.data(Qt.ItemDataRole.UserRole))
+        self.preview.setPlainText(self.selected_text or "")
+        self.restore_button.setEnabled(self.selected_text is not None)
@@ -0,0 +1,174 @@
+"""
+Library Panel Component
+
+This file contains the LibraryPanel widget, a browser for the prompt library:
+a search box, the matching saved prompt sets (newest first, a page at a time),
+and buttons to open or delete the selected entry.
+
+Dependencies:
+- PyQt6
+- src.service.prompt_library: Contains the prompt library
+- src.helpers.ui_styles: Contains common UI styles
+"""
+
+import time
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QMessageBox
+)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+
+from ..service.prompt_library import get_library, DEFAULT_PAGE_SIZE
+from ..helpers.ui_styles import COLORS, FONTS
+
+# Milliseconds of typing pause before the search runs
+_SEARCH_DELAY_MS = 150
+
+_COLUMNS = ("Name", "Saved", "Variants", "Models")
+
+
+class LibraryPanel(QWidget):
+    """
+    Widget for searching and opening saved prompt sets.
+
+    Signals:
+        open_requested: Emitted with the entry id when an entry should be opened
+        status_message: Emitted with a message for the status bar
+    """
+
+    open_requested = pyqtSignal(int)
+    status_message = pyqtSignal(str)
+
+    def __init__(self, library=None, parent=None):
+        """
+        Initialize the library panel.
+
+        Args:
+            library (PromptLibrary, optional): The library to browse; the shared one by default
+            parent (QWidget): Parent widget
+        """
+        super().__init__(parent)
+        self._library = library
+        self._loaded = 0
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(_SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.refresh)
+        self._init_ui()
+
+    @property
+    def library(self):
+        """The browsed library, opened on first use"""
+        if self._library is None:
+            self._library = get_library()
+        return self._library
+
+    def _init_ui(self):
+        """Set up the UI components"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search names, prompts, outputs and test inputs")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self._search_timer.start)
+        self.search_edit.returnPressed.connect(self.refresh)
+        layout.addWidget(self.search_edit)
+
+        self.table = QTableWidget(0, len(_COLUMNS))
+        self.table.setHorizontalHeaderLabels(_COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setStyleSheet(f"""
+            QTableWidget {{
+                font-size: {FONTS['size_small']}px;
+                color: {COLORS['text_primary']};
+                gridline-color: {COLORS['border']};
+            }}
+        """)
+        self.table.cellDoubleClicked.connect(lambda *_: self._open_selected())
+        self.table.itemSelectionChanged.connect(self._update_buttons)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.open_button = QPushButton("Open")
+        self.open_button.clicked.connect(self._open_selected)
+        self.delete_button = QPushButton("Delete")
+        self.delete_button.clicked.connect(self._delete_selected)
+        self.more_button = QPushButton("Show More")
+        self.more_button.setToolTip(f"Show the next {DEFAULT_PAGE_SIZE} entries")
+        self.more_button.clicked.connect(self._load_page)
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        for button in (self.open_button, self.delete_button, self.more_button):
+            buttons.addWidget(button)
+        buttons.addStretch()
+        buttons.addWidget(refresh_button)
+        layout.addLayout(buttons)
+        self._update_buttons()
+
+    def refresh(self):
+        """Re-run the current search from the first page"""
+        self._search_timer.stop()
+        self.table.setRowCount(0)
+        self._loaded = 0
+        self._load_page()
+
+    def _load_page(self):
+        """Append the next page of matching entries to the table"""
+        entries = self.library.search(self.search_edit.text(), DEFAULT_PAGE_SIZE, self._loaded)
+        self.table.setUpdatesEnabled(False)
+        for entry in entries:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["saved"]))
+            values = (entry["name"], saved, str(entry["variant_count"]), entry["models"])
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setToolTip(entry["preview"])
+                if column == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, entry["id"])
+                self.table.setItem(row, column, item)
+        self.table.setUpdatesEnabled(True)
+        self._loaded += len(entries)
+        self.more_button.setVisible(len(entries) == DEFAULT_PAGE_SIZE)
+        self._update_buttons()
+
+    def _selected_id(self):
+        """Get the id of the selected entry, or None"""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.table.item(rows[0].row(), 0).data(Qt.ItemDataRole.UserRole)
+
+    def _update_buttons(self):
+        """Enable the entry buttons only when an entry is selected"""
+        selected = self._selected_id() is not None
+        self.open_button.setEnabled(selected)
+        self.delete_button.setEnabled(selected)
+
+    def _open_selected(self):
+        """Request opening the selected entry"""
+        entry_id = self._selected_id()
+        if entry_id is not None:
+            self.open_requested.emit(entry_id)
+
+    def _delete_selected(self):
+        """Delete the selected entry from the library"""
+        entry_id = self._selected_id()
+        if entry_id is None:
+            return
+        row = self.table.selectionModel().selectedRows()[0].row()
+        name = self.table.item(row, 0).text()
+        answer = QMessageBox.question(self, "Delete Entry", f"Delete \"{name}\" from the library?")
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        self.library.delete(entry_id)
+        self.table.removeRow(row)
+        self._loaded -= 1
+        self.status_message.emit(f"Deleted \"{name}\" from the library")
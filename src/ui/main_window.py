@@ -7,32 +7,60 @@ for the Meta Prompt Playground application.
 Dependencies:
 - PyQt6
 - src.ui.comparison_view: Contains the ComparisonView widget
+- src.ui.metrics_panel: Contains the MetricsPanel widget
+- src.ui.sample_stats_panel: Contains the SampleStatsPanel widget
+- src.ui.library_panel: Contains the LibraryPanel widget
+- src.service.prompt_library: Contains the prompt library
+- src.service.session_journal: Contains the autosave journal
+- src.helpers.prompt_set: Contains the saved prompt set format
+- src.helpers.lazy_json: Loads saved files without decoding hidden texts
+- src.helpers.change_notifier: Counts the edits of the documents
 - src.helpers.ui_styles: Contains common UI styles
 """
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, 
     QStatusBar, QMenuBar, QMenu, QApplication,
-    QToolBar, QFileDialog, QMessageBox
+    QToolBar, QFileDialog, QMessageBox,
+    QDockWidget, QLabel, QInputDialog
 )
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtGui import QAction, QIcon, QFont
 
 import json
 import os
 import sys
+import time
 
 from .comparison_view import ComparisonView
+from .metrics_panel import MetricsPanel
+from .sample_stats_panel import SampleStatsPanel
+from .library_panel import LibraryPanel
+from ..service.prompt_library import get_library
+from ..service.session_journal import SessionJournal, read_journal, journal_path
+from ..helpers.prompt_set import read_variants, make_prompt_set
+from ..helpers.lazy_json import load_lazy, resolve
+from ..helpers.change_notifier import content_revision
 from ..helpers.ui_styles import STYLES, COLORS, FONTS, LAYOUT
 
+# Milliseconds between autosave checks for changed texts
+AUTOSAVE_INTERVAL_MS = 2000
+
 
 class MainWindow(QMainWindow):
     """
     Main window for the Meta Prompt Playground application.
     """
     
-    def __init__(self):
-        """Initialize the main window"""
+    def __init__(self, autosave=True, history=True):
+        """
+        Initialize the main window.
+        
+        Args:
+            autosave (bool): Journal the session for crash recovery and offer to
+                restore a session that didn't end normally
+            history (bool): Record the edits of the meta prompts in the prompt history
+        """
         super().__init__()
         self.setWindowTitle("Meta Prompt Playground")
         self.setMinimumSize(1200, 800)  # Slightly smaller minimum size
@@ -50,7 +78,7 @@ class MainWindow(QMainWindow):
         self.layout.setSpacing(0)  # No spacing
         
         # Create comparison view
-        self.comparison_view = ComparisonView()
+        self.comparison_view = ComparisonView(history=history)
         self.layout.addWidget(self.comparison_view)
         
         # Set up status bar - more compact
@@ -67,12 +95,54 @@ class MainWindow(QMainWindow):
                 font-size: {FONTS["size_small"]}px;
             }}
         """)
+        self.comparison_view.status_message.connect(self.status_bar.showMessage)
+        
+        # Metrics of the latest request of each side, in the status bar and a dockable panel
+        self._metrics_labels = {}
+        self.metrics_panel = MetricsPanel()
+        self.metrics_dock = QDockWidget("Metrics", self)
+        self.metrics_dock.setWidget(self.metrics_panel)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.metrics_dock)
+        self.metrics_dock.hide()
+        self.comparison_view.metrics_updated.connect(self._show_metrics)
+        self.comparison_view.variant_removed.connect(self._forget_metrics)
+        
+        # Statistics of multi-sample runs, in a dockable panel shown when a run completes
+        self.sample_stats_panel = SampleStatsPanel()
+        self.samples_dock = QDockWidget("Samples", self)
+        self.samples_dock.setWidget(self.sample_stats_panel)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.samples_dock)
+        self.samples_dock.hide()
+        self.comparison_view.sample_stats_updated.connect(self._show_sample_stats)
+        
+        # Prompt library browser; the library is only opened when the panel is first shown
+        self.library_panel = LibraryPanel()
+        self.library_dock = QDockWidget("Library", self)
+        self.library_dock.setWidget(self.library_panel)
+        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.library_dock)
+        self.library_dock.hide()
+        self.library_dock.visibilityChanged.connect(self._on_library_visibility)
+        self.library_panel.open_requested.connect(self._open_library_entry)
+        self.library_panel.status_message.connect(self.status_bar.showMessage)
+        
+        # Autosave journal, written by a background thread; started once the event
+        # loop runs so reading the previous session doesn't delay the first paint
+        self.journal = None
+        self._last_session = None
+        self._journal_revisions = {}
+        self._journal_error = None
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setInterval(AUTOSAVE_INTERVAL_MS)
+        self.autosave_timer.timeout.connect(self._autosave)
         
         # Set up menus
         self._create_menus()
         
         # Set up toolbar - more compact
         self._create_toolbar()
+        
+        if autosave:
+            QTimer.singleShot(0, self._start_autosave)
     
     def _apply_global_style(self):
         """Apply global application style"""
@@ -229,7 +299,7 @@ class MainWindow(QMainWindow):
         
         # File menu actions
         save_action = QAction("&Save Prompts", self)  # Shorter text
-        save_action.setStatusTip("Save both prompts to a file")
+        save_action.setStatusTip("Save all variants to a file")
         save_action.triggered.connect(self._save_prompts)
         file_menu.addAction(save_action)
         
@@ -240,11 +310,50 @@ class MainWindow(QMainWindow):
         
         file_menu.addSeparator()
         
+        library_save_action = QAction("Save to &Library", self)
+        library_save_action.setStatusTip("Save all variants to the prompt library")
+        library_save_action.triggered.connect(self._save_to_library)
+        file_menu.addAction(library_save_action)
+        
+        import_action = QAction("&Import Files into Library", self)
+        import_action.setStatusTip("Add saved prompt files to the prompt library")
+        import_action.triggered.connect(self._import_into_library)
+        file_menu.addAction(import_action)
+        
+        file_menu.addSeparator()
+        
+        self.restore_session_action = QAction("&Restore Last Session", self)
+        self.restore_session_action.setStatusTip("Restore the prompts, test input and outputs of the previous session")
+        self.restore_session_action.setEnabled(False)
+        self.restore_session_action.triggered.connect(self._restore_last_session)
+        file_menu.addAction(self.restore_session_action)
+        
+        file_menu.addSeparator()
+        
         exit_action = QAction("E&xit", self)
         exit_action.setStatusTip("Exit the application")
         exit_action.triggered.connect(QApplication.instance().quit)
         file_menu.addAction(exit_action)
         
+        # View menu
+        view_menu = QMenu("&View", self)
+        menu_bar.addMenu(view_menu)
+        
+        metrics_action = self.metrics_dock.toggleViewAction()
+        metrics_action.setText("&Metrics")
+        metrics_action.setStatusTip("Show timings, tokens and cost of each variant")
+        view_menu.addAction(metrics_action)
+        
+        samples_action = self.samples_dock.toggleViewAction()
+        samples_action.setText("&Samples")
+        samples_action.setStatusTip("Show the statistics of multi-sample runs of each variant")
+        view_menu.addAction(samples_action)
+        
+        library_action = self.library_dock.toggleViewAction()
+        library_action.setText("&Library")
+        library_action.setStatusTip("Browse and search the prompt library")
+        view_menu.addAction(library_action)
+        
         # Help menu
         help_menu = QMenu("&Help", self)
         menu_bar.addMenu(help_menu)
@@ -263,17 +372,23 @@ class MainWindow(QMainWindow):
         toolbar.setMaximumHeight(28)  # Limit height
         self.addToolBar(toolbar)
         
-        # Generate both button
-        generate_both_action = QAction("Generate Both", self)
-        generate_both_action.setStatusTip("Generate output for both prompts")
-        generate_both_action.triggered.connect(self.comparison_view._generate_both)
-        toolbar.addAction(generate_both_action)
+        # Generate all button
+        generate_all_action = QAction("Generate All", self)
+        generate_all_action.setStatusTip("Generate output for every variant")
+        generate_all_action.triggered.connect(self.comparison_view.generate_all)
+        toolbar.addAction(generate_all_action)
+        
+        # Add variant button
+        add_variant_action = QAction("Add Variant", self)
+        add_variant_action.setStatusTip("Compare another meta prompt")
+        add_variant_action.triggered.connect(self.comparison_view.add_variant_button.click)
+        toolbar.addAction(add_variant_action)
         
         toolbar.addSeparator()
         
         # Save button
         save_action = QAction("Save", self)
-        save_action.setStatusTip("Save both prompts to a file")
+        save_action.setStatusTip("Save all variants to a file")
         save_action.triggered.connect(self._save_prompts)
         toolbar.addAction(save_action)
         
@@ -282,29 +397,113 @@ class MainWindow(QMainWindow):
         load_action.setStatusTip("Load prompts from a file")
         load_action.triggered.connect(self._load_prompts)
         toolbar.addAction(load_action)
+        
+        toolbar.addSeparator()
+        
+        # Library buttons
+        library_save_action = QAction("Save to Library", self)
+        library_save_action.setStatusTip("Save all variants to the prompt library")
+        library_save_action.triggered.connect(self._save_to_library)
+        toolbar.addAction(library_save_action)
+        
+        library_action = QAction("Library", self)
+        library_action.setStatusTip("Browse and search the prompt library")
+        library_action.triggered.connect(self.library_dock.show)
+        toolbar.addAction(library_action)
     
-    def _save_prompts(self):
-        """Save both prompts to a JSON file"""
-        # Get prompts
-        prompt_a = self.comparison_view.prompt_editor_left.get_prompt()
-        prompt_b = self.comparison_view.prompt_editor_right.get_prompt()
-        output_a = self.comparison_view.output_display_left.get_output()
-        output_b = self.comparison_view.output_display_right.get_output()
-        reasoning_a = self.comparison_view.reasoning_display_left.get_reasoning()
-        reasoning_b = self.comparison_view.reasoning_display_right.get_reasoning()
-        test_input = self.comparison_view.prompt_input.get_input()
-        
-        # Create data structure
-        data = {
-            "prompt_a": prompt_a,
-            "prompt_b": prompt_b,
-            "output_a": output_a,
-            "output_b": output_b,
-            "reasoning_a": reasoning_a,
-            "reasoning_b": reasoning_b,
-            "test_input": test_input
-        }
+    def _show_metrics(self, side, metrics):
+        """
+        Show a side's latest request metrics in the status bar and the metrics panel.
+        
+        Args:
+            side (str): The side the request belonged to
+            metrics (RequestMetrics): The request's metrics
+        """
+        label = self._metrics_labels.get(side)
+        if label is None:
+            label = QLabel()
+            self._metrics_labels[side] = label
+            self.status_bar.addPermanentWidget(label)
+        label.setText(f"{side}: {metrics.summary()}")
+        self.metrics_panel.update_metrics(side, metrics)
+    
+    def _forget_metrics(self, side):
+        """
+        Drop the metrics of a removed variant from the status bar and the metrics and samples panels.
+        
+        Args:
+            side (str): The removed variant
+        """
+        label = self._metrics_labels.pop(side, None)
+        if label is not None:
+            self.status_bar.removeWidget(label)
+            label.deleteLater()
+        self.metrics_panel.remove_side(side)
+        self.sample_stats_panel.remove_side(side)
+    
+    def _show_sample_stats(self, side, stats):
+        """
+        Show the stats of a variant's multi-sample run in the samples panel.
+        
+        Args:
+            side (str): The variant the samples belong to
+            stats (dict): Stats from src.helpers.sample_stats.summarize_samples
+        """
+        self.sample_stats_panel.update_stats(side, stats)
+        self.samples_dock.show()
+    
+    def prompt_set(self):
+        """
+        Get the current variants (prompts, outputs, reasoning, models) and test input.
+        
+        Returns:
+            dict: The prompt set, in the saved file format
+        """
+        return make_prompt_set(self.comparison_view.get_variants(),
+                               self.comparison_view.prompt_input.get_input())
+    
+    def apply_prompt_set(self, data):
+        """
+        Show a prompt set in the comparison view.
+        
+        Args:
+            data (dict): The prompt set, in the current or the two-prompt format;
+                missing fields are left unchanged, and texts may be LazyText
         
+        Raises:
+            ValueError: If the variants can't be shown; nothing is changed then
+        """
+        variants = read_variants(data)
+        if variants:
+            self.comparison_view.set_variants(variants)
+        if "test_input" in data:
+            self.comparison_view.prompt_input.set_input(resolve(data["test_input"]))
+    
+    def save_prompt_set(self, file_path):
+        """
+        Save the current prompt set to a JSON file.
+        
+        Args:
+            file_path (str): Path of the file to write
+        """
+        with open(file_path, 'w') as f:
+            json.dump(self.prompt_set(), f, indent=4)
+    
+    def load_prompt_set(self, file_path):
+        """
+        Load a prompt set from a JSON file and show it.
+        
+        The file is scanned without decoding its long texts (memory-mapped if it is
+        large); the visible editors and outputs are filled right away, and each
+        reasoning text is only decoded when its tab is first shown.
+        
+        Args:
+            file_path (str): Path of the file to read
+        """
+        self.apply_prompt_set(load_lazy(file_path))
+    
+    def _save_prompts(self):
+        """Save all variants to a JSON file"""
         # Get save path
         file_path, _ = QFileDialog.getSaveFileName(
             self, 
@@ -315,8 +514,7 @@ class MainWindow(QMainWindow):
         
         if file_path:
             try:
-                with open(file_path, 'w') as f:
-                    json.dump(data, f, indent=4)
+                self.save_prompt_set(file_path)
                 self.status_bar.showMessage(f"Saved to {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Save Error", f"Error saving file: {str(e)}")
@@ -333,33 +531,185 @@ class MainWindow(QMainWindow):
         
         if file_path:
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                # Set prompts and outputs
-                if "prompt_a" in data:
-                    self.comparison_view.prompt_editor_left.set_prompt(data["prompt_a"])
-                if "prompt_b" in data:
-                    self.comparison_view.prompt_editor_right.set_prompt(data["prompt_b"])
-                if "output_a" in data:
-                    self.comparison_view.output_display_left.set_output(data["output_a"])
-                if "output_b" in data:
-                    self.comparison_view.output_display_right.set_output(data["output_b"])
-                if "reasoning_a" in data:
-                    self.comparison_view.reasoning_display_left.set_reasoning(data["reasoning_a"])
-                    # Always set output tab as default, regardless of reasoning presence
-                    self.comparison_view.left_tabs.setCurrentWidget(self.comparison_view.output_display_left)
-                if "reasoning_b" in data:
-                    self.comparison_view.reasoning_display_right.set_reasoning(data["reasoning_b"])
-                    # Always set output tab as default, regardless of reasoning presence
-                    self.comparison_view.right_tabs.setCurrentWidget(self.comparison_view.output_display_right)
-                if "test_input" in data:
-                    self.comparison_view.prompt_input.set_input(data["test_input"])
-                
+                self.load_prompt_set(file_path)
                 self.status_bar.showMessage(f"Loaded from {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Load Error", f"Error loading file: {str(e)}")
     
+    def _on_library_visibility(self, visible):
+        """Fill the library panel the first time it is shown"""
+        if visible and self.library_panel.table.rowCount() == 0:
+            try:
+                self.library_panel.refresh()
+            except Exception as e:
+                QMessageBox.critical(self, "Library Error", f"Error opening the library: {str(e)}")
+    
+    def _save_to_library(self):
+        """Save all variants to the prompt library"""
+        name, ok = QInputDialog.getText(
+            self, "Save to Library", "Name (leave empty to name it after the test input):"
+        )
+        if not ok:
+            return
+        try:
+            get_library().save(self.prompt_set(), name.strip() or None)
+            self.status_bar.showMessage("Saved to the library")
+            if self.library_dock.isVisible():
+                self.library_panel.refresh()
+        except Exception as e:
+            QMessageBox.critical(self, "Library Error", f"Error saving to the library: {str(e)}")
+    
+    def _import_into_library(self):
+        """Add prompt set JSON files to the prompt library"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Import Files into Library",
+            os.path.join(os.getcwd(), "src/saved_prompts"),
+            "JSON Files (*.json)"
+        )
+        
+        if file_paths:
+            failed = []
+            for file_path in file_paths:
+                try:
+                    get_library().import_file(file_path)
+                except Exception as e:
+                    failed.append(f"{os.path.basename(file_path)}: {str(e)}")
+            self.status_bar.showMessage(f"Imported {len(file_paths) - len(failed)} file(s) into the library")
+            if failed:
+                QMessageBox.critical(self, "Import Error", "Error importing files:\n" + "\n".join(failed))
+            self.library_dock.show()
+            self.library_panel.refresh()
+    
+    def _open_library_entry(self, entry_id):
+        """
+        Show a prompt set from the library.
+        
+        Args:
+            entry_id (int): Id of the library entry
+        """
+        try:
+            self.apply_prompt_set(get_library().load(entry_id))
+            self.status_bar.showMessage("Loaded from the library")
+        except Exception as e:
+            QMessageBox.critical(self, "Library Error", f"Error loading from the library: {str(e)}")
+    
+    def _start_autosave(self):
+        """Keep the previous session's journal, start a new one and offer recovery after a crash"""
+        path = journal_path()
+        previous = path + ".previous"
+        clean = True
+        try:
+            # An empty journal means the last session never got to save anything
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                os.replace(path, previous)
+            if os.path.exists(previous):
+                state, saved, clean = read_journal(previous)
+                if state.get("variants"):
+                    self._last_session = (state, saved)
+            self.journal = SessionJournal(path)
+        except (OSError, ValueError) as e:
+            self.status_bar.showMessage(f"Autosave unavailable: {str(e)}")
+            return
+        
+        QApplication.instance().aboutToQuit.connect(self._stop_autosave)
+        self.autosave_timer.start()
+        self.restore_session_action.setEnabled(self._last_session is not None)
+        
+        if self._last_session is not None and not clean:
+            answer = QMessageBox.question(
+                self,
+                "Restore Session",
+                f"The last session did not end normally. Restore its prompts, test input and "
+                f"outputs, autosaved at {self._session_time()}?"
+            )
+            if answer == QMessageBox.StandardButton.Yes:
+                self._restore_last_session()
+    
+    def _session_time(self):
+        """Get the autosave time of the last session, for display"""
+        _, saved = self._last_session
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(saved)) if saved else "an unknown time"
+    
+    def _autosave(self):
+        """
+        Hand the texts that changed since the last check to the journal.
+        
+        Changes are detected with the documents' edit counters, so a check
+        without edits copies nothing; the journal writes them off the GUI thread.
+        """
+        # Report a failing journal once, not on every check
+        error = self.journal.error
+        if error is not None and str(error) != self._journal_error:
+            self.status_bar.showMessage(f"Autosave failed: {str(error)}")
+        self._journal_error = str(error) if error is not None else None
+        
+        view = self.comparison_view
+        
+        def changed(key, document):
+            # Not document.revision(): highlighting passes bump it without changing the text
+            revision = (id(document), content_revision(document).revision)
+            if self._journal_revisions.get(key) == revision:
+                return False
+            self._journal_revisions[key] = revision
+            return True
+        
+        if changed("test_input", view.prompt_input.text_editor.document()):
+            self.journal.update("test_input", view.prompt_input.get_input())
+        
+        variants = []
+        for name in view.variants():
+            widgets = view.variant_widgets(name)
+            variants.append({
+                "name": name,
+                "model": widgets["model_picker"].model(),
+                "reasoning_effort": widgets["model_picker"].reasoning_effort(),
+                "history": widgets["editor"].history_key,
+            })
+            if changed(f"{name}/prompt", widgets["editor"].text_editor.document()):
+                self.journal.update(f"{name}/prompt", widgets["editor"].get_prompt())
+            if view.executor.is_busy(name):
+                # Outputs are saved once they have finished streaming
+                continue
+            if changed(f"{name}/output", widgets["output"].output_text.document()):
+                self.journal.update(f"{name}/output", widgets["output"].get_output())
+            loader = widgets["reasoning"].pending_loader()
+            if loader is not None:
+                # Reasoning that hasn't been shown yet is decoded by the journal's thread
+                if self._journal_revisions.get(f"{name}/reasoning") != loader:
+                    self._journal_revisions[f"{name}/reasoning"] = loader
+                    self.journal.update(f"{name}/reasoning", loader)
+            elif changed(f"{name}/reasoning", widgets["reasoning"].reasoning_text.document()):
+                self.journal.update(f"{name}/reasoning", widgets["reasoning"].get_reasoning())
+        self.journal.update("variants", variants)
+    
+    def _stop_autosave(self):
+        """Write the final state and mark the session as ended normally"""
+        if self.journal is None:
+            return
+        self.autosave_timer.stop()
+        self._autosave()
+        self.journal.close(clean=True)
+        self.journal = None
+    
+    def _restore_last_session(self):
+        """Show the prompts, test input and outputs of the previous session"""
+        if self._last_session is None:
+            return
+        state, _ = self._last_session
+        variants = []
+        for entry in state.get("variants", []):
+            variant = dict(entry)
+            for field in ("prompt", "output", "reasoning"):
+                if f"{entry['name']}/{field}" in state:
+                    variant[field] = state[f"{entry['name']}/{field}"]
+            variants.append(variant)
+        data = {"variants": variants}
+        if "test_input" in state:
+            data["test_input"] = state["test_input"]
+        self.apply_prompt_set(data)
+        self.status_bar.showMessage(f"Restored the session autosaved at {self._session_time()}")
+    
     def _show_about(self):
         """Show about dialog"""
         QMessageBox.about(
@@ -0,0 +1,133 @@
+"""
+Metrics Panel Component
+
+This file contains the MetricsPanel widget, a table comparing the timings, token
+usage and estimated cost of the latest request of each side (variant), plus
+running totals for the session.
+
+Dependencies:
+- PyQt6
+- src.helpers.ui_styles: Contains common UI styles
+"""
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView
+from PyQt6.QtCore import Qt
+
+from ..helpers.ui_styles import COLORS, FONTS
+
+
+def _seconds(value):
+    """Format a duration in seconds, or a dash if unknown"""
+    return "-" if value is None else f"{value:.2f}s"
+
+
+# Rows of the table: (label, function formatting the value from RequestMetrics)
+_ROWS = (
+    ("Model", lambda m: m.model or "-"),
+    ("Queue wait", lambda m: _seconds(m.queue_wait)),
+    ("Time to first token", lambda m: _seconds(m.ttft)),
+    ("Total latency", lambda m: _seconds(m.total_latency)),
+    ("Prompt tokens", lambda m: f"{'~' if m.usage_estimated else ''}{m.prompt_tokens}"),
+    ("Completion tokens", lambda m: f"{'~' if m.usage_estimated else ''}{m.completion_tokens}"),
+    ("Reasoning tokens", lambda m: str(m.reasoning_tokens)),
+    ("Estimated cost", lambda m: f"${m.estimated_cost:.4f}"),
+    ("Retries", lambda m: str(m.retries)),
+    ("Cache", lambda m: "hit" if m.cache_hit else "miss"),
+    ("Error", lambda m: m.error or ""),
+)
+
+# Session totals appended below the per-request rows
+_TOTAL_ROWS = ("Session requests", "Session tokens", "Session cost")
+
+
+class MetricsPanel(QWidget):
+    """
+    Widget showing per-request metrics side by side.
+    """
+
+    def __init__(self, sides=("A", "B"), parent=None):
+        """
+        Initialize the metrics panel.
+
+        Args:
+            sides (Iterable[str]): The sides to show a column for
+            parent (QWidget): Parent widget
+        """
+        super().__init__(parent)
+        self._columns = {}
+        self._totals = {}
+        self._init_ui()
+        for side in sides:
+            self._column(side)
+
+    def _init_ui(self):
+        """Set up the UI components"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table = QTableWidget(len(_ROWS) + len(_TOTAL_ROWS), 0)
+        self.table.setVerticalHeaderLabels([label for label, _ in _ROWS] + list(_TOTAL_ROWS))
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setStyleSheet(f"""
+            QTableWidget {{
+                font-size: {FONTS['size_small']}px;
+                color: {COLORS['text_primary']};
+                gridline-color: {COLORS['border']};
+            }}
+        """)
+        layout.addWidget(self.table)
+
+    def _column(self, side):
+        """Get the column of a side, adding it if needed"""
+        if side not in self._columns:
+            column = self.table.columnCount()
+            self.table.insertColumn(column)
+            self.table.setHorizontalHeaderItem(column, QTableWidgetItem(side))
+            self._columns[side] = column
+            self._totals[side] = {"requests": 0, "tokens": 0, "cost": 0.0}
+        return self._columns[side]
+
+    def _set(self, row, column, text):
+        """Set the text of a cell"""
+        item = QTableWidgetItem(text)
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.table.setItem(row, column, item)
+
+    def update_metrics(self, side, metrics):
+        """
+        Show the metrics of a side's latest request and add them to the session totals.
+
+        Args:
+            side (str): The side the request belonged to
+            metrics (RequestMetrics): The request's metrics
+        """
+        column = self._column(side)
+        for row, (_, format_value) in enumerate(_ROWS):
+            self._set(row, column, format_value(metrics))
+
+        totals = self._totals[side]
+        totals["requests"] += 1
+        if not metrics.cache_hit:
+            totals["tokens"] += metrics.prompt_tokens + metrics.completion_tokens
+            totals["cost"] += metrics.estimated_cost
+        base = len(_ROWS)
+        self._set(base, column, str(totals["requests"]))
+        self._set(base + 1, column, str(totals["tokens"]))
+        self._set(base + 2, column, f"${totals['cost']:.4f}")
+
+    def remove_side(self, side):
+        """
+        Remove the column of a side, e.g. when its variant is removed.
+
+        Args:
+            side (str): The side to remove
+        """
+        column = self._columns.pop(side, None)
+        if column is None:
+            return
+        self._totals.pop(side)
+        self.table.removeColumn(column)
+        for other, index in self._columns.items():
+            if index > column:
+                self._columns[other] = index - 1
@@ -0,0 +1,139 @@
+"""
+Model Picker Component
+
+This file contains the ModelPicker widget, a compact pair of drop-downs for choosing
+the model (and, for reasoning models, the reasoning effort) used by one side of the
+comparison.
+
+Dependencies:
+- PyQt6
+- src.helpers.model_selector: Contains the model registry
+- src.helpers.ui_styles: Contains common UI styles
+"""
+
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QComboBox
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from ..helpers.model_selector import (
+    DEFAULT_MODEL, REASONING_EFFORTS, list_models, get_model, describe_model
+)
+from ..helpers.ui_styles import COLORS, FONTS, LAYOUT
+
+
+class ModelPicker(QWidget):
+    """
+    Widget for choosing a model and reasoning effort.
+
+    Signals:
+        model_changed: Emitted with the model name when the selection changes
+    """
+
+    model_changed = pyqtSignal(str)
+
+    def __init__(self, model=DEFAULT_MODEL, parent=None):
+        """
+        Initialize the model picker.
+
+        Args:
+            model (str): The initially selected model
+            parent (QWidget): Parent widget
+        """
+        super().__init__(parent)
+        self._init_ui()
+        self.set_model(model)
+
+    def _init_ui(self):
+        """Set up the UI components"""
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(LAYOUT["spacing"])
+
+        combo_style = f"""
+            QComboBox {{
+                font-size: {FONTS['size_small']}px;
+                color: {COLORS['text_primary']};
+                border: 1px solid {COLORS['secondary_button_border']};
+                border-radius: {LAYOUT['border_radius_small']}px;
+                padding: 1px 4px;
+            }}
+        """
+
+        self.model_combo = QComboBox()
+        self.model_combo.setStyleSheet(combo_style)
+        for name in list_models():
+            self.model_combo.addItem(get_model(name)["label"], name)
+            self.model_combo.setItemData(
+                self.model_combo.count() - 1, describe_model(name), Qt.ItemDataRole.ToolTipRole
+            )
+        self.model_combo.currentIndexChanged.connect(self._on_model_changed)
+
+        self.effort_combo = QComboBox()
+        self.effort_combo.setStyleSheet(combo_style)
+        self.effort_combo.setToolTip("Reasoning effort")
+        self.effort_combo.addItems(REASONING_EFFORTS)
+
+        layout.addWidget(self.model_combo)
+        layout.addWidget(self.effort_combo)
+
+    def model(self):
+        """
+        Get the selected model.
+
+        Returns:
+            str: The model name
+        """
+        return self.model_combo.currentData()
+
+    def set_model(self, name):
+        """
+        Select a model.
+
+        Args:
+            name (str): The model name
+        """
+        index = self.model_combo.findData(name)
+        if index >= 0:
+            # Updated below, so model_changed is emitted once
+            self.model_combo.blockSignals(True)
+            self.model_combo.setCurrentIndex(index)
+            self.model_combo.blockSignals(False)
+        self._on_model_changed()
+
+    def reasoning_effort(self):
+        """
+        Get the selected reasoning effort.
+
+        Returns:
+            str | None: The effort, or None if the model doesn't reason
+        """
+        if not get_model(self.model())["reasoning"]:
+            return None
+        return self.effort_combo.currentText()
+
+    def set_reasoning_effort(self, effort):
+        """
+        Select a reasoning effort; ignored for models that don't reason.
+
+        Args:
+            effort (str): "low", "medium" or "high"
+        """
+        if get_model(self.model())["reasoning"] and effort in REASONING_EFFORTS:
+            self.effort_combo.setCurrentText(effort)
+
+    def request_options(self):
+        """
+        Get the generation options for the current selection.
+
+        Returns:
+            dict: Keyword arguments for generate_prompt/generate_prompt_stream
+        """
+        return {"model": self.model(), "reasoning_effort": self.reasoning_effort()}
+
+    def _on_model_changed(self, *_):
+        """Show the effort selector only for reasoning models and notify listeners"""
+        model = get_model(self.model())
+        self.model_combo.setToolTip(describe_model(self.model()))
+        if model["reasoning"]:
+            self.effort_combo.setCurrentText(model["default_reasoning_effort"])
+        self.effort_combo.setVisible(model["reasoning"])
+        self.model_changed.emit(self.model())
@@ -6,34 +6,40 @@ for displaying generated outputs from meta prompts.
 
 Dependencies:
 - PyQt6
+- src.helpers.deferred_highlighting: Defers highlighting of large documents
 - src.helpers.syntax_highlighter: Contains the syntax highlighter for the display
+- src.helpers.stream_buffer: Batches streamed chunks into periodic appends
 - src.helpers.ui_styles: Contains common UI styles
 """
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QTextEdit, 
+    QWidget, QVBoxLayout, QPlainTextEdit, 
     QLabel, QHBoxLayout, QPushButton,
     QFrame, QSizePolicy, QToolButton
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QGuiApplication, QFont
 from ..helpers.syntax_highlighter import PromptSyntaxHighlighter
+from ..helpers.deferred_highlighting import DeferredHighlighter, DEFERRED_HIGHLIGHT_LINES
+from ..helpers.stream_buffer import StreamBuffer
 from ..helpers.ui_styles import STYLES, COLORS, FONTS, LAYOUT
 
 
 class OutputDisplay(QWidget):
     """Widget for displaying generated output text in a read-only format"""
     
-    def __init__(self, title="Generated Output", parent=None):
+    def __init__(self, title="Generated Output", parent=None, highlight_threshold=DEFERRED_HIGHLIGHT_LINES):
         """
         Initialize the output display.
         
         Args:
             title (str): Title for the display
             parent (QWidget): Parent widget
+            highlight_threshold (int): Line count from which highlighting is deferred
         """
         super().__init__(parent)
         self.title = title
+        self.highlight_threshold = highlight_threshold
         self._init_ui()
         
     def _init_ui(self):
@@ -52,8 +58,8 @@ class OutputDisplay(QWidget):
         header_layout.setContentsMargins(5, 0, 5, 0)  # Minimal horizontal padding only
         
         # Title label with smaller font
-        title_label = QLabel(self.title)
-        title_label.setStyleSheet(f"font-weight: 600; font-size: {FONTS['size_small']}px; color: {COLORS['text_primary']};")
+        self.title_label = QLabel(self.title)
+        self.title_label.setStyleSheet(f"font-weight: 600; font-size: {FONTS['size_small']}px; color: {COLORS['text_primary']};")
         
         # Action buttons in the header - more compact
         self.copy_button = QToolButton()
@@ -100,13 +106,14 @@ class OutputDisplay(QWidget):
         self.clear_button.clicked.connect(self._clear_output)
         self.clear_button.setEnabled(False)
         
-        header_layout.addWidget(title_label)
+        header_layout.addWidget(self.title_label)
         header_layout.addStretch()
         header_layout.addWidget(self.copy_button)
         header_layout.addWidget(self.clear_button)
         
         # Output display with improved styling
-        self.output_text = QTextEdit()
+        # Plain text edit: lays out large outputs far faster than QTextEdit
+        self.output_text = QPlainTextEdit()
         self.output_text.setReadOnly(True)
         self.output_text.setPlaceholderText("Generated output will appear here...")
         
@@ -121,7 +128,7 @@ class OutputDisplay(QWidget):
         
         # Set output styling with tight padding for more content area
         self.output_text.setStyleSheet(f"""
-            QTextEdit {{
+            QPlainTextEdit {{
                 background-color: {COLORS["background"]};
                 border: 1px solid {COLORS["border"]};
                 border-top: none;
@@ -136,10 +143,28 @@ class OutputDisplay(QWidget):
         # Apply syntax highlighting
         self.highlighter = PromptSyntaxHighlighter(self.output_text.document())
         
+        # Large documents are highlighted viewport-first, then in idle-time chunks
+        self.deferred_highlighter = DeferredHighlighter(
+            self.output_text, self.highlighter, self.highlight_threshold
+        )
+        
+        # Batches streamed chunks so the display repaints at most once per tick
+        self.stream_buffer = StreamBuffer(self.output_text)
+        
         # Add widgets to main layout
         layout.addWidget(header)
         layout.addWidget(self.output_text, 1)  # Give the output text a stretch factor of 1
         
+    def set_title(self, title):
+        """
+        Set the title shown in the header.
+        
+        Args:
+            title (str): The title
+        """
+        self.title = title
+        self.title_label.setText(title)
+    
     def set_output(self, text):
         """
         Set the output text.
@@ -147,9 +172,30 @@ class OutputDisplay(QWidget):
         Args:
             text (str): The text to display
         """
-        self.output_text.setPlainText(text)
+        self.stream_buffer.discard()
+        self.deferred_highlighter.set_text(text)
         self.copy_button.setEnabled(bool(text))
         self.clear_button.setEnabled(bool(text))
+    
+    def begin_stream(self):
+        """Clear the display in preparation for streamed output"""
+        self.set_output("")
+    
+    def append_chunk(self, text):
+        """
+        Append a streamed chunk of output; the display is updated in batches.
+        
+        Args:
+            text (str): The chunk to append
+        """
+        self.stream_buffer.append(text)
+    
+    def end_stream(self):
+        """Write any buffered chunks and finish the stream"""
+        self.stream_buffer.flush()
+        has_text = not self.output_text.document().isEmpty()
+        self.copy_button.setEnabled(has_text)
+        self.clear_button.setEnabled(has_text)
         
     def get_output(self):
         """
@@ -169,6 +215,7 @@ class OutputDisplay(QWidget):
     
     def _clear_output(self):
         """Clear the output text"""
+        self.stream_buffer.discard()
         self.output_text.clear()
         self.copy_button.setEnabled(False)
         self.clear_button.setEnabled(False) 
\ No newline at end of file
@@ -2,13 +2,19 @@
 Prompt Editor Component
 
 This file contains the PromptEditor widget, which provides a text editing area 
-for modifying meta prompts with the ability to reset to default.
+for modifying meta prompts with the ability to reset to default and to browse
+and restore earlier revisions.
 
 Dependencies:
 - PyQt6
 - src.prompts.default_meta_prompt: Contains the default meta prompt
+- src.helpers.change_notifier: Coalesces text change notifications
+- src.helpers.deferred_highlighting: Defers highlighting of large documents
 - src.helpers.syntax_highlighter: Contains the syntax highlighter for the editor
+- src.helpers.token_counter: Counts tokens and the context budget of requests
 - src.helpers.ui_styles: Contains common UI styles
+- src.service.prompt_history: Contains the prompt history (imported on first use)
+- src.ui.history_dialog: Contains the HistoryDialog (imported on first use)
 """
 
 from PyQt6.QtWidgets import (
@@ -21,6 +27,9 @@ from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QFont, QColor, QPalette
 from ..prompts.default_meta_prompt import META_PROMPT
 from ..helpers.syntax_highlighter import PromptSyntaxHighlighter
+from ..helpers.change_notifier import DebouncedTextNotifier
+from ..helpers.deferred_highlighting import DeferredHighlighter, DEFERRED_HIGHLIGHT_LINES
+from ..helpers.token_counter import count_tokens, describe_budget
 from ..helpers.ui_styles import STYLES, COLORS, FONTS, LAYOUT
 
 
@@ -29,21 +38,32 @@ class PromptEditor(QWidget):
     Widget for editing meta prompts with default text and reset functionality.
     
     Signals:
-        prompt_changed: Emitted when the prompt text changes
+        prompt_changed: Emitted with the prompt text once typing pauses
+        revision_changed: Emitted with a revision counter on every edit, without copying the text
+        tokens_changed: Emitted with the token count once typing pauses
     """
     
     prompt_changed = pyqtSignal(str)
+    revision_changed = pyqtSignal(int)
+    tokens_changed = pyqtSignal(int)
     
-    def __init__(self, title="Meta Prompt", parent=None):
+    def __init__(self, title="Meta Prompt", parent=None, highlight_threshold=DEFERRED_HIGHLIGHT_LINES):
         """
         Initialize the prompt editor with default text.
         
         Args:
             title (str): Title for the editor
             parent (QWidget): Parent widget
+            highlight_threshold (int): Line count from which highlighting is deferred
         """
         super().__init__(parent)
         self.title = title
+        self.highlight_threshold = highlight_threshold
+        self.history_key = None
+        self._history_base = None
+        self._history_revision = 0
+        self._token_count = 0
+        self._token_revision = None
         self._init_ui()
         
     def _init_ui(self):
@@ -62,8 +82,8 @@ class PromptEditor(QWidget):
         header_layout.setContentsMargins(5, 0, 5, 0)  # Minimal horizontal padding only
         
         # Title label with smaller font
-        title_label = QLabel(self.title)
-        title_label.setStyleSheet(f"font-weight: 600; font-size: {FONTS['size_small']}px; color: {COLORS['text_primary']};")
+        self.title_label = QLabel(self.title)
+        self.title_label.setStyleSheet(f"font-weight: 600; font-size: {FONTS['size_small']}px; color: {COLORS['text_primary']};")
         
         # Reset button as a small tool button for less space usage
         self.reset_button = QToolButton()
@@ -84,14 +104,32 @@ class PromptEditor(QWidget):
         """)
         self.reset_button.clicked.connect(self._reset_to_default)
         
-        header_layout.addWidget(title_label)
+        # History button, shown once the editor has a history
+        self.history_button = QToolButton()
+        self.history_button.setText("History")
+        self.history_button.setToolTip("Browse and restore earlier revisions of this prompt")
+        self.history_button.setStyleSheet(self.reset_button.styleSheet())
+        self.history_button.clicked.connect(self._show_history)
+        self.history_button.hide()
+        
+        # Token count and remaining context, filled in by show_token_budget
+        self.token_label = QLabel()
+        self.token_label.setStyleSheet(f"font-size: {FONTS['size_small']}px; color: {COLORS['text_secondary']};")
+        
+        header_layout.addWidget(self.title_label)
         header_layout.addStretch()
+        header_layout.addWidget(self.token_label)
+        header_layout.addWidget(self.history_button)
         header_layout.addWidget(self.reset_button)
         
         # Text editor with improved styling
         self.text_editor = QPlainTextEdit()
         self.text_editor.setPlainText(META_PROMPT)
-        self.text_editor.textChanged.connect(self._on_text_changed)
+        
+        # Only bump a revision per keystroke; build the text once typing pauses
+        self.change_notifier = DebouncedTextNotifier(self.text_editor)
+        self.change_notifier.revision_changed.connect(self.revision_changed)
+        self.change_notifier.text_settled.connect(self._on_text_changed)
         
         # Set font and styling for editor
         editor_font = QFont(FONTS["monospace"], FONTS["size_normal"])
@@ -120,6 +158,11 @@ class PromptEditor(QWidget):
         # Apply syntax highlighting
         self.highlighter = PromptSyntaxHighlighter(self.text_editor.document())
         
+        # Large documents are highlighted viewport-first, then in idle-time chunks
+        self.deferred_highlighter = DeferredHighlighter(
+            self.text_editor, self.highlighter, self.highlight_threshold
+        )
+        
         # Add widgets to main layout
         layout.addWidget(header)
         layout.addWidget(self.text_editor, 1)  # Give the editor a stretch factor of 1
@@ -133,19 +176,117 @@ class PromptEditor(QWidget):
         """
         return self.text_editor.toPlainText()
     
+    def set_title(self, title):
+        """
+        Set the title shown in the header.
+        
+        Args:
+            title (str): The title
+        """
+        self.title = title
+        self.title_label.setText(title)
+    
     def set_prompt(self, text):
         """
         Set the prompt text.
         
+        Only edits are recorded in the prompt history: the text set here is
+        recorded as the base of the next edit, not as a revision of its own.
+        
         Args:
             text (str): The text to set
         """
-        self.text_editor.setPlainText(text)
+        # Record the edits still waiting for the typing pause first
+        self.flush_changes()
+        self.deferred_highlighter.set_text(text)
+        self.set_history_key(self.history_key)
     
     def _reset_to_default(self):
         """Reset the editor to the default meta prompt"""
-        self.text_editor.setPlainText(META_PROMPT)
+        self.set_prompt(META_PROMPT)
+    
+    def revision(self):
+        """
+        Get the revision counter of the prompt text.
+        
+        Returns:
+            int: A counter that increases with every edit
+        """
+        return self.change_notifier.revision
+    
+    def flush_changes(self):
+        """Emit prompt_changed now if there are edits it hasn't reported yet"""
+        self.change_notifier.flush()
+    
+    def token_count(self):
+        """
+        Get the token count of the prompt text, counting it if it changed since the last count.
+        
+        Returns:
+            int: The number of tokens
+        """
+        if self._token_revision != self.revision():
+            self._token_count = count_tokens(self.get_prompt())
+            self._token_revision = self.revision()
+        return self._token_count
+    
+    def reset_token_count(self):
+        """Count the tokens again on the next token_count call, e.g. once counts are exact"""
+        self._token_revision = None
+    
+    def show_token_budget(self, budget):
+        """
+        Show the token count and the remaining context in the header.
+        
+        Args:
+            budget (dict): Budget of the request, from src.helpers.token_counter.request_budget
+        """
+        label, tooltip = describe_budget(self.token_count(), budget)
+        color = {"ok": COLORS["text_secondary"], "low": COLORS["warning"], "over": COLORS["error"]}[budget["level"]]
+        self.token_label.setText(label)
+        self.token_label.setToolTip(tooltip)
+        self.token_label.setStyleSheet(f"font-size: {FONTS['size_small']}px; color: {color};")
+    
+    def set_history_key(self, key):
+        """
+        Record the revisions of this editor in the prompt history.
+        
+        Args:
+            key (str | None): The history to record to (see src.service.prompt_history.history_key),
+                or None to stop recording
+        """
+        self.history_key = key
+        # The current text is where the history starts from; it is recorded with the
+        # first later edit, so the history isn't opened at start-up, and edits made
+        # before the key changed aren't recorded under it
+        self._history_base = self.get_prompt() if key else None
+        self._history_revision = self.revision()
+        self.history_button.setVisible(key is not None)
+    
+    def _record_revision(self, text):
+        """Queue a settled text to be recorded in the prompt history off the GUI thread"""
+        from ..service.prompt_history import get_history
+        history = get_history()
+        if self._history_base is not None:
+            history.record_later(self.history_key, self._history_base)
+            self._history_base = None
+        history.record_later(self.history_key, text)
+    
+    def _show_history(self):
+        """Show the revisions of this editor and restore the chosen one"""
+        from ..service.prompt_history import get_history
+        from .history_dialog import HistoryDialog
+        self.flush_changes()
+        get_history().flush()
+        dialog = HistoryDialog(get_history(), self.history_key, f"{self.title} History", self)
+        if dialog.exec() and dialog.selected_text is not None:
+            self.set_prompt(dialog.selected_text)
     
-    def _on_text_changed(self):
-        """Handle text changes and emit signal"""
-        self.prompt_changed.emit(self.get_prompt()) 
\ No newline at end of file
+    def _on_text_changed(self, text, revision):
+        """Handle settled text changes and emit signal"""
+        if self.history_key is not None and revision > self._history_revision:
+            self._record_revision(text)
+        self._token_count = count_tokens(text)
+        self._token_revision = revision
+        self.prompt_changed.emit(text)
+        self.tokens_changed.emit(self._token_count) 
\ No newline at end of file
@@ -6,6 +6,8 @@ test input that can be used with the meta prompts.
 
 Dependencies:
 - PyQt6
+- src.helpers.change_notifier: Coalesces text change notifications
+- src.helpers.token_counter: Counts tokens and the context budget of requests
 - src.helpers.ui_styles: Contains common UI styles
 """
 
@@ -17,6 +19,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QFont
+from ..helpers.change_notifier import DebouncedTextNotifier
+from ..helpers.token_counter import count_tokens, describe_budget
 from ..helpers.ui_styles import STYLES, COLORS, FONTS, LAYOUT
 
 
@@ -25,10 +29,14 @@ class PromptInput(QWidget):
     Widget for entering test input to be used with meta prompts.
     
     Signals:
-        input_changed: Emitted when the input text changes
+        input_changed: Emitted with the input text once typing pauses
+        revision_changed: Emitted with a revision counter on every edit, without copying the text
+        tokens_changed: Emitted with the token count once typing pauses
     """
     
     input_changed = pyqtSignal(str)
+    revision_changed = pyqtSignal(int)
+    tokens_changed = pyqtSignal(int)
     
     def __init__(self, compact=False, parent=None):
         """
@@ -40,6 +48,8 @@ class PromptInput(QWidget):
         """
         super().__init__(parent)
         self.compact = compact
+        self._token_count = 0
+        self._token_revision = None
         self._init_ui()
         
     def _init_ui(self):
@@ -60,7 +70,6 @@ class PromptInput(QWidget):
             # Text editor with minimal height
             self.text_editor = QPlainTextEdit()
             self.text_editor.setPlaceholderText("Enter test input here...")
-            self.text_editor.textChanged.connect(self._on_text_changed)
             self.text_editor.setMaximumHeight(24)  # Even smaller height
             self.text_editor.setMinimumHeight(24)  # Fixed height
             
@@ -117,7 +126,12 @@ class PromptInput(QWidget):
             """)
             self.example_button.clicked.connect(self._load_example)
             
+            # Token count and remaining context, filled in by show_token_budget
+            self.token_label = QLabel()
+            self.token_label.setStyleSheet(f"font-size: {FONTS['size_small']}px; color: {COLORS['text_secondary']};")
+            
             # Add buttons to layout
+            layout.addWidget(self.token_label)
             layout.addWidget(self.clear_button)
             layout.addWidget(self.example_button)
         
@@ -176,15 +190,19 @@ class PromptInput(QWidget):
             """)
             self.example_button.clicked.connect(self._load_example)
             
+            # Token count and remaining context, filled in by show_token_budget
+            self.token_label = QLabel()
+            self.token_label.setStyleSheet(f"font-size: {FONTS['size_small']}px; color: {COLORS['text_secondary']};")
+            
             header_layout.addWidget(title_label)
             header_layout.addStretch()
+            header_layout.addWidget(self.token_label)
             header_layout.addWidget(self.clear_button)
             header_layout.addWidget(self.example_button)
             
             # Text editor
             self.text_editor = QPlainTextEdit()
             self.text_editor.setPlaceholderText("Enter test input here to use with the meta prompts...")
-            self.text_editor.textChanged.connect(self._on_text_changed)
             
             # Set font and styling for editor
             editor_font = QFont(FONTS["monospace"], FONTS["size_normal"])
@@ -209,6 +227,11 @@ class PromptInput(QWidget):
             layout.addWidget(header)
             layout.addWidget(self.text_editor, 1)
         
+        # Only bump a revision per keystroke; build the text once typing pauses
+        self.change_notifier = DebouncedTextNotifier(self.text_editor)
+        self.change_notifier.revision_changed.connect(self.revision_changed)
+        self.change_notifier.text_settled.connect(self._on_text_changed)
+        
     def get_input(self):
         """
         Get the current input text.
@@ -245,6 +268,56 @@ The assistant should:
 The assistant should be friendly, helpful, and focus on making email writing easier and more effective."""
         self.set_input(example_text)
     
-    def _on_text_changed(self):
-        """Handle text changes and emit signal"""
-        self.input_changed.emit(self.get_input())
+    def revision(self):
+        """
+        Get the revision counter of the input text.
+        
+        Returns:
+            int: A counter that increases with every edit
+        """
+        return self.change_notifier.revision
+    
+    def flush_changes(self):
+        """Emit input_changed now if there are edits it hasn't reported yet"""
+        self.change_notifier.flush()
+    
+    def token_count(self):
+        """
+        Get the token count of the input text, counting it if it changed since the last count.
+        
+        Returns:
+            int: The number of tokens; 0 if the input is blank
+        """
+        if self._token_revision != self.revision():
+            self._token_count = self._count(self.get_input())
+            self._token_revision = self.revision()
+        return self._token_count
+    
+    def reset_token_count(self):
+        """Count the tokens again on the next token_count call, e.g. once counts are exact"""
+        self._token_revision = None
+    
+    def show_token_budget(self, budget, variant=None):
+        """
+        Show the token count and the remaining context in the header.
+        
+        Args:
+            budget (dict): Budget of the request, from src.helpers.token_counter.request_budget
+            variant (str, optional): The variant the budget belongs to
+        """
+        label, tooltip = describe_budget(self.token_count(), budget, variant)
+        color = {"ok": COLORS["text_secondary"], "low": COLORS["warning"], "over": COLORS["error"]}[budget["level"]]
+        self.token_label.setText(label)
+        self.token_label.setToolTip(tooltip)
+        self.token_label.setStyleSheet(f"font-size: {FONTS['size_small']}px; color: {color};")
+    
+    def _count(self, text):
+        """Count the tokens of an input; a blank input isn't sent, so it has none"""
+        return count_tokens(text) if text.strip() else 0
+    
+    def _on_text_changed(self, text, revision):
+        """Handle settled text changes and emit signal"""
+        self._token_count = self._count(text)
+        self._token_revision = revision
+        self.input_changed.emit(text)
+        self.tokens_changed.emit(self._token_count)
@@ -6,6 +6,7 @@ for displaying the reasoning section extracted from the meta prompt outputs.
 
 Dependencies:
 - PyQt6
+- src.helpers.stream_buffer: Batches streamed chunks into periodic appends
 - src.helpers.ui_styles: Contains common UI styles
 """
 
@@ -16,6 +17,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QGuiApplication, QFont
+from ..helpers.stream_buffer import StreamBuffer
 from ..helpers.ui_styles import STYLES, COLORS, FONTS, LAYOUT
 
 
@@ -32,6 +34,7 @@ class ReasoningDisplay(QWidget):
         """
         super().__init__(parent)
         self.title = title
+        self._pending_loader = None
         self._init_ui()
         
     def _init_ui(self):
@@ -50,8 +53,8 @@ class ReasoningDisplay(QWidget):
         header_layout.setContentsMargins(5, 0, 5, 0)  # Minimal horizontal padding only
         
         # Title label with smaller font
-        title_label = QLabel(self.title)
-        title_label.setStyleSheet(f"font-weight: 600; font-size: {FONTS['size_small']}px; color: {COLORS['text_primary']};")
+        self.title_label = QLabel(self.title)
+        self.title_label.setStyleSheet(f"font-weight: 600; font-size: {FONTS['size_small']}px; color: {COLORS['text_primary']};")
         
         # Action buttons in the header - more compact
         self.copy_button = QToolButton()
@@ -98,7 +101,7 @@ class ReasoningDisplay(QWidget):
         self.clear_button.clicked.connect(self._clear_reasoning)
         self.clear_button.setEnabled(False)
         
-        header_layout.addWidget(title_label)
+        header_layout.addWidget(self.title_label)
         header_layout.addStretch()
         header_layout.addWidget(self.copy_button)
         header_layout.addWidget(self.clear_button)
@@ -131,10 +134,23 @@ class ReasoningDisplay(QWidget):
         # Make the reasoning expand to fill available space
         self.reasoning_text.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         
+        # Batches streamed chunks so the display repaints at most once per tick
+        self.stream_buffer = StreamBuffer(self.reasoning_text)
+        
         # Add widgets to main layout
         layout.addWidget(header)
         layout.addWidget(self.reasoning_text, 1)  # Give the reasoning text a stretch factor of 1
         
+    def set_title(self, title):
+        """
+        Set the title shown in the header.
+        
+        Args:
+            title (str): The title
+        """
+        self.title = title
+        self.title_label.setText(title)
+    
     def set_reasoning(self, text):
         """
         Set the reasoning text.
@@ -142,9 +158,64 @@ class ReasoningDisplay(QWidget):
         Args:
             text (str): The text to display
         """
+        self._pending_loader = None
+        self.stream_buffer.discard()
         self.reasoning_text.setPlainText(text)
         self.copy_button.setEnabled(bool(text))
         self.clear_button.setEnabled(bool(text))
+    
+    def set_reasoning_loader(self, loader):
+        """
+        Set the reasoning text from a loader that is only called once the display is
+        shown (or its text is asked for), so text in a hidden tab isn't loaded up front.
+        
+        Args:
+            loader (Callable[[], str]): Returns the text to display
+        """
+        self.set_reasoning("")
+        self._pending_loader = loader
+        if self.isVisible():
+            self._load_pending()
+    
+    def pending_loader(self):
+        """
+        Get the loader of reasoning that hasn't been shown yet.
+        
+        Returns:
+            Callable[[], str] | None: The loader set with set_reasoning_loader, until it has run
+        """
+        return self._pending_loader
+    
+    def _load_pending(self):
+        """Load the text of a pending loader, if any"""
+        loader, self._pending_loader = self._pending_loader, None
+        if loader is not None:
+            self.set_reasoning(loader())
+    
+    def showEvent(self, event):
+        """Load deferred reasoning when the display is first shown"""
+        self._load_pending()
+        super().showEvent(event)
+    
+    def begin_stream(self):
+        """Clear the display in preparation for streamed reasoning"""
+        self.set_reasoning("")
+    
+    def append_chunk(self, text):
+        """
+        Append a streamed chunk of reasoning; the display is updated in batches.
+        
+        Args:
+            text (str): The chunk to append
+        """
+        self.stream_buffer.append(text)
+    
+    def end_stream(self):
+        """Write any buffered chunks and finish the stream"""
+        self.stream_buffer.flush()
+        has_text = not self.reasoning_text.document().isEmpty()
+        self.copy_button.setEnabled(has_text)
+        self.clear_button.setEnabled(has_text)
         
     def get_reasoning(self):
         """
@@ -153,6 +224,7 @@ class ReasoningDisplay(QWidget):
         Returns:
             str: The current reasoning text
         """
+        self._load_pending()
         return self.reasoning_text.toPlainText()
     
     def _copy_to_clipboard(self):
@@ -164,6 +236,8 @@ class ReasoningDisplay(QWidget):
     
     def _clear_reasoning(self):
         """Clear the reasoning text"""
+        self._pending_loader = None
+        self.stream_buffer.discard()
         self.reasoning_text.clear()
         self.copy_button.setEnabled(False)
         self.clear_button.setEnabled(False)
\ No newline at end of file
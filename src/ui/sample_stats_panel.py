@@ -0,0 +1,130 @@
+"""
+Sample Stats Panel Component
+
+This file contains the SampleStatsPanel widget, a table comparing the aggregate
+statistics of the latest multi-sample run of each variant: output length
+distribution, latency percentiles across requests, reasoning presence and structural conformance.
+
+Dependencies:
+- PyQt6
+- src.helpers.sample_stats: Contains the structural checks
+- src.helpers.ui_styles: Contains common UI styles
+"""
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView
+from PyQt6.QtCore import Qt
+
+from ..helpers.sample_stats import STRUCTURE_CHECKS
+from ..helpers.ui_styles import COLORS, FONTS
+
+
+def _number(value, unit="", digits=0):
+    """Format a number with a unit, or a dash if unknown"""
+    return "-" if value is None else f"{value:.{digits}f}{unit}"
+
+
+def _percent(value):
+    """Format a fraction as a percentage, or a dash if unknown"""
+    return "-" if value is None else f"{value:.0%}"
+
+
+# Rows of the table: (label, tooltip, function formatting the value from the stats)
+_ROWS = (
+    ("Samples", "Successful / requested samples",
+     lambda s: f"{s['samples'] - s['failed']}/{s['samples']}"),
+    ("Length p10", "Characters of the prompt, without reasoning", lambda s: _number(s["length"]["p10"])),
+    ("Length p50", "Characters of the prompt, without reasoning", lambda s: _number(s["length"]["p50"])),
+    ("Length p90", "Characters of the prompt, without reasoning", lambda s: _number(s["length"]["p90"])),
+    ("Request latency", "Seconds until the single request returning every sample (n) completed",
+     lambda s: _number(s["request_latency"], "s", 2)),
+    ("Latency p50", "Seconds from submission to the complete response, across requests",
+     lambda s: _number(s["latency"]["p50"], "s", 2)),
+    ("Latency p90", "Seconds from submission to the complete response, across requests",
+     lambda s: _number(s["latency"]["p90"], "s", 2)),
+    ("Latency p99", "Seconds from submission to the complete response, across requests",
+     lambda s: _number(s["latency"]["p99"], "s", 2)),
+    ("Reasoning present", "Share of samples with a <reasoning> section", lambda s: _percent(s["reasoning_rate"])),
+    ("Conformance", "Share of samples passing every structure check", lambda s: _percent(s["conformance_rate"])),
+) + tuple(
+    (f"  {description}", "Share of samples passing this check",
+     lambda s, name=name: _percent(s["check_rates"][name]))
+    for name, (description, _) in STRUCTURE_CHECKS.items()
+) + (
+    ("Estimated cost", "Total estimated cost of the run", lambda s: f"${s['cost']:.4f}"),
+)
+
+
+class SampleStatsPanel(QWidget):
+    """
+    Widget showing the sample statistics of each variant side by side.
+    """
+
+    def __init__(self, parent=None):
+        """
+        Initialize the sample stats panel.
+
+        Args:
+            parent (QWidget): Parent widget
+        """
+        super().__init__(parent)
+        self._columns = {}
+        self._init_ui()
+
+    def _init_ui(self):
+        """Set up the UI components"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table = QTableWidget(len(_ROWS), 0)
+        for row, (label, tooltip, _) in enumerate(_ROWS):
+            item = QTableWidgetItem(label)
+            item.setToolTip(tooltip)
+            self.table.setVerticalHeaderItem(row, item)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setStyleSheet(f"""
+            QTableWidget {{
+                font-size: {FONTS['size_small']}px;
+                color: {COLORS['text_primary']};
+                gridline-color: {COLORS['border']};
+            }}
+        """)
+        layout.addWidget(self.table)
+
+    def _column(self, side):
+        """Get the column of a side, adding it if needed"""
+        if side not in self._columns:
+            column = self.table.columnCount()
+            self.table.insertColumn(column)
+            self.table.setHorizontalHeaderItem(column, QTableWidgetItem(side))
+            self._columns[side] = column
+        return self._columns[side]
+
+    def update_stats(self, side, stats):
+        """
+        Show the stats of a side's latest sampling run.
+
+        Args:
+            side (str): The side the samples belong to
+            stats (dict): Stats from src.helpers.sample_stats.summarize_samples
+        """
+        column = self._column(side)
+        for row, (_, _, format_value) in enumerate(_ROWS):
+            item = QTableWidgetItem(format_value(stats))
+            item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            self.table.setItem(row, column, item)
+
+    def remove_side(self, side):
+        """
+        Remove the column of a side, e.g. when its variant is removed.
+
+        Args:
+            side (str): The side to remove
+        """
+        column = self._columns.pop(side, None)
+        if column is None:
+            return
+        self.table.removeColumn(column)
+        for other, index in self._columns.items():
+            if index > column:
+                self._columns[other] = index - 1
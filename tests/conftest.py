@@ -0,0 +1,61 @@
+"""
+Shared test setup: makes the src package importable when pytest is run from any
+directory, keeps the tests away from the user's data files, and provides the
+QApplication of the UI tests.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The prompt history, library, autosave journal and response cache of the tests
+_DATA_DIR = tempfile.mkdtemp(prefix="meta-prompt-tests-")
+os.environ["META_PROMPT_HISTORY"] = os.path.join(_DATA_DIR, "history.sqlite3")
+os.environ["META_PROMPT_LIBRARY"] = os.path.join(_DATA_DIR, "library.sqlite3")
+os.environ["META_PROMPT_JOURNAL"] = os.path.join(_DATA_DIR, "session.journal")
+os.environ["META_PROMPT_CACHE_DIR"] = os.path.join(_DATA_DIR, "responses")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Remove the tests' data files"""
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The QApplication of the UI tests, on the offscreen platform"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([sys.argv[0]])
+
+
+def wait_until(condition, timeout=5.0):
+    """Process Qt events until condition() is true; returns its last value"""
+    from PyQt6.QtWidgets import QApplication
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+# Backend name the mock_server fixture registers its server under
+MOCK_BACKEND = "test-mock"
+
+
+@pytest.fixture
+def mock_server():
+    """A fresh in-process mock server, registered as the MOCK_BACKEND backend"""
+    from src.service.backends import register_backend
+    from src.service.mock_server import start_mock_server
+    server = start_mock_server(port=0, response_tokens=40)
+    register_backend(MOCK_BACKEND, server.base_url, api_key="test", label="Test mock server")
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from conftest import MOCK_BACKEND
+from src.service import batch_runner
+
+
+def test_batch_writes_every_result_against_the_mock_server(tmp_path, mock_server):
+    output = tmp_path / "results.jsonl"
+    inputs = [{"id": str(i), "input": f"input {i}"} for i in range(6)]
+    summary = batch_runner.run_batch(inputs, {"a": "Meta A", "b": "Meta B"}, str(output),
+                                     concurrency=3, use_cache=False, backend=MOCK_BACKEND)
+
+    results = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert summary["requests"] == 12 and summary["failed"] == 0
+    assert len(results) == 12
+    assert {(r["input_id"], r["meta_prompt"]) for r in results} == {
+        (str(i), name) for i in range(6) for name in ("a", "b")}
+    assert all(r["output"] and "error" not in r for r in results)
+
+
+def test_batch_keeps_at_most_concurrency_requests_in_flight(tmp_path, monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def fake_generate(meta_prompt, test_input, **kwargs):
+        in_flight.append(test_input)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(test_input)
+        return f"output for {test_input}"
+
+    monkeypatch.setattr(batch_runner, "agenerate_prompt", fake_generate)
+    seen = []
+    inputs = [{"id": str(i), "input": f"input {i}"} for i in range(20)]
+    summary = batch_runner.run_batch(inputs, {"meta": "Meta"}, str(tmp_path / "out.jsonl"),
+                                     concurrency=4, on_result=seen.append)
+
+    assert summary["requests"] == 20 and summary["failed"] == 0
+    assert len(seen) == 20
+    assert max(peak) == 4
+
+
+def test_failed_request_is_recorded_and_the_batch_continues(tmp_path, monkeypatch):
+    async def fake_generate(meta_prompt, test_input, **kwargs):
+        if test_input == "input 1":
+            raise RuntimeError("boom")
+        return "<reasoning>why</reasoning>answer"
+
+    monkeypatch.setattr(batch_runner, "agenerate_prompt", fake_generate)
+    output = tmp_path / "out.jsonl"
+    inputs = [{"id": str(i), "input": f"input {i}"} for i in range(3)]
+    summary = batch_runner.run_batch(inputs, {"meta": "Meta"}, str(output))
+
+    results = {r["input_id"]: r for r in map(json.loads, output.read_text(encoding="utf-8").splitlines())}
+    assert summary["failed"] == 1
+    assert results["1"]["error"] == "boom"
+    assert results["0"]["output"] == "answer" and results["0"]["reasoning"] == "why"
@@ -0,0 +1,78 @@
+"""
+Tests for the debounced change notifications of the editors.
+"""
+
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QPlainTextEdit
+
+from conftest import wait_until
+from src.helpers.change_notifier import DebouncedTextNotifier, content_revision
+from src.helpers.syntax_highlighter import PromptSyntaxHighlighter
+
+
+def _notifier(qapp, delay_ms=10000):
+    editor = QPlainTextEdit()
+    PromptSyntaxHighlighter(editor.document())
+    notifier = DebouncedTextNotifier(editor, delay_ms)
+    settled = []
+    notifier.text_settled.connect(lambda text, revision: settled.append((text, revision)))
+    return editor, notifier, settled
+
+
+def test_loading_a_highlighted_prompt_is_one_revision(qapp):
+    from src.ui.prompt_editor import PromptEditor
+    editor = PromptEditor("A")
+    editor.flush_changes()
+    revisions = []
+    editor.revision_changed.connect(revisions.append)
+    start = editor.revision()
+
+    # Large enough for the deferred highlighter to format it in chunks afterwards
+    editor.set_prompt("# Title\n{var} **bold** <tag>\n" * 2500)
+    assert wait_until(lambda: not editor.deferred_highlighter.is_pending(), 30.0)
+    assert editor.revision() == start + 1
+    assert revisions == [start + 1]
+
+
+def test_edits_count_once_per_edit_block(qapp):
+    editor, notifier, _ = _notifier(qapp)
+    editor.setPlainText("hello world")
+    assert notifier.revision == 1
+    cursor = editor.textCursor()
+    cursor.setPosition(0)
+    cursor.setPosition(5, QTextCursor.MoveMode.KeepAnchor)
+    cursor.insertText("HELLO")
+    assert notifier.revision == 2
+    cursor.insertText("!")
+    assert notifier.revision == 3
+    # Reformatting without changing the text is not an edit
+    editor.document().markContentsDirty(0, 5)
+    assert notifier.revision == 3
+
+
+def test_text_is_delivered_once_typing_pauses(qapp):
+    editor, notifier, settled = _notifier(qapp, delay_ms=20)
+    for char in "typing":
+        editor.insertPlainText(char)
+    assert notifier.is_pending()
+    assert settled == []
+    assert wait_until(lambda: settled)
+    assert settled == [("typing", 6)]
+    assert not notifier.is_pending()
+
+
+def test_flush_delivers_pending_changes_now(qapp):
+    editor, notifier, settled = _notifier(qapp)
+    notifier.flush()
+    assert settled == []
+    editor.setPlainText("now")
+    notifier.flush()
+    notifier.flush()
+    assert settled == [("now", 1)]
+
+
+def test_counter_is_shared_by_the_users_of_a_document(qapp):
+    editor, notifier, _ = _notifier(qapp)
+    assert content_revision(editor.document()) is content_revision(editor.document())
+    editor.setPlainText("shared")
+    assert content_revision(editor.document()).revision == notifier.revision == 1
@@ -0,0 +1,60 @@
+import pytest
+
+from conftest import MOCK_BACKEND
+from src.service.async_generation import agenerate_prompt
+from src.service.async_runtime import run_sync
+from src.service.caption_creator import generate_prompt_stream
+from src.service.request_metrics import RequestMetrics
+
+
+def test_agenerate_prompt_returns_the_response_and_records_metrics(mock_server):
+    metrics = RequestMetrics()
+    output = run_sync(agenerate_prompt("Meta", "input", use_cache=False, backend=MOCK_BACKEND, metrics=metrics))
+
+    assert output and "<reasoning>" in output
+    assert mock_server.requests == 1
+    assert metrics.error is None and not metrics.cache_hit
+    assert metrics.backend == MOCK_BACKEND and metrics.attempts == 1
+    assert metrics.prompt_tokens > 0 and metrics.completion_tokens > 0
+    assert metrics.total_latency is not None
+
+
+def test_identical_request_is_served_from_the_cache(mock_server):
+    first = run_sync(agenerate_prompt("Meta", "cached input", backend=MOCK_BACKEND))
+    metrics = RequestMetrics()
+    second = run_sync(agenerate_prompt("Meta", "cached input", backend=MOCK_BACKEND, metrics=metrics))
+
+    assert second == first
+    assert metrics.cache_hit and metrics.estimated_cost == 0.0
+    assert mock_server.requests == 1
+
+
+def test_stream_yields_the_same_text_in_chunks(mock_server):
+    full = run_sync(agenerate_prompt("Meta", "stream input", use_cache=False, backend=MOCK_BACKEND))
+    metrics = RequestMetrics()
+    chunks = list(generate_prompt_stream("Meta", "stream input", use_cache=False, backend=MOCK_BACKEND,
+                                         metrics=metrics))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == full
+    assert metrics.ttft is not None and metrics.ttft <= metrics.total_latency
+
+
+def test_client_is_usable_after_a_stream_is_closed_early(mock_server):
+    mock_server.tokens_per_sec = 50
+    stream = generate_prompt_stream("Meta", "abandoned", use_cache=False, backend=MOCK_BACKEND)
+    first = next(stream)
+    stream.close()
+
+    assert first
+    mock_server.tokens_per_sec = 0
+    assert run_sync(agenerate_prompt("Meta", "next", use_cache=False, backend=MOCK_BACKEND, timeout=5))
+
+
+def test_server_error_is_raised(mock_server):
+    mock_server.error_rate = 1.0
+    mock_server.error_status = 400
+    metrics = RequestMetrics()
+    with pytest.raises(Exception):
+        run_sync(agenerate_prompt("Meta", "input", use_cache=False, backend=MOCK_BACKEND, metrics=metrics))
+    assert metrics.error
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+import pytest
+
+from conftest import MOCK_BACKEND, wait_until
+from src.service import generation_executor
+from src.service.generation_executor import GenerationExecutor
+
+
+@pytest.fixture
+def executor(qapp):
+    executor = GenerationExecutor()
+    events = []
+    for name in ("started", "chunk", "finished", "failed", "cancelled", "busy_changed", "samples_finished"):
+        getattr(executor, name).connect(lambda *args, name=name: events.append((name,) + args))
+    executor.events = events
+    yield executor
+    executor.deleteLater()
+
+
+def _events(executor, name):
+    return [event[1:] for event in executor.events if event[0] == name]
+
+
+def test_streamed_request_delivers_chunks_and_result(executor, mock_server):
+    executor.submit("A", "Meta", "input", backend=MOCK_BACKEND, use_cache=False)
+    assert executor.is_busy("A")
+    assert wait_until(lambda: _events(executor, "finished"))
+
+    (side, output), = _events(executor, "finished")
+    chunks = [text for chunk_side, text in _events(executor, "chunk")]
+    assert side == "A" and output and output == "".join(chunks)
+    assert _events(executor, "busy_changed") == [("A", True), ("A", False)]
+    assert not executor.is_busy("A")
+
+
+def test_sides_run_concurrently_and_are_tracked_separately(executor, mock_server):
+    mock_server.latency = 0.2
+    executor.submit_all({side: ("Meta", f"input {side}", {"backend": MOCK_BACKEND, "use_cache": False})
+                         for side in ("A", "B")})
+    assert executor.is_busy("A") and executor.is_busy("B")
+    assert wait_until(lambda: len(_events(executor, "finished")) == 2)
+    assert {side for side, output in _events(executor, "finished")} == {"A", "B"}
+    assert not executor.is_busy("A") and not executor.is_busy("B")
+
+
+def test_cancel_closes_the_stream_immediately(executor, monkeypatch):
+    started = threading.Event()
+    closed = threading.Event()
+
+    async def endless_stream(*args, **kwargs):
+        try:
+            yield "first"
+            started.set()
+            await asyncio.sleep(60)
+            yield "never"
+        finally:
+            closed.set()
+
+    monkeypatch.setattr(generation_executor, "agenerate_prompt_stream", endless_stream)
+    executor.submit("A", "Meta", "input")
+    assert started.wait(5)
+
+    executor.cancel("A")
+    assert closed.wait(1)
+    assert not executor.is_busy("A")
+    assert _events(executor, "cancelled") == [("A",)]
+    wait_until(lambda: False, timeout=0.1)
+    assert not _events(executor, "finished") and not _events(executor, "failed")
+
+
+def test_submitting_again_supersedes_the_request_in_flight(executor, mock_server):
+    mock_server.latency = 0.3
+    executor.submit("A", "Meta", "first", backend=MOCK_BACKEND, use_cache=False)
+    mock_server.latency = 0.0
+    executor.submit("A", "Meta", "second", backend=MOCK_BACKEND, use_cache=False)
+
+    assert _events(executor, "cancelled") == [("A",)]
+    assert wait_until(lambda: _events(executor, "finished"))
+    wait_until(lambda: False, timeout=0.5)
+    assert len(_events(executor, "finished")) == 1
+    assert not executor.is_busy("A")
+
+
+def test_failure_is_reported(executor, monkeypatch):
+    async def failing_stream(*args, **kwargs):
+        raise RuntimeError("no connection")
+        yield
+
+    monkeypatch.setattr(generation_executor, "agenerate_prompt_stream", failing_stream)
+    executor.submit("A", "Meta", "input")
+    assert wait_until(lambda: _events(executor, "failed"))
+    assert _events(executor, "failed") == [("A", "no connection")]
+    assert not executor.is_busy("A")
+
+
+def test_sampling_request_delivers_every_sample(executor, mock_server):
+    executor.submit_samples("A", "Meta", "input", samples=3, backend=MOCK_BACKEND)
+    assert wait_until(lambda: _events(executor, "samples_finished"))
+
+    (side, samples), = _events(executor, "samples_finished")
+    assert side == "A" and len(samples) == 3
+    assert all(text for text, metrics in samples)
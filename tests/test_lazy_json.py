@@ -0,0 +1,69 @@
+"""
+Tests for the lazy JSON loader.
+"""
+
+import json
+
+import pytest
+
+from src.helpers import lazy_json
+from src.helpers.lazy_json import load_lazy, resolve, LazyText, LAZY_TEXT_BYTES
+
+
+def _resolve_all(value):
+    """Decode every LazyText in a loaded value"""
+    if isinstance(value, dict):
+        return {key: _resolve_all(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_all(item) for item in value]
+    return resolve(value)
+
+
+DOCUMENTS = [
+    {"a": 1, "b": [True, False, None], "c": -1.5e3, "d": "", "e": {}},
+    [],
+    "just a string",
+    {"long": "x" * (2 * LAZY_TEXT_BYTES), "escaped": 'quote " backslash \\ ' * 200 + "\\"},
+    {"unicode": "héllo 🙂 " * 500, "escapes": "\n\t\u0001" * 500},
+    {"variants": [{"output": "o" * 5000, "reasoning": "r" * 5000}], "test_input": "hi"},
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_loads_what_json_dumped(tmp_path, document, ensure_ascii):
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps(document, ensure_ascii=ensure_ascii, indent=1), encoding="utf-8")
+    assert _resolve_all(load_lazy(str(path))) == document
+
+
+def test_long_strings_are_lazy_and_short_ones_are_not(tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps({"short": "s", "long": "l" * LAZY_TEXT_BYTES}), encoding="utf-8")
+    loaded = load_lazy(str(path))
+    assert loaded["short"] == "s"
+    assert isinstance(loaded["long"], LazyText)
+    assert loaded["long"].value() == "l" * LAZY_TEXT_BYTES
+
+
+def test_mapped_file_can_be_truncated_after_loading(tmp_path, monkeypatch):
+    monkeypatch.setattr(lazy_json, "MMAP_MIN_BYTES", 0)
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps({"long": "y" * 100000}), encoding="utf-8")
+    loaded = load_lazy(str(path))
+    path.write_text("{}", encoding="utf-8")
+    assert loaded["long"].value() == "y" * 100000
+
+
+def test_bom_is_skipped(tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_bytes(b"\xef\xbb\xbf" + json.dumps({"a": "b"}).encode("utf-8"))
+    assert load_lazy(str(path)) == {"a": "b"}
+
+
+@pytest.mark.parametrize("text", ['{"a": 1', '{"a" 1}', '[1, 2', '"unterminated', '{"a": 1} extra', 'nul', ''])
+def test_invalid_json_raises_value_error(tmp_path, text):
+    path = tmp_path / "doc.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_lazy(str(path))
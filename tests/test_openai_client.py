@@ -0,0 +1,21 @@
+from conftest import MOCK_BACKEND
+from src.service.async_runtime import run_sync
+from src.service.backends import register_backend
+from src.service.openai_client import get_async_client
+
+
+async def _client():
+    return get_async_client(MOCK_BACKEND)
+
+
+def test_client_is_shared_per_backend(mock_server):
+    assert run_sync(_client()) is run_sync(_client())
+
+
+def test_client_is_replaced_when_the_backend_changes(mock_server):
+    first = run_sync(_client())
+    register_backend(MOCK_BACKEND, mock_server.base_url.replace("127.0.0.1", "localhost"), api_key="test")
+    second = run_sync(_client())
+    assert second is not first
+    assert str(second.base_url).startswith("http://localhost:")
+
@@ -0,0 +1,91 @@
+"""
+Tests for the prompt library: content dedup, loading and search.
+"""
+
+import json
+
+import pytest
+
+from src.helpers.prompt_set import make_prompt_set
+from src.service.prompt_library import PromptLibrary
+
+
+def _variant(prompt, output="", name="A", model="gpt-4o"):
+    return {"name": name, "prompt": prompt, "output": output, "reasoning": "",
+            "model": model, "reasoning_effort": None}
+
+
+@pytest.fixture(params=[True, False], ids=["fts", "like"])
+def library(request):
+    library = PromptLibrary(":memory:")
+    if not request.param:
+        # Exercise the fallback used when SQLite lacks FTS5
+        library.full_text = False
+    yield library
+    library.close()
+
+
+def test_identical_set_is_saved_once(library):
+    prompt_set = make_prompt_set([_variant("You are helpful.")], "input")
+    first = library.save(prompt_set, "one")
+    assert library.save(prompt_set, "renamed") == first
+    assert [entry["name"] for entry in library.search()] == ["renamed"]
+
+
+def test_shared_texts_are_stored_once(library):
+    shared = "shared meta prompt " * 100
+    library.save(make_prompt_set([_variant(shared, "out 1")], "input 1"))
+    library.save(make_prompt_set([_variant(shared, "out 2")], "input 2"))
+    # Two test inputs, two outputs, the shared prompt and the empty reasoning
+    assert library.stats() == {"entries": 2, "texts": 6, "text_chars": len(shared) + 24}
+
+
+def test_load_round_trips(library):
+    prompt_set = make_prompt_set([_variant("p1", "o1", "A"), _variant("p2", "o2", "B", None)], "test input")
+    entry_id = library.save(prompt_set)
+    assert library.load(entry_id) == prompt_set
+    with pytest.raises(KeyError):
+        library.load(entry_id + 1)
+
+
+def test_delete_drops_unused_texts_only(library):
+    kept = library.save(make_prompt_set([_variant("common")], "kept"))
+    dropped = library.save(make_prompt_set([_variant("common")], "dropped unique"))
+    library.delete(dropped)
+    assert [entry["id"] for entry in library.search()] == [kept]
+    assert library.load(kept)["variants"][0]["prompt"] == "common"
+    assert library.search("unique") == []
+    assert library.stats()["texts"] == 3
+
+
+def test_search_by_words_and_name(library):
+    library.save(make_prompt_set([_variant("Summarize the article")], "news"), "Summaries")
+    library.save(make_prompt_set([_variant("Translate to French")], "bonjour"), "Translation")
+    assert [entry["name"] for entry in library.search("article")] == ["Summaries"]
+    assert [entry["name"] for entry in library.search("Transl")] == ["Translation"]
+    assert [entry["name"] for entry in library.search("summaries")] == ["Summaries"]
+    assert library.search("missing") == []
+
+
+def test_search_treats_like_wildcards_literally(library):
+    library.save(make_prompt_set([_variant("get it 100% done")], "percent"), "100% done")
+    library.save(make_prompt_set([_variant("snake_case")], "underscore"), "snake_case")
+    library.save(make_prompt_set([_variant("plain")], "plain"), "100 x done")
+    assert [entry["name"] for entry in library.search("100% done")] == ["100% done"]
+    assert [entry["name"] for entry in library.search("e_c")] == ["snake_case"]
+
+
+def test_search_pages_newest_first(library):
+    for number in range(5):
+        library.save(make_prompt_set([_variant(f"prompt {number}")], f"input {number}"), f"entry {number}")
+    names = [entry["name"] for entry in library.search(limit=2, offset=1)]
+    assert names == ["entry 3", "entry 2"]
+
+
+def test_import_file(library, tmp_path):
+    path = tmp_path / "saved set.json"
+    prompt_set = make_prompt_set([_variant("imported")], "input")
+    path.write_text(json.dumps(prompt_set), encoding="utf-8")
+    entry_id = library.import_file(str(path))
+    assert library.search()[0]["name"] == "saved set"
+    assert library.load(entry_id) == prompt_set
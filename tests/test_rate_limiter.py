@@ -0,0 +1,155 @@
+"""
+Tests for the rate limiter: token buckets, AIMD concurrency, rate limit headers and retries.
+"""
+
+import asyncio
+
+import pytest
+
+from src.service import rate_limiter
+from src.service.rate_limiter import RateLimiter
+from src.service.rate_limit_budgets import TokenBucket, AdaptiveConcurrency
+from src.service.rate_limit_headers import parse_duration, read_limits, retry_delay
+
+
+def test_bucket_reserves_until_empty_then_asks_to_wait():
+    bucket = TokenBucket(60)
+    assert bucket.reserve(60) == 0.0
+    # One unit refills every second at 60 per minute
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+
+def test_bucket_credit_is_capped_at_capacity():
+    bucket = TokenBucket(100)
+    bucket.reserve(30)
+    bucket.credit(1000)
+    assert bucket.reserve(100) == 0.0
+    assert bucket.reserve(1) > 0.0
+
+
+def test_bucket_sync_adopts_server_limit_and_lower_remaining():
+    bucket = TokenBucket(100)
+    bucket.sync(limit=600, remaining=10)
+    assert bucket.capacity == 600
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(1) > 0.0
+    # A larger remaining budget doesn't add to what is left
+    bucket.sync(remaining=10000)
+    assert bucket.reserve(1) > 0.0
+
+
+def test_concurrency_halves_on_throttling_and_grows_additively():
+    concurrency = AdaptiveConcurrency(initial=8, minimum=1, maximum=10)
+    concurrency.on_throttled()
+    assert concurrency.limit == 4
+    for _ in range(4):
+        concurrency.on_success()
+    assert concurrency.limit == pytest.approx(5.0, abs=0.2)
+    for _ in range(5):
+        concurrency.on_throttled()
+    assert concurrency.limit == 1
+    for _ in range(1000):
+        concurrency.on_success()
+    assert concurrency.limit == 10
+
+
+def test_concurrency_makes_callers_wait_for_a_slot():
+    async def scenario():
+        concurrency = AdaptiveConcurrency(initial=1)
+        await concurrency.acquire()
+        waiter = asyncio.ensure_future(concurrency.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        concurrency.release()
+        await asyncio.wait_for(waiter, 1.0)
+        assert concurrency.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_parse_duration():
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("1.5s") == pytest.approx(1.5)
+    assert parse_duration("6m0s") == pytest.approx(360.0)
+    assert parse_duration("1h2m") == pytest.approx(3720.0)
+    assert parse_duration("soon") is None
+    assert parse_duration(None) is None
+
+
+def test_read_limits_reports_missing_and_malformed_headers_as_none():
+    limits = read_limits({
+        "x-ratelimit-limit-requests": "500",
+        "x-ratelimit-remaining-requests": "499",
+        "x-ratelimit-limit-tokens": "lots",
+    })
+    assert limits == {"requests": (500.0, 499.0), "tokens": (None, None)}
+
+
+def test_retry_delay_prefers_retry_after_then_the_latest_reset():
+    assert retry_delay({"retry-after-ms": "250", "retry-after": "3"}) == pytest.approx(0.25)
+    assert retry_delay({"retry-after": "3"}) == pytest.approx(3.0)
+    assert retry_delay({"x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "6m0s"}) == 360.0
+    assert retry_delay({}) is None
+
+
+def test_limiter_syncs_buckets_from_headers():
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000)
+    limiter.update_from_headers({"x-ratelimit-limit-tokens": "2000", "x-ratelimit-remaining-tokens": "5"})
+    assert limiter.tokens.capacity == 2000
+    assert limiter.requests.capacity == 100
+    assert limiter.tokens.reserve(6) > 0.0
+
+
+class Throttled(Exception):
+    pass
+
+
+def _run_with_failures(monkeypatch, limiter, failures, retry_after=None):
+    """Call a request failing `failures` times through acall; return its result, backoffs and calls"""
+    sleeps = []
+    calls = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    async def request():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise Throttled()
+        return "ok"
+
+    async def scenario():
+        return await limiter.acall(request, 10, lambda e: isinstance(e, Throttled),
+                                   lambda e: isinstance(e, Throttled), retry_after)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+    result = asyncio.run(scenario())
+    # Every attempt first waits for the budgets; the sleeps in between are the backoffs
+    return result, sleeps[1::2], len(calls)
+
+
+def test_retries_use_full_jitter_within_the_exponential_cap(monkeypatch):
+    limiter = RateLimiter(base_delay=1.0, max_delay=4.0, max_retries=5)
+    result, backoffs, calls = _run_with_failures(monkeypatch, limiter, failures=4)
+    assert result == "ok"
+    assert calls == 5
+    assert len(backoffs) == 4
+    for attempt, delay in enumerate(backoffs):
+        assert 0.0 <= delay <= min(4.0, 2 ** attempt)
+    # Each throttled attempt halved the concurrency limit
+    assert limiter.concurrency.limit < 8
+
+
+def test_retries_wait_at_least_what_the_server_asked_for(monkeypatch):
+    limiter = RateLimiter(base_delay=0.01, max_delay=0.01, max_retries=3)
+    result, backoffs, _ = _run_with_failures(monkeypatch, limiter, failures=2, retry_after=lambda e: 2.0)
+    assert result == "ok"
+    assert backoffs == [2.0, 2.0]
+
+
+def test_gives_up_after_max_retries_and_refunds_the_budget(monkeypatch):
+    limiter = RateLimiter(requests_per_minute=10, tokens_per_minute=100, max_retries=2)
+    with pytest.raises(Throttled):
+        _run_with_failures(monkeypatch, limiter, failures=10)
+    # Rejected attempts don't consume the budget
+    assert limiter.requests.reserve(10) == 0.0
@@ -0,0 +1,74 @@
+"""
+Tests for the reasoning parser: extract_reasoning and its streaming counterpart.
+"""
+
+import random
+
+import pytest
+
+from src.helpers.reasoning_parser import (
+    extract_reasoning, has_reasoning, StreamingReasoningParser, REASONING, OUTPUT
+)
+
+TEXTS = [
+    "",
+    "plain output",
+    "  padded output \n",
+    "<reasoning>think</reasoning>answer",
+    "\n<reasoning>\n  think hard \n</reasoning>\n\nanswer\n",
+    "before <reasoning>think</reasoning> after",
+    "<reasoning>first</reasoning>mid<reasoning>second</reasoning>end",
+    "<reasoning>never closed",
+    "  output then <reasoning>never closed",
+    "a stray </reasoning> close tag",
+    "<reason>not a tag</reason> <reasoning",
+    "<reasoning></reasoning>",
+]
+
+
+def _stream(text, sizes):
+    """Feed text to a parser in chunks of the given sizes; return the two channels' final texts"""
+    parser = StreamingReasoningParser()
+    channels = {REASONING: "", OUTPUT: ""}
+    pos = 0
+    events = []
+    for size in sizes:
+        events += parser.feed(text[pos:pos + size])
+        pos += size
+    events += parser.feed(text[pos:])
+    events += parser.close()
+    for channel, chunk in events:
+        channels[channel] = "" if chunk is None else channels[channel] + chunk
+    return channels[REASONING], channels[OUTPUT]
+
+
+def test_extract_reasoning():
+    assert extract_reasoning("<reasoning> why </reasoning>\nanswer ") == ("why", "answer")
+    assert extract_reasoning("no tags ") == ("", "no tags ")
+    assert extract_reasoning(None) == ("", "")
+    assert has_reasoning("x<reasoning>y</reasoning>")
+    assert not has_reasoning("<reasoning>unclosed")
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_streaming_matches_extract_reasoning_for_every_split(text):
+    expected = extract_reasoning(text)
+    assert _stream(text, []) == expected
+    for split in range(len(text) + 1):
+        assert _stream(text, [split]) == expected, split
+    assert _stream(text, [1] * len(text)) == expected
+
+
+def test_streaming_matches_extract_reasoning_for_random_chunks():
+    rng = random.Random(4)
+    pieces = ["<reasoning>", "</reasoning>", "<reas", "oning>", " ", "\n", "text", "<", "/"]
+    for _ in range(500):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        sizes = [rng.randint(1, 5) for _ in range(len(text))]
+        assert _stream(text, sizes) == extract_reasoning(text), (text, sizes)
+
+
+def test_streaming_routes_reasoning_before_it_is_closed():
+    parser = StreamingReasoningParser()
+    assert parser.feed("<reasoning>step one") == [(REASONING, "step one")]
+    assert parser.found_reasoning
@@ -0,0 +1,83 @@
+"""
+Tests for the on-disk response cache.
+"""
+
+import os
+import time
+
+from src.service.response_cache import ResponseCache, make_key
+
+
+def test_key_depends_on_messages_and_params():
+    messages = [{"role": "user", "content": "hi"}]
+    assert make_key(messages, {"model": "a"}) == make_key(list(messages), {"model": "a"})
+    assert make_key(messages, {"model": "a"}) != make_key(messages, {"model": "b"})
+
+
+def test_put_get_and_persistence(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    assert cache.get("k") is None
+    cache.put("k", "héllo")
+    assert cache.get("k") == "héllo"
+    assert ResponseCache(str(tmp_path)).get("k") == "héllo"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used_by_count(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_evicts_by_size(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=100)
+    cache.put("a", "x" * 40)
+    cache.put("b", "y" * 40)
+    cache.put("c", "z" * 40)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] <= 100
+
+
+def test_recency_survives_a_restart(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    # The index is rebuilt from modification times, oldest first
+    now = time.time()
+    for age, key in ((30, "a"), (20, "b"), (10, "c")):
+        os.utime(tmp_path / f"{key}.json", (now - age, now - age))
+    ResponseCache(str(tmp_path)).get("a")
+    reopened = ResponseCache(str(tmp_path), max_entries=2)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == "a"
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put("k", "text")
+    (tmp_path / "k.json").write_text("not json", encoding="utf-8")
+    assert cache.get("k") is None
+    assert not (tmp_path / "k.json").exists()
+
+
+def test_unusable_directory_behaves_as_an_empty_cache(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("", encoding="utf-8")
+    cache = ResponseCache(str(blocker / "responses"))
+    assert cache.get("k") is None
+    cache.put("k", "text")
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_clear(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put("a", "1")
+    cache.clear()
+    assert cache.get("a") is None
+    assert os.listdir(tmp_path) == []
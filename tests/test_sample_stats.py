@@ -0,0 +1,54 @@
+from src.helpers.sample_stats import check_structure, describe_sample_stats, summarize_samples
+from src.service.request_metrics import RequestMetrics
+
+GOOD = "<reasoning>why</reasoning>\nWrite a haiku.\n\n# Output Format\nThree lines."
+BAD = "# Title\n```\ncode\n```"
+
+
+def _metrics(latency, model="gpt-4o"):
+    metrics = RequestMetrics(submitted=100.0)
+    metrics.completed = 100.0 + latency
+    metrics.model = model
+    metrics.prompt_tokens = 1000
+    metrics.completion_tokens = 1000
+    return metrics
+
+
+def test_check_structure():
+    assert all(check_structure(GOOD).values())
+    result = check_structure(BAD)
+    assert not result["reasoning_first"] and not result["instruction_first"]
+    assert not result["no_code_fences"] and result["no_separators"]
+
+
+def test_separate_requests_report_latency_percentiles():
+    samples = [(GOOD, _metrics(latency)) for latency in (1.0, 2.0, 3.0, 4.0)] + [(None, _metrics(9.0))]
+    stats = summarize_samples(samples)
+
+    assert stats["samples"] == 5 and stats["failed"] == 1 and stats["requests"] == 5
+    assert stats["latency"]["count"] == 4 and stats["latency"]["max"] == 4.0
+    assert stats["latency"]["p50"] is not None
+    assert stats["request_latency"] is None
+    assert stats["reasoning_rate"] == 1.0 and stats["conformance_rate"] == 1.0
+    assert "latency p90" in describe_sample_stats(stats)
+
+
+def test_samples_of_one_request_report_its_latency_and_cost_once():
+    shared = _metrics(2.5)
+    samples = [(GOOD, shared), (BAD, shared), (GOOD, shared)]
+    stats = summarize_samples(samples)
+
+    assert stats["requests"] == 1
+    assert stats["request_latency"] == 2.5
+    assert stats["latency"]["count"] == 0 and stats["latency"]["p90"] is None
+    assert stats["cost"] == shared.estimated_cost
+    assert stats["conformance_rate"] == 2 / 3
+    assert stats["check_rates"]["no_code_fences"] == 2 / 3
+    assert "latency 2.5s (one request)" in describe_sample_stats(stats)
+
+
+def test_all_failed():
+    stats = summarize_samples([(None, _metrics(1.0)), (None, _metrics(1.0))])
+    assert stats["failed"] == 2 and stats["reasoning_rate"] is None
+    assert stats["request_latency"] is None and stats["latency"]["p50"] is None
+    assert describe_sample_stats(stats) == "all 2 samples failed"
@@ -0,0 +1,113 @@
+"""
+Tests for the autosave journal: replay after a crash, and compaction.
+"""
+
+import json
+import os
+
+from src.service import session_journal
+from src.service.session_journal import SessionJournal, read_journal
+
+
+def _journal(tmp_path):
+    return SessionJournal(str(tmp_path / "session.journal"), flush_interval=60)
+
+
+def test_replays_the_latest_values(tmp_path):
+    journal = _journal(tmp_path)
+    journal.update("prompt", "first")
+    journal.update("variants", [{"name": "A"}])
+    journal.flush()
+    journal.update("prompt", "second")
+    journal.update("output", lambda: "computed on the writer thread")
+    journal.close()
+    state, saved, clean = read_journal(journal.path)
+    assert state == {"prompt": "second", "variants": [{"name": "A"}], "output": "computed on the writer thread"}
+    assert saved is not None
+    assert clean
+
+
+def test_unchanged_values_are_not_written_again(tmp_path):
+    journal = _journal(tmp_path)
+    journal.update("prompt", "same")
+    journal.flush()
+    size = os.path.getsize(journal.path)
+    journal.update("prompt", "same")
+    journal.flush()
+    assert os.path.getsize(journal.path) == size
+    journal.close(clean=False)
+
+
+def test_torn_last_record_is_ignored(tmp_path):
+    journal = _journal(tmp_path)
+    journal.update("prompt", "kept")
+    journal.flush()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"time": 1, "set": {"prompt": "to')
+    state, _, clean = read_journal(journal.path)
+    assert state == {"prompt": "kept"}
+    assert not clean
+    journal.close(clean=False)
+
+
+def test_compacts_into_a_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_journal, "COMPACT_MIN_BYTES", 4096)
+    journal = _journal(tmp_path)
+    for number in range(200):
+        journal.update("prompt", "é" * 100 + str(number))
+        journal.update("fixed", "unchanged")
+        journal.flush()
+        # The size that triggers compaction is counted in bytes, like the file
+        assert journal._size == os.path.getsize(journal.path)
+    assert os.path.getsize(journal.path) < 2 * 4096
+    journal.close()
+    with open(journal.path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert any("snapshot" in record for record in records)
+    state, _, clean = read_journal(journal.path)
+    assert state == {"prompt": "é" * 100 + "199", "fixed": "unchanged"}
+    assert clean
+
+
+def test_failed_compaction_keeps_journaling(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_journal, "COMPACT_MIN_BYTES", 1024)
+    journal = _journal(tmp_path)
+    # A directory in the way of the temporary snapshot makes compaction fail
+    os.mkdir(journal.path + ".tmp")
+    for number in range(50):
+        journal.update("prompt", "x" * 100 + str(number))
+        journal.flush()
+    assert isinstance(journal.error, OSError)
+    os.rmdir(journal.path + ".tmp")
+    journal.update("prompt", "after")
+    journal.flush()
+    assert journal.error is None
+    journal.close()
+    state, _, clean = read_journal(journal.path)
+    assert state == {"prompt": "after"}
+    assert clean
+
+
+def test_failed_write_is_retried_with_the_next_batch(tmp_path, monkeypatch):
+    journal = _journal(tmp_path)
+    real_fsync = os.fsync
+    failures = [OSError(28, "No space left on device")]
+
+    def fsync(fd):
+        if failures:
+            raise failures.pop()
+        real_fsync(fd)
+
+    monkeypatch.setattr(session_journal.os, "fsync", fsync)
+    journal.update("prompt", "lost?")
+    journal.update("output", "old")
+    journal.flush()
+    assert isinstance(journal.error, OSError)
+
+    # Nothing changed these keys again, but the failed values are written anyway
+    journal.update("output", "newer")
+    journal.flush()
+    assert journal.error is None
+    journal.close()
+    state, _, _ = read_journal(journal.path)
+    assert state == {"prompt": "lost?", "output": "newer"}
@@ -0,0 +1,112 @@
+"""
+Tests for text deltas and the prompt history built on them.
+"""
+
+import random
+
+import pytest
+
+from src.helpers.text_delta import make_delta, apply_delta, LINE_DIFF_MIN_CHARS
+from src.service.prompt_history import PromptHistory, SNAPSHOT_INTERVAL
+
+PAIRS = [
+    ("", ""),
+    ("", "new text"),
+    ("old text", ""),
+    ("same", "same"),
+    ("prefix middle suffix", "prefix MIDDLE suffix"),
+    ("aaaa", "aaaaaa"),
+    ("héllo wörld 🙂", "héllo big wörld 🙂"),
+    ("line\n" * 200, "line\n" * 100 + "changed\n" + "line\n" * 99),
+]
+
+
+def _random_edit(rng, text):
+    """Insert, delete or replace a random span of text"""
+    start = rng.randint(0, len(text))
+    end = rng.randint(start, min(len(text), start + 40))
+    insert = "".join(rng.choice("ab\n é") for _ in range(rng.randint(0, 2 * LINE_DIFF_MIN_CHARS)))
+    return text[:start] + insert + text[end:]
+
+
+@pytest.mark.parametrize("old, new", PAIRS)
+def test_delta_round_trip(old, new):
+    assert apply_delta(old, make_delta(old, new)) == new
+
+
+def test_delta_of_a_small_edit_copies_the_rest():
+    old = "x" * 10000
+    new = old[:5000] + "edit" + old[5000:]
+    delta = make_delta(old, new)
+    assert delta == [[0, 5000], "edit", [5000, 10000]]
+
+
+def test_delta_round_trips_random_edits():
+    rng = random.Random(22)
+    text = ""
+    for _ in range(300):
+        new = _random_edit(rng, text)
+        assert apply_delta(text, make_delta(text, new)) == new
+        text = new
+
+
+def test_history_rebuilds_every_revision(tmp_path):
+    rng = random.Random(7)
+    history = PromptHistory(str(tmp_path / "history.sqlite3"))
+    texts = ["start"]
+    for _ in range(2 * SNAPSHOT_INTERVAL + 5):
+        texts.append(_random_edit(rng, texts[-1]))
+    numbers = [history.record("doc", text) for text in texts]
+    assert history.record("doc", texts[-1]) is None
+    for number, text in zip(numbers, texts):
+        if number is not None:
+            assert history.get("doc", number) == text
+    assert history.get("doc") == texts[-1]
+    assert sum(revision["snapshot"] for revision in history.revisions("doc")) >= 3
+    history.close()
+
+    # A reopened history continues from the stored revisions
+    reopened = PromptHistory(str(tmp_path / "history.sqlite3"))
+    assert reopened.get("doc") == texts[-1]
+    reopened.close()
+
+
+def test_history_records_queued_revisions_in_order(tmp_path):
+    history = PromptHistory(str(tmp_path / "history.sqlite3"))
+    for number in range(20):
+        history.record_later("a", f"revision {number}")
+        history.record_later("b", f"other {number}")
+    history.flush()
+    assert history.error is None
+    assert history.get("a") == "revision 19"
+    assert history.get("b", 1) == "other 0"
+    assert len(history.revisions("a")) == 20
+    history.close()
+
+
+def test_editor_records_edits_but_not_loaded_prompts(qapp, tmp_path, monkeypatch):
+    from src.service import prompt_history
+    from src.ui.prompt_editor import PromptEditor
+    history = PromptHistory(str(tmp_path / "history.sqlite3"))
+    monkeypatch.setattr(prompt_history, "get_history", lambda: history)
+    editor = PromptEditor("A")
+    editor.set_history_key("doc")
+
+    editor.set_prompt("loaded " * 1000 + "\n" * 3000)
+    editor.flush_changes()
+    history.flush()
+    assert history.revisions("doc") == []
+
+    # The first edit records the loaded text it started from, then the edit
+    editor.text_editor.insertPlainText("typed")
+    editor.flush_changes()
+    history.flush()
+    assert len(history.revisions("doc")) == 2
+    assert history.get("doc").startswith("typed")
+
+    # Loading another prompt records nothing until it is edited
+    editor.set_prompt("other")
+    editor.flush_changes()
+    history.flush()
+    assert len(history.revisions("doc")) == 2
+    history.close()
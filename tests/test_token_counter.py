@@ -0,0 +1,57 @@
+import pytest
+
+from src.helpers import token_counter
+from src.helpers.token_counter import (
+    LOW_BUDGET_TOKENS, REQUEST_OVERHEAD_TOKENS, count_tokens, describe_budget, exceeds_context,
+    format_tokens, request_budget,
+)
+
+
+def test_request_budget_counts_prompt_input_and_overhead():
+    budget = request_budget("gpt-4o", 1000, 200)
+    assert budget["tokens"] == 1000 + 200 + REQUEST_OVERHEAD_TOKENS
+    assert budget["context_window"] == 128000 and budget["model"] == "GPT-4o"
+    assert budget["remaining"] == 128000 - budget["tokens"]
+    assert budget["level"] == "ok"
+
+
+def test_request_budget_without_input_sends_the_prompt_twice():
+    assert request_budget("gpt-4o", 1000, 0)["tokens"] == 2000 + REQUEST_OVERHEAD_TOKENS
+
+
+def test_request_budget_levels():
+    window = request_budget("gpt-4o", 0, 0)["context_window"]
+    # The prompt that, with a one-token input, leaves exactly LOW_BUDGET_TOKENS
+    fits = window - REQUEST_OVERHEAD_TOKENS - LOW_BUDGET_TOKENS - 1
+    assert request_budget("gpt-4o", fits, 1)["level"] == "ok"
+    assert request_budget("gpt-4o", fits + 1, 1)["level"] == "low"
+    over = request_budget("gpt-4o", window, 1)
+    assert over["level"] == "over" and over["remaining"] < 0
+
+
+def test_request_budget_uses_the_model_context_window():
+    assert request_budget("o1", 1000, 1000)["context_window"] == 200000
+
+
+@pytest.mark.parametrize("exact", [True, False])
+def test_estimated_counts_get_a_margin(monkeypatch, exact):
+    monkeypatch.setattr(token_counter, "counts_are_exact", lambda: exact)
+    budget = request_budget("gpt-4o", 129000, 1)
+    assert budget["level"] == "over"
+    assert exceeds_context(budget) == exact
+
+
+def test_format_tokens():
+    assert [format_tokens(t) for t in (950, 12500, 12000, 128000, -1500)] == ["950", "12.5k", "12k", "128k", "-1.5k"]
+
+
+def test_describe_budget(monkeypatch):
+    monkeypatch.setattr(token_counter, "counts_are_exact", lambda: False)
+    label, tooltip = describe_budget(500, request_budget("gpt-4o", 128000, 1), variant="B")
+    assert label.startswith("~500 tokens") and "over by" in label
+    assert "Tightest variant: B" in tooltip and "estimates" in tooltip
+
+
+def test_count_tokens_grows_with_the_text():
+    assert count_tokens("") == 0
+    assert 0 < count_tokens("Write a haiku.") < count_tokens("Write a haiku.\n" * 10)